@@ -4,17 +4,21 @@ Interactive search interface for GEO datasets.
 """
 import logging
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import streamlit as st
-from sqlalchemy import distinct, func
+from sqlalchemy import distinct, func, select
+from sqlalchemy.orm import Session
 
 from config import settings
-from db import GSEMesh, GSESeries, IngestItem, IngestRun, MeshTerm, get_db
+from db import GSEMesh, GSESeries, IngestItem, IngestRun, MeshTerm, SessionLocal
 from search import HybridSearchEngine
 from search.hybrid_search import make_snippet
 from streamlit_ingest import show_ingestion_interface
 
+if TYPE_CHECKING:
+    from vector.milvus_store import MilvusStore
+
 # Configure logging
 logging.basicConfig(level=settings.log_level)
 logger = logging.getLogger(__name__)
@@ -28,38 +32,73 @@ st.set_page_config(
 )
 
 
-def get_cached_db():
-    """Get database session with caching."""
-    return next(get_db())
-
-
 @st.cache_data(ttl=3600)
 def get_filter_options():
     """Get available filter options from database."""
-    db = get_cached_db()
-
-    # Get unique organisms
-    organisms_query = db.query(
-        func.jsonb_array_elements_text(GSESeries.organisms).label("organism")
-    ).distinct()
-    organisms = [row[0] for row in organisms_query.limit(100).all() if row[0]]
-
-    # Get unique tech types
-    tech_types_query = db.query(distinct(GSESeries.tech_type)).filter(
-        GSESeries.tech_type.isnot(None)
-    )
-    tech_types = [row[0] for row in tech_types_query.all() if row[0]]
+    with SessionLocal() as db:
+        # Get unique organisms
+        organisms_query = db.query(
+            func.jsonb_array_elements_text(GSESeries.organisms).label("organism")
+        ).distinct()
+        organisms = [row[0] for row in organisms_query.limit(100).all() if row[0]]
+
+        # Get unique tech types
+        tech_types_query = db.query(distinct(GSESeries.tech_type)).filter(
+            GSESeries.tech_type.isnot(None)
+        )
+        tech_types = [row[0] for row in tech_types_query.all() if row[0]]
+
+        # Get date range
+        date_range = db.query(
+            func.min(GSESeries.submission_date),
+            func.max(GSESeries.submission_date),
+        ).first()
+
+        return {
+            "organisms": sorted(organisms),
+            "tech_types": sorted(tech_types),
+            "date_range": date_range,
+        }
+
+
+@st.cache_data(ttl=30)
+def get_database_stats() -> dict[str, Any]:
+    """Get database statistics, cached briefly so reruns skip the full-table aggregates."""
+    with SessionLocal() as db:
+        # Counts and date/sample aggregates in one round trip
+        gse_count, min_date, max_date, avg_samples, mesh_count, assoc_count = db.query(
+            func.count(GSESeries.accession),
+            func.min(GSESeries.submission_date),
+            func.max(GSESeries.submission_date),
+            func.avg(GSESeries.sample_count),
+            select(func.count(MeshTerm.mesh_id)).scalar_subquery(),
+            select(func.count(GSEMesh.id)).scalar_subquery(),
+        ).one()
+
+        top_organisms = []
+        tech_types = []
+        if gse_count > 0:
+            top_organisms = db.query(
+                func.jsonb_array_elements_text(GSESeries.organisms).label("organism"),
+                func.count().label("count")
+            ).group_by("organism").order_by(func.count().desc()).limit(10).all()
 
-    # Get date range
-    date_range = db.query(
-        func.min(GSESeries.submission_date),
-        func.max(GSESeries.submission_date),
-    ).first()
+            tech_types = db.query(
+                GSESeries.tech_type,
+                func.count()
+            ).filter(GSESeries.tech_type.isnot(None)).group_by(
+                GSESeries.tech_type
+            ).order_by(func.count().desc()).all()
 
     return {
-        "organisms": sorted(organisms),
-        "tech_types": sorted(tech_types),
-        "date_range": date_range,
+        "gse_count": gse_count,
+        "min_date": min_date,
+        "max_date": max_date,
+        "avg_samples": float(avg_samples) if avg_samples is not None else None,
+        "mesh_count": mesh_count,
+        "assoc_count": assoc_count,
+        "top_organisms": [tuple(row) for row in top_organisms],
+        "tech_types": [tuple(row) for row in tech_types],
     }
 
 
@@ -77,8 +116,6 @@ def perform_search(
     top_k: int,
 ) -> dict[str, Any]:
     """Perform search with caching."""
-    db = get_cached_db()
-
     # Build filters
     filters = {}
 
@@ -99,15 +136,16 @@ def perform_search(
         filters["min_samples"] = min_samples
 
     # Perform search
-    engine = HybridSearchEngine(db)
-    results = engine.search(
-        query=query,
-        filters=filters,
-        use_semantic=use_semantic,
-        use_lexical=use_lexical,
-        use_mesh=use_mesh,
-        top_k=top_k,
-    )
+    with SessionLocal() as db:
+        engine = HybridSearchEngine(db)
+        results = engine.search(
+            query=query,
+            filters=filters,
+            use_semantic=use_semantic,
+            use_lexical=use_lexical,
+            use_mesh=use_mesh,
+            top_k=top_k,
+        )
 
     return results
 
@@ -192,8 +230,17 @@ def render_postgres_view() -> None:
     """Render PostgreSQL database view."""
     st.header("PostgreSQL Database View")
 
-    db = get_cached_db()
+    with SessionLocal() as db:
+        render_postgres_tabs(db)
+
 
+def render_postgres_tabs(db: Session) -> None:
+    """
+    Render the PostgreSQL view tabs.
+
+    Args:
+        db: Database session used by every tab for this script run
+    """
     # Tabs for different views
     tab1, tab2, tab3, tab4 = st.tabs(["GSE Series", "MeSH Terms", "Ingestion Runs", "Statistics"])
 
@@ -263,7 +310,21 @@ def render_postgres_view() -> None:
     with tab3:
         st.subheader("Ingestion Runs")
 
-        runs = db.query(IngestRun).order_by(IngestRun.start_time.desc()).limit(20).all()
+        # Only the displayed columns; skips loading run_metadata JSON
+        runs = db.execute(
+            select(
+                IngestRun.id,
+                IngestRun.query,
+                IngestRun.status,
+                IngestRun.total_count,
+                IngestRun.success_count,
+                IngestRun.error_count,
+                IngestRun.start_time,
+                IngestRun.end_time,
+            )
+            .order_by(IngestRun.start_time.desc())
+            .limit(20)
+        ).all()
 
         if runs:
             for run in runs:
@@ -310,18 +371,15 @@ def render_postgres_view() -> None:
     with tab4:
         st.subheader("Database Statistics")
 
-        from sqlalchemy import func
+        stats = get_database_stats()
 
         # GSE stats
-        gse_count = db.query(func.count(GSESeries.accession)).scalar()
+        gse_count = stats["gse_count"]
         st.metric("Total GSE Records", gse_count)
 
         if gse_count > 0:
-            # Date range
-            min_date, max_date = db.query(
-                func.min(GSESeries.submission_date),
-                func.max(GSESeries.submission_date)
-            ).first()
+            min_date = stats["min_date"]
+            max_date = stats["max_date"]
 
             col1, col2, col3 = st.columns(3)
 
@@ -334,39 +392,33 @@ def render_postgres_view() -> None:
                     st.metric("Latest Record", str(max_date.date()))
 
             with col3:
-                avg_samples = db.query(func.avg(GSESeries.sample_count)).scalar()
+                avg_samples = stats["avg_samples"]
                 if avg_samples:
                     st.metric("Avg Samples", f"{avg_samples:.1f}")
 
             # Top organisms
             st.write("**Top Organisms:**")
-            org_query = db.query(
-                func.jsonb_array_elements_text(GSESeries.organisms).label("organism"),
-                func.count().label("count")
-            ).group_by("organism").order_by(func.count().desc()).limit(10)
-
-            for org, count in org_query:
+            for org, count in stats["top_organisms"]:
                 st.write(f"  - {org}: {count}")
 
             # Tech types
             st.write("**Technology Types:**")
-            tech_query = db.query(
-                GSESeries.tech_type,
-                func.count()
-            ).filter(GSESeries.tech_type.isnot(None)).group_by(
-                GSESeries.tech_type
-            ).order_by(func.count().desc()).all()
-
-            for tech, count in tech_query:
+            for tech, count in stats["tech_types"]:
                 st.write(f"  - {tech}: {count}")
 
         # MeSH stats
-        mesh_count = db.query(func.count(MeshTerm.mesh_id)).scalar()
-        st.metric("Total MeSH Terms", mesh_count)
+        st.metric("Total MeSH Terms", stats["mesh_count"])
 
         # GSE-MeSH associations
-        assoc_count = db.query(func.count(GSEMesh.id)).scalar()
-        st.metric("GSE-MeSH Associations", assoc_count)
+        st.metric("GSE-MeSH Associations", stats["assoc_count"])
+
+
+@st.cache_resource
+def get_milvus_store() -> "MilvusStore":
+    """Get the MilvusStore, shared across reruns so count() can reuse its cache."""
+    from vector.milvus_store import MilvusStore
+
+    return MilvusStore()
 
 
 def render_milvus_view() -> None:
@@ -374,9 +426,7 @@ def render_milvus_view() -> None:
     st.header("Milvus Vector Database View")
 
     try:
-        from vector.milvus_store import MilvusStore
-
-        store = MilvusStore()
+        store = get_milvus_store()
 
         # Collection info
         st.subheader("Collection Information")
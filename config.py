@@ -30,6 +30,18 @@ class Settings(BaseSettings):
     milvus_host: str = "localhost"
     milvus_port: int = 19530
     milvus_collection_name: str = "geo_gse_embeddings"
+    milvus_hnsw_m: int = 16  # Graph degree; higher improves recall at the cost of memory
+    milvus_hnsw_ef_construction: int = 200
+    milvus_hnsw_ef: int = 64  # Minimum search-time candidate list size
+    milvus_enable_quantization: bool = False  # IVF_SQ8 index: int8 vectors, ~4x less RAM
+    milvus_ivf_nlist: int = 1024
+    milvus_ivf_nprobe: int = 10
+    milvus_count_ttl: int = 30  # Seconds MilvusStore.count() reuses num_entities
+    milvus_num_partitions: int = 0  # Accession-hash partitions for new collections (0 = none)
+
+    # Vector store backend; "memory" searches an in-process matrix (small collections)
+    store_backend: Literal["milvus", "memory"] = "milvus"
+    memory_store_path: str = "./cache/vectors.npz"
 
     # NCBI E-utilities
     ncbi_email: str = Field(default="user@example.com")
@@ -38,19 +50,33 @@ class Settings(BaseSettings):
     rate_limit_qps: float = 3.0  # Queries per second
 
     # Embeddings
-    embedding_provider: Literal["local", "openai"] = "local"
+    embedding_provider: Literal["local", "onnx", "openai"] = "local"
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     embedding_dimension: int = 384
+    embedding_precision: Literal["fp32", "fp16", "int8"] = "fp32"  # fp16 on CUDA, int8 on CPU
+    torch_num_threads: int | None = None  # CPU threads for the local model (default: torch's choice)
+    embedding_device: str | None = None  # e.g. "cuda", "cuda:1", "cpu" (default: CUDA if available)
+    embedding_batch_size: int | None = None  # Local encode batch (default: 128 on CUDA, 32 on CPU)
+    onnx_cache_dir: str = "./models/onnx"  # Exported models for the onnx provider
 
     # OpenAI
     openai_api_key: str | None = None
     openai_embedding_model: str = "text-embedding-3-small"
+    openai_batch_size: int = 2048  # Inputs per embeddings request (API maximum)
+    openai_concurrency: int = 8  # Parallel embeddings requests
+    embedding_cache_dir: str | None = "./cache/embeddings"  # OpenAI embedding cache; empty disables
 
     # Search
     semantic_top_k: int = 100
     lexical_top_k: int = 100
     final_top_k: int = 50
     rrf_k: int = 60  # Reciprocal Rank Fusion constant
+    mesh_query_weight: float = 0.3  # Share of matched MeSH terms in the query vector
+    mesh_vocabulary_check_interval: int = 60  # Seconds between mesh_term count checks
+    semantic_cache_size: int = 1024  # Cached semantic_search results (0 disables)
+    semantic_cache_threshold: float = 0.97  # Cosine similarity for reusing a paraphrased query
+    semantic_cache_ttl: int = 600  # Seconds
+    search_cache_ttl: int = 600  # Seconds search_geo reuses a cached result
 
     # Logging
     log_level: str = "INFO"
@@ -6,6 +6,7 @@ from sqlalchemy import (
     JSON,
     Boolean,
     Column,
+    Computed,
     DateTime,
     Enum,
     Float,
@@ -15,13 +16,23 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    text,
 )
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 Base = declarative_base()
 
+# Full-text document used by lexical search (kept in sync by PostgreSQL)
+GSE_SEARCH_TSV_SQL = (
+    "to_tsvector('english', coalesce(title, '') || ' ' || "
+    "coalesce(summary, '') || ' ' || coalesce(overall_design, ''))"
+)
+
+# Server-side UTC timestamp, naive like the datetime.utcnow() columns
+UTC_NOW_SQL = "(now() AT TIME ZONE 'utc')"
+
 
 class GSESeries(Base):
     """
@@ -59,6 +70,9 @@ class GSESeries(Base):
     # Full raw record from NCBI
     raw_record = Column(JSONB)
 
+    # Generated full-text search vector (deferred: only lexical search reads it)
+    search_tsv = deferred(Column(TSVECTOR, Computed(GSE_SEARCH_TSV_SQL, persisted=True)))
+
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -71,6 +85,8 @@ class GSESeries(Base):
         Index("idx_gse_submission_date", "submission_date"),
         Index("idx_gse_tech_type", "tech_type"),
         Index("idx_gse_sample_count", "sample_count"),
+        Index("idx_gse_search_tsv", "search_tsv", postgresql_using="gin"),
+        Index("idx_gse_organisms", "organisms", postgresql_using="gin"),
     )
 
     def to_dict(self) -> dict[str, Any]:
@@ -160,7 +176,7 @@ class IngestRun(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     query = Column(Text)  # NCBI search query used
-    start_time = Column(DateTime, default=datetime.utcnow, nullable=False)
+    start_time = Column(DateTime, server_default=text(UTC_NOW_SQL), nullable=False)
     end_time = Column(DateTime)
     status = Column(
         Enum("running", "completed", "failed", "partial", name="ingest_status_enum"),
@@ -174,6 +190,9 @@ class IngestRun(Base):
     # Relationships
     items = relationship("IngestItem", back_populates="run", cascade="all, delete-orphan")
 
+    # Newest-first history pages are read by scanning this index backwards
+    __table_args__ = (Index("idx_ingest_run_start_time", "start_time"),)
+
 
 class IngestItem(Base):
     """
@@ -2,20 +2,34 @@
 import logging
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url, text
 from sqlalchemy.orm import Session, sessionmaker
 
 from config import settings
 
 logger = logging.getLogger(__name__)
 
+# psycopg2 only: batch executemany UPDATE/DELETE as well as INSERT
+_driver_options = (
+    {
+        "executemany_mode": "values_plus_batch",
+        "insertmanyvalues_page_size": 1000,
+        "executemany_batch_page_size": 500,
+    }
+    if make_url(settings.database_url).get_driver_name() == "psycopg2"
+    else {}
+)
+
 # Create database engine
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,  # Verify connections before using
     pool_size=10,
     max_overflow=20,
+    pool_timeout=30,  # Seconds to wait for a free connection
+    pool_recycle=1800,  # Replace connections before server/proxy idle timeouts
     echo=settings.log_level == "DEBUG",
+    **_driver_options,
 )
 
 # Create session factory
@@ -40,4 +54,30 @@ def init_db() -> None:
 
     logger.info("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    upgrade_schema()
     logger.info("Database tables created successfully")
+
+
+def upgrade_schema() -> None:
+    """
+    Bring tables created by an older release up to the current models.
+    create_all() only creates missing tables, so columns and indexes added
+    later are applied here with idempotent DDL.
+    """
+    from db.models import GSE_SEARCH_TSV_SQL, UTC_NOW_SQL
+
+    if engine.dialect.name != "postgresql":
+        return
+
+    statements = [
+        "ALTER TABLE gse_series ADD COLUMN IF NOT EXISTS search_tsv tsvector "
+        f"GENERATED ALWAYS AS ({GSE_SEARCH_TSV_SQL}) STORED",
+        "CREATE INDEX IF NOT EXISTS idx_gse_search_tsv ON gse_series USING gin (search_tsv)",
+        "CREATE INDEX IF NOT EXISTS idx_gse_organisms ON gse_series USING gin (organisms)",
+        f"ALTER TABLE ingest_run ALTER COLUMN start_time SET DEFAULT {UTC_NOW_SQL}",
+        "CREATE INDEX IF NOT EXISTS idx_ingest_run_start_time ON ingest_run (start_time)",
+    ]
+
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
@@ -5,6 +5,7 @@ CLI tool for fetching and storing GEO Series data.
 import argparse
 import logging
 import sys
+from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 
@@ -16,8 +17,9 @@ from db import IngestItem, IngestRun, get_db, init_db
 from db.models import GSESeries
 from geo_ingest.ncbi_client import NCBIClient
 from geo_ingest.parser import GEOParser
+from search.hybrid_search import clear_search_cache
 from vector.embeddings import get_embedding_provider
-from vector.milvus_store import MilvusStore
+from vector.search import get_vector_store
 
 # Configure logging
 logging.basicConfig(
@@ -26,6 +28,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Called as progress_callback(stage, current, total, message)
+ProgressCallback = Callable[[str, int, int, str], None]
+
 
 class IngestionPipeline:
     """Pipeline for ingesting GEO metadata into database and vector store."""
@@ -41,7 +46,7 @@ class IngestionPipeline:
         self.ncbi_client = NCBIClient()
         self.parser = GEOParser()
         self.embedding_provider = get_embedding_provider()
-        self.vector_store = MilvusStore()
+        self.vector_store = get_vector_store()
 
     def ingest_by_query(
         self,
@@ -50,6 +55,8 @@ class IngestionPipeline:
         mindate: str | None = None,
         maxdate: str | None = None,
         skip_existing: bool = True,
+        progress_callback: ProgressCallback | None = None,
+        run_id: int | None = None,
     ) -> dict[str, Any]:
         """
         Ingest GEO datasets by search query.
@@ -60,28 +67,34 @@ class IngestionPipeline:
             mindate: Minimum date filter (YYYY/MM/DD)
             maxdate: Maximum date filter (YYYY/MM/DD)
             skip_existing: Skip datasets already in database
+            progress_callback: Optional callback(stage, current, total, message)
+            run_id: Existing "running" IngestRun to record into; a new run is
+                created when omitted
 
         Returns:
             Ingestion statistics dictionary
         """
         logger.info(f"Starting ingestion: query='{query}', retmax={retmax}")
 
-        # Create ingestion run record
-        run = IngestRun(
-            query=query,
-            start_time=datetime.utcnow(),
-            status="running",
-            run_metadata={
-                "retmax": retmax,
-                "mindate": mindate,
-                "maxdate": maxdate,
-            },
-        )
-        self.db.add(run)
-        self.db.commit()
+        # Create ingestion run record unless the caller already created one
+        run = self.db.get(IngestRun, run_id) if run_id is not None else None
+        if run is None:
+            run = IngestRun(
+                query=query,
+                status="running",
+                run_metadata={
+                    "retmax": retmax,
+                    "mindate": mindate,
+                    "maxdate": maxdate,
+                },
+            )
+            self.db.add(run)
+            self.db.commit()
 
         try:
             # Search for GSE IDs
+            if progress_callback:
+                progress_callback("search", 0, 0, "Searching NCBI GEO")
             gse_ids = self.ncbi_client.search_gse(
                 query=query,
                 retmax=retmax,
@@ -98,12 +111,18 @@ class IngestionPipeline:
                 return {"total": 0, "success": 0, "errors": 0, "skipped": 0}
 
             # Get GSE accessions from IDs
+            if progress_callback:
+                progress_callback("summary", 0, len(gse_ids), "Fetching record summaries")
             summaries = self.ncbi_client.fetch_gse_summary(gse_ids)
             accessions = []
+            # The batch summaries already hold each record's metadata, so
+            # processing needs no further NCBI requests per accession
+            prefetched = {}
             for uid, summary in summaries.items():
                 acc = summary.get("accession", "")
                 if acc and acc.startswith("GSE"):
                     accessions.append(acc)
+                    prefetched[acc] = self.ncbi_client.summary_to_metadata(acc, summary)
 
             logger.info(f"Found {len(accessions)} GSE accessions")
 
@@ -122,7 +141,7 @@ class IngestionPipeline:
             self.db.commit()
 
             # Process each accession
-            results = self._process_accessions(run.id, accessions)
+            results = self._process_accessions(run.id, accessions, progress_callback, prefetched)
 
             # Update run status
             run.end_time = datetime.utcnow()
@@ -140,6 +159,7 @@ class IngestionPipeline:
 
         except Exception as e:
             logger.error(f"Ingestion failed: {e}", exc_info=True)
+            self.db.rollback()
             run.status = "failed"
             run.end_time = datetime.utcnow()
             self.db.commit()
@@ -149,6 +169,7 @@ class IngestionPipeline:
         self,
         accessions: list[str],
         skip_existing: bool = True,
+        progress_callback: ProgressCallback | None = None,
     ) -> dict[str, Any]:
         """
         Ingest specific GSE accessions.
@@ -156,6 +177,7 @@ class IngestionPipeline:
         Args:
             accessions: List of GSE accessions
             skip_existing: Skip datasets already in database
+            progress_callback: Optional callback(stage, current, total, message)
 
         Returns:
             Ingestion statistics
@@ -165,7 +187,6 @@ class IngestionPipeline:
         # Create run record
         run = IngestRun(
             query=f"Manual accession list: {', '.join(accessions[:5])}{'...' if len(accessions) > 5 else ''}",
-            start_time=datetime.utcnow(),
             status="running",
             run_metadata={"accessions": accessions, "mode": "manual"},
         )
@@ -187,7 +208,7 @@ class IngestionPipeline:
             run.total_count = len(accessions)
             self.db.commit()
 
-            results = self._process_accessions(run.id, accessions)
+            results = self._process_accessions(run.id, accessions, progress_callback)
 
             run.end_time = datetime.utcnow()
             run.success_count = results["success"]
@@ -204,30 +225,41 @@ class IngestionPipeline:
             self.db.commit()
             raise
 
-    def _process_accessions(self, run_id: int, accessions: list[str]) -> dict[str, int]:
+    def _process_accessions(
+        self,
+        run_id: int,
+        accessions: list[str],
+        progress_callback: ProgressCallback | None = None,
+        prefetched: dict[str, dict[str, Any]] | None = None,
+    ) -> dict[str, int]:
         """
         Process list of accessions: fetch, parse, store.
 
         Args:
             run_id: Ingestion run ID
             accessions: List of GSE accessions
+            progress_callback: Optional callback(stage, current, total, message)
+            prefetched: Metadata already fetched per accession; only accessions
+                missing here are fetched from NCBI
 
         Returns:
             Statistics dictionary
         """
         stats = {"success": 0, "errors": 0, "skipped": 0}
 
-        for accession in tqdm(accessions, desc="Processing GSE records"):
+        for i, accession in enumerate(tqdm(accessions, desc="Processing GSE records")):
+            if progress_callback:
+                progress_callback("process", i, len(accessions), f"Processing {accession}")
+
+            # Each record's item and GSE row are written in a single commit
             item = IngestItem(run_id=run_id, accession=accession, status="pending")
             self.db.add(item)
-            self.db.commit()
 
             try:
                 # Fetch
-                item.status = "fetching"
-                self.db.commit()
-
-                raw_data = self.ncbi_client.fetch_gse_text(accession)
+                raw_data = (prefetched or {}).get(accession)
+                if raw_data is None:
+                    raw_data = self.ncbi_client.fetch_gse_text(accession)
                 item.fetch_time = datetime.utcnow()
 
                 if "error" in raw_data:
@@ -238,9 +270,6 @@ class IngestionPipeline:
                     continue
 
                 # Parse
-                item.status = "parsing"
-                self.db.commit()
-
                 parsed = self.parser.parse_gse_metadata(raw_data)
                 if not parsed:
                     item.status = "failed"
@@ -250,17 +279,13 @@ class IngestionPipeline:
                     continue
 
                 # Store in database
-                item.status = "storing"
-                self.db.commit()
-
                 gse = GSESeries(**parsed)
                 self.db.merge(gse)  # Upsert
-                self.db.commit()
 
                 # Generate and store embedding
                 embedding_text = self.parser.prepare_embedding_text(parsed)
-                embedding = self.embedding_provider.embed_texts([embedding_text])[0]
-                self.vector_store.upsert_embeddings([(accession, embedding)])
+                embeddings = self.embedding_provider.embed_texts([embedding_text])
+                self.vector_store.insert_vectors([accession], embeddings)
 
                 # Success
                 item.status = "completed"
@@ -270,11 +295,28 @@ class IngestionPipeline:
 
             except Exception as e:
                 logger.error(f"Failed to process {accession}: {e}", exc_info=True)
-                item.status = "failed"
-                item.error_message = str(e)
+                # Discard the record's uncommitted writes, then log the failure alone
+                self.db.rollback()
+                self.db.add(
+                    IngestItem(
+                        run_id=run_id,
+                        accession=accession,
+                        status="failed",
+                        error_message=str(e),
+                    )
+                )
                 self.db.commit()
                 stats["errors"] += 1
 
+        # Inserts aren't flushed per record; seal them once for the whole batch
+        if stats["success"]:
+            self.vector_store.flush()
+            # Cached search_geo and semantic_search results predate these records
+            clear_search_cache()
+
+        if progress_callback:
+            progress_callback("process", len(accessions), len(accessions), "Processing complete")
+
         return stats
 
 
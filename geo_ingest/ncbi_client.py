@@ -10,12 +10,44 @@ from xml.etree import ElementTree as ET
 import backoff
 import requests
 from ratelimit import limits, sleep_and_retry
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config import settings
 
 logger = logging.getLogger(__name__)
 
 
+def create_http_session(retries: int = 5) -> requests.Session:
+    """
+    Create a requests session with pooled keep-alive connections and retries.
+
+    Throttling and gateway errors are retried by urllib3, honouring
+    Retry-After, before they surface as exceptions to callers.
+
+    Args:
+        retries: Transport-level retries; 0 leaves retrying to the caller
+
+    Returns:
+        Configured requests session
+    """
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503),
+            allowed_methods=("GET",),
+            raise_on_status=False,
+        ) if retries else 0,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 class NCBIClient:
     """
     Client for NCBI E-utilities API.
@@ -51,7 +83,9 @@ class NCBIClient:
         else:
             self.rate_limit = 3.0
 
-        self.session = requests.Session()
+        # _make_request's backoff is the only retry layer, so every retry
+        # also passes through the rate limiter
+        self.session = create_http_session(retries=0)
         self.session.headers.update({"User-Agent": f"{self.tool} ({self.email})"})
 
         logger.info(
@@ -242,11 +276,24 @@ class NCBIClient:
             logger.warning(f"No summary data for {gse_accession}")
             return {"accession": gse_accession, "error": "No summary data available"}
 
-        summary_data = summary[uid]
-
         logger.info(f"Fetching metadata for {gse_accession} (UID: {uid})")
 
-        # Build metadata from summary
+        return self.summary_to_metadata(gse_accession, summary[uid])
+
+    def summary_to_metadata(self, gse_accession: str, summary_data: dict[str, Any]) -> dict[str, Any]:
+        """
+        Build the fetch_gse_text metadata dictionary from an ESummary record.
+
+        Lets callers that already hold a batch of summaries skip the
+        per-accession ESearch and ESummary requests.
+
+        Args:
+            gse_accession: GSE accession (e.g., 'GSE123456')
+            summary_data: ESummary record for that accession
+
+        Returns:
+            Dictionary with the same fields as fetch_gse_text
+        """
         parsed = {
             "accession": gse_accession,
             "title": summary_data.get("title", ""),
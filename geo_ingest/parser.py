@@ -10,6 +10,16 @@ from typing import Any
 logger = logging.getLogger(__name__)
 
 
+def _compile_tech_patterns(
+    keywords: dict[str, list[str]], priority: list[str]
+) -> list[tuple[str, re.Pattern[str]]]:
+    """Compile each technology's keywords into one alternation, in priority order."""
+    return [
+        (tech, re.compile("|".join(re.escape(keyword) for keyword in keywords[tech])))
+        for tech in priority
+    ]
+
+
 class GEOParser:
     """Parser for GEO Series metadata."""
 
@@ -26,6 +36,21 @@ class GEOParser:
         "other-seq": ["sequencing", "-seq"],
     }
 
+    # Priority order: single-cell > rna-seq > chip-seq > other specific > other-seq > microarray
+    TECH_PRIORITY = [
+        "single-cell",
+        "rna-seq",
+        "chip-seq",
+        "atac-seq",
+        "methylation",
+        "wgs",
+        "wes",
+        "other-seq",
+        "microarray",
+    ]
+
+    _TECH_PATTERNS = _compile_tech_patterns(TECH_KEYWORDS, TECH_PRIORITY)
+
     @staticmethod
     def parse_gse_metadata(raw_data: dict[str, Any]) -> dict[str, Any]:
         """
@@ -66,7 +91,7 @@ class GEOParser:
         pubmed_ids = [str(pmid) for pmid in raw_data.get("pubmed_ids", []) if pmid]
 
         # Technology type inference
-        combined_text = f"{title} {summary} {overall_design}".lower()
+        combined_text = f"{title} {summary} {overall_design}"
         tech_type = GEOParser._infer_tech_type(combined_text)
 
         # Sample count
@@ -146,28 +171,14 @@ class GEOParser:
         """
         Infer technology type from text content.
 
-        Priority order: single-cell > rna-seq > chip-seq > other specific > microarray > other-seq
+        The first technology in TECH_PRIORITY with any keyword in the text wins.
         """
         text_lower = text.lower()
 
-        # Check in priority order
-        priority_order = [
-            "single-cell",
-            "rna-seq",
-            "chip-seq",
-            "atac-seq",
-            "methylation",
-            "wgs",
-            "wes",
-            "other-seq",
-            "microarray",
-        ]
-
-        for tech in priority_order:
-            keywords = GEOParser.TECH_KEYWORDS.get(tech, [])
-            for keyword in keywords:
-                if keyword in text_lower:
-                    return tech
+        # One precompiled scan per technology instead of one per keyword
+        for tech, pattern in GEOParser._TECH_PATTERNS:
+            if pattern.search(text_lower):
+                return tech
 
         return "unknown"
 
@@ -3,20 +3,98 @@ MeSH descriptor loader.
 Loads MeSH terms from ASCII or XML files into the database.
 """
 import argparse
+import csv
+import io
+import json
 import logging
 import sys
-import xml.etree.ElementTree as ET
+from collections.abc import Iterator
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from lxml import etree
 from sqlalchemy.orm import Session
 from tqdm import tqdm
 
 from db import MeshTerm, get_db, init_db
+from mesh.query_expand import clear_mesh_vocabulary
 
 logger = logging.getLogger(__name__)
 
 
+# Columns written by COPY, in order; created_at has no server default
+MESH_COPY_COLUMNS = ("mesh_id", "descriptor_ui", "preferred_name", "entry_terms", "tree_numbers", "created_at")
+
+
+def insert_mesh_terms(db: Session, rows: list[dict[str, Any]]) -> None:
+    """
+    Insert new MeSH term rows in the session's current transaction.
+
+    Uses COPY FROM STDIN on psycopg2 connections and bulk_insert_mappings
+    everywhere else (e.g. SQLite in tests). The caller commits.
+
+    Args:
+        db: Database session
+        rows: Term dictionaries keyed by MeshTerm column name
+    """
+    if not rows:
+        return
+
+    if db.get_bind().dialect.driver != "psycopg2":
+        db.bulk_insert_mappings(MeshTerm, rows)
+        return
+
+    created_at = datetime.utcnow().isoformat()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # csv.writer writes None as an unquoted empty field, which COPY reads as NULL
+        writer.writerow((
+            row["mesh_id"],
+            row.get("descriptor_ui"),
+            row["preferred_name"],
+            _json_or_none(row.get("entry_terms")),
+            _json_or_none(row.get("tree_numbers")),
+            created_at,
+        ))
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {MeshTerm.__tablename__} ({', '.join(MESH_COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def _json_or_none(value: Any) -> str | None:
+    """Serialize a JSON column value for COPY, keeping None as NULL."""
+    return json.dumps(value) if value is not None else None
+
+
+def iter_descriptor_records(file_path: str) -> Iterator[etree._Element]:
+    """
+    Stream DescriptorRecord elements from a MeSH XML file.
+
+    Each record is cleared and detached from the tree once the caller moves on,
+    so memory stays flat instead of growing with the whole document.
+
+    Args:
+        file_path: Path to MeSH XML file
+
+    Yields:
+        One DescriptorRecord element at a time
+    """
+    for _, record in etree.iterparse(file_path, events=("end",), tag="DescriptorRecord"):
+        yield record
+        record.clear()
+        while record.getprevious() is not None:
+            del record.getparent()[0]
+
+
 def load_mesh_from_xml(file_path: str, db: Session) -> int:
     """
     Load MeSH descriptors from XML file (desc2026.xml format).
@@ -36,18 +114,11 @@ def load_mesh_from_xml(file_path: str, db: Session) -> int:
     if not Path(file_path).exists():
         raise FileNotFoundError(f"MeSH file not found: {file_path}")
 
-    # Parse XML
-    tree = ET.parse(file_path)
-    root = tree.getroot()
-
-    descriptors = root.findall(".//DescriptorRecord")
-    logger.info(f"Found {len(descriptors)} descriptors")
-
     count = 0
-    batch_size = 1000
+    batch_size = 5000
     batch = []
 
-    for desc in tqdm(descriptors, desc="Loading MeSH terms"):
+    for desc in tqdm(iter_descriptor_records(file_path), desc="Loading MeSH terms"):
         # Get descriptor UI and name
         descriptor_ui = desc.find(".//DescriptorUI")
         descriptor_name = desc.find(".//DescriptorName/String")
@@ -74,30 +145,30 @@ def load_mesh_from_xml(file_path: str, db: Session) -> int:
             if tn.text:
                 tree_numbers.append(tn.text)
 
-        # Create MeshTerm object
-        mesh_term = MeshTerm(
-            mesh_id=mesh_id,
-            descriptor_ui=mesh_id,
-            preferred_name=preferred_name,
-            entry_terms=entry_terms,
-            tree_numbers=tree_numbers,
-        )
-
-        batch.append(mesh_term)
+        # Plain row mappings; no MeshTerm objects or unit-of-work bookkeeping
+        batch.append({
+            "mesh_id": mesh_id,
+            "descriptor_ui": mesh_id,
+            "preferred_name": preferred_name,
+            "entry_terms": entry_terms,
+            "tree_numbers": tree_numbers,
+        })
 
         # Commit in batches
         if len(batch) >= batch_size:
-            db.bulk_save_objects(batch)
+            insert_mesh_terms(db, batch)
             db.commit()
             count += len(batch)
             batch = []
 
     # Commit remaining
     if batch:
-        db.bulk_save_objects(batch)
+        insert_mesh_terms(db, batch)
         db.commit()
         count += len(batch)
 
+    clear_mesh_vocabulary()
+
     logger.info(f"Loaded {count} MeSH terms")
     return count
 
@@ -214,6 +285,7 @@ def load_mesh_sample_data(db: Session) -> int:
         db.merge(mesh_term)  # Use merge to avoid conflicts
 
     db.commit()
+    clear_mesh_vocabulary()
 
     logger.info(f"Loaded {len(sample_terms)} sample MeSH terms")
     return len(sample_terms)
@@ -4,8 +4,10 @@ Automatically tags datasets with relevant MeSH terms.
 """
 import logging
 import re
+from collections import Counter
 from typing import Any
 
+import ahocorasick
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
@@ -56,8 +58,43 @@ class MeSHMatcher:
                         self.term_lookup[entry_lower] = []
                     self.term_lookup[entry_lower].append(term.mesh_id)
 
+        self._build_term_index()
+
         logger.info(f"Loaded {len(terms)} MeSH terms with {len(self.term_lookup)} searchable variants")
 
+    def _build_term_index(self) -> None:
+        """
+        Precompute per-term matching data so scoring a document doesn't
+        visit every MeSH term.
+
+        Phrase matches come from an Aho-Corasick automaton over all term
+        texts; token matches come from a token -> term postings index.
+        """
+        self._term_index: list[tuple[str, frozenset[str], float, float, list[str]]] = []
+        self._phrase_automaton = ahocorasick.Automaton()
+        self._token_postings: dict[str, list[int]] = {}
+
+        for term_text, mesh_ids in self.term_lookup.items():
+            # Skip very short terms to reduce false positives
+            if len(term_text) < 4:
+                continue
+
+            term_tokens = term_text.split()
+            phrase_confidence = min(1.0, 0.5 + (len(term_tokens) * 0.1))
+            token_set = frozenset(term_tokens)
+            token_confidence = min(0.7, 0.3 + (len(token_set) * 0.1))
+
+            index = len(self._term_index)
+            self._term_index.append(
+                (term_text, token_set, phrase_confidence, token_confidence, mesh_ids)
+            )
+            self._phrase_automaton.add_word(term_text, index)
+            for token in token_set:
+                self._token_postings.setdefault(token, []).append(index)
+
+        if self._term_index:
+            self._phrase_automaton.make_automaton()
+
     def match_gse(
         self,
         accession: str,
@@ -79,14 +116,80 @@ class MeSHMatcher:
             logger.warning(f"GSE not found: {accession}")
             return []
 
+        filtered = self._match_fields(
+            gse.title, gse.summary, gse.overall_design, confidence_threshold
+        )
+
+        logger.info(f"Found {len(filtered)} MeSH matches for {accession}")
+        return filtered
+
+    def match_gse_batch(
+        self,
+        accessions: list[str],
+        confidence_threshold: float = 0.3,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Find MeSH terms matching many GSE records, loading their text in one query.
+
+        Args:
+            accessions: List of GSE accessions
+            confidence_threshold: Minimum confidence score (0-1)
+
+        Returns:
+            Dictionary of accession -> matched MeSH terms (same format as match_gse).
+            Accessions not found in the database are omitted.
+        """
+        if not accessions:
+            return {}
+
+        rows = (
+            self.db.query(
+                GSESeries.accession,
+                GSESeries.title,
+                GSESeries.summary,
+                GSESeries.overall_design,
+            )
+            .filter(GSESeries.accession.in_(accessions))
+            .all()
+        )
+
+        results = {
+            accession: self._match_fields(title, summary, overall_design, confidence_threshold)
+            for accession, title, summary, overall_design in rows
+        }
+
+        logger.info(
+            f"Matched MeSH terms for {len(results)} of {len(accessions)} GSE records"
+        )
+        return results
+
+    def _match_fields(
+        self,
+        title: str | None,
+        summary: str | None,
+        overall_design: str | None,
+        confidence_threshold: float,
+    ) -> list[dict[str, Any]]:
+        """
+        Score a GSE record's text fields against the MeSH vocabulary.
+
+        Args:
+            title: GSE title
+            summary: GSE summary
+            overall_design: GSE overall design
+            confidence_threshold: Minimum confidence score (0-1)
+
+        Returns:
+            List of matched MeSH terms sorted by confidence
+        """
         # Combine text fields for matching
         text_fields = []
-        if gse.title:
-            text_fields.append(("title", gse.title, 2.0))  # Weight
-        if gse.summary:
-            text_fields.append(("summary", gse.summary, 1.5))
-        if gse.overall_design:
-            text_fields.append(("design", gse.overall_design, 1.0))
+        if title:
+            text_fields.append(("title", title, 2.0))  # Weight
+        if summary:
+            text_fields.append(("summary", summary, 1.5))
+        if overall_design:
+            text_fields.append(("design", overall_design, 1.0))
 
         # Match terms
         matches: dict[str, float] = {}  # mesh_id -> confidence
@@ -108,8 +211,6 @@ class MeSHMatcher:
 
         # Sort by confidence
         filtered.sort(key=lambda x: x["confidence"], reverse=True)
-
-        logger.info(f"Found {len(filtered)} MeSH matches for {accession}")
         return filtered
 
     def _match_text(self, text: str, weight: float = 1.0) -> dict[str, float]:
@@ -123,45 +224,37 @@ class MeSHMatcher:
         Returns:
             Dictionary of mesh_id -> confidence score
         """
-        if not text:
+        if not text or not self._term_index:
             return {}
 
         text_lower = text.lower()
-        matches: dict[str, float] = {}
-
-        # Token-based matching
-        # Split text into tokens for better matching
-        tokens = re.findall(r'\b\w+\b', text_lower)
-        token_set = set(tokens)
+        term_confidence: dict[int, float] = {}
+
+        # Exact phrase match (highest confidence): every term occurring as a
+        # substring, found in one pass over the text
+        for _, index in self._phrase_automaton.iter(text_lower):
+            term_confidence[index] = self._term_index[index][2]
+
+        # Token-based match (lower confidence): a term matches when all of its
+        # tokens occur in the text, i.e. its posting hits equal its token count
+        token_set = set(re.findall(r'\b\w+\b', text_lower))
+        token_hits = Counter(
+            index
+            for token in token_set
+            for index in self._token_postings.get(token, ())
+        )
+        for index, hits in token_hits.items():
+            if index not in term_confidence and hits == len(self._term_index[index][1]):
+                term_confidence[index] = self._term_index[index][3]
 
-        for term_text, mesh_ids in self.term_lookup.items():
-            # Skip very short terms to reduce false positives
-            if len(term_text) < 4:
-                continue
-
-            # Calculate confidence based on match quality
-            confidence = 0.0
-
-            # Exact phrase match (highest confidence)
-            if term_text in text_lower:
-                # Boost confidence based on term length
-                term_len = len(term_text.split())
-                confidence = min(1.0, 0.5 + (term_len * 0.1))
-
-            # Token-based match (lower confidence)
-            else:
-                term_tokens = set(term_text.split())
-                if term_tokens.issubset(token_set):
-                    overlap = len(term_tokens)
-                    confidence = min(0.7, 0.3 + (overlap * 0.1))
-
-            if confidence > 0:
-                confidence *= weight
-                for mesh_id in mesh_ids:
-                    if mesh_id in matches:
-                        matches[mesh_id] = max(matches[mesh_id], confidence)
-                    else:
-                        matches[mesh_id] = confidence
+        matches: dict[str, float] = {}
+        for index, confidence in term_confidence.items():
+            confidence *= weight
+            for mesh_id in self._term_index[index][4]:
+                if mesh_id in matches:
+                    matches[mesh_id] = max(matches[mesh_id], confidence)
+                else:
+                    matches[mesh_id] = confidence
 
         return matches
 
@@ -184,31 +277,49 @@ class MeSHMatcher:
         """
         logger.info(f"Tagging {len(accessions)} GSE records with MeSH terms")
 
-        total_associations = 0
-
-        for accession in accessions:
-            # Delete existing if overwrite
-            if overwrite:
-                self.db.query(GSEMesh).filter(
-                    GSEMesh.accession == accession,
+        # Delete existing if overwrite; otherwise load them once so they are skipped
+        existing: set[tuple[str, str]] = set()
+        if overwrite:
+            self.db.query(GSEMesh).filter(
+                GSEMesh.accession.in_(accessions),
+                GSEMesh.source == "auto",
+            ).delete(synchronize_session=False)
+        else:
+            existing = {
+                (accession, mesh_id)
+                for accession, mesh_id in self.db.query(GSEMesh.accession, GSEMesh.mesh_id)
+                .filter(
+                    GSEMesh.accession.in_(accessions),
                     GSEMesh.source == "auto",
-                ).delete()
-
-            # Match and create associations
-            matches = self.match_gse(accession, confidence_threshold)
-
-            for match in matches:
-                association = GSEMesh(
-                    accession=accession,
-                    mesh_id=match["mesh_id"],
-                    source="auto",
-                    confidence=match["confidence"],
                 )
-                self.db.merge(association)
-                total_associations += 1
+                .all()
+            }
+
+        # Match all records in one pass, then insert new associations in bulk
+        batch_matches = self.match_gse_batch(accessions, confidence_threshold)
+
+        rows = [
+            {
+                "accession": accession,
+                "mesh_id": match["mesh_id"],
+                "source": "auto",
+                "confidence": match["confidence"],
+            }
+            for accession, matches in batch_matches.items()
+            for match in matches
+            if (accession, match["mesh_id"]) not in existing
+        ]
+        self.db.bulk_insert_mappings(GSEMesh, rows)
+        total_associations = len(rows)
 
         self.db.commit()
 
+        # Imported here: search imports the mesh package, which imports this module
+        from search.hybrid_search import clear_search_cache
+
+        # MeSH boosts in cached search results predate these tags
+        clear_search_cache()
+
         logger.info(f"Created {total_associations} MeSH associations")
         return total_associations
 
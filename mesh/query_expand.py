@@ -2,13 +2,18 @@
 Query expansion using MeSH terms.
 Expands user queries with MeSH synonyms and related terms.
 """
+import functools
 import logging
 import re
+import threading
+import time
 from typing import Any
 
-from sqlalchemy import String, func, or_
+import ahocorasick
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from config import settings
 from db import MeshTerm, get_db
 
 logger = logging.getLogger(__name__)
@@ -57,11 +62,8 @@ class QueryExpander:
         """
         logger.info(f"Expanding query: '{query}'")
 
-        # Tokenize query
-        tokens = self._tokenize(query)
-
         # Find matching MeSH terms
-        matched_terms = self._find_matching_mesh_terms(tokens, max_terms)
+        matched_terms = self._find_matching_mesh_terms(query, max_terms)
 
         if not matched_terms:
             logger.info("No MeSH terms matched")
@@ -103,101 +105,178 @@ class QueryExpander:
             "expansion_tokens": expansion_tokens,
         }
 
-    def _tokenize(self, text: str) -> list[str]:
+    def _find_matching_mesh_terms(
+        self,
+        query: str,
+        max_terms: int,
+    ) -> list[dict[str, Any]]:
         """
-        Tokenize text into words and phrases.
+        Find MeSH terms whose preferred name or entry terms occur in the query.
 
         Args:
-            text: Input text
+            query: User's search query
+            max_terms: Maximum number of terms to return
 
         Returns:
-            List of tokens (words and bigrams/trigrams)
+            List of matched MeSH term info dictionaries
+        """
+        vocabulary = get_mesh_vocabulary(self.db)
+        return vocabulary.match(query)[:max_terms]
+
+
+class MeshVocabulary:
+    """
+    In-memory MeSH vocabulary backed by an Aho-Corasick automaton.
+    Finds every MeSH name or entry term in a query in a single linear pass.
+    """
+
+    def __init__(self, rows: list[tuple[str, str, list[str] | None, str | None]]):
         """
-        # Clean and lowercase
-        text = text.lower()
-        text = re.sub(r'[^\w\s-]', ' ', text)
+        Build the automaton.
 
-        # Extract words
-        words = text.split()
+        Args:
+            rows: (mesh_id, preferred_name, entry_terms, descriptor_ui) tuples
+        """
+        self.terms: dict[str, dict[str, Any]] = {}
+        self.automaton = ahocorasick.Automaton()
+
+        phrases: dict[str, list[str]] = {}
+        for mesh_id, preferred_name, entry_terms, descriptor_ui in rows:
+            self.terms[mesh_id] = {
+                "mesh_id": mesh_id,
+                "preferred_name": preferred_name,
+                "entry_terms": entry_terms or [],
+                "descriptor_ui": descriptor_ui,
+            }
 
-        # Create n-grams (1, 2, 3)
-        tokens = []
-        for i in range(len(words)):
-            # Unigram
-            tokens.append(words[i])
+            for name in [preferred_name, *(entry_terms or [])]:
+                phrase = _normalize(name)
+                if len(phrase) < 3:  # Skip very short terms
+                    continue
+                mesh_ids = phrases.setdefault(phrase, [])
+                if mesh_id not in mesh_ids:
+                    mesh_ids.append(mesh_id)
 
-            # Bigram
-            if i < len(words) - 1:
-                tokens.append(f"{words[i]} {words[i+1]}")
+        # Pad phrases with spaces so matches fall on word boundaries
+        for phrase, mesh_ids in phrases.items():
+            self.automaton.add_word(f" {phrase} ", (len(phrase), mesh_ids))
 
-            # Trigram
-            if i < len(words) - 2:
-                tokens.append(f"{words[i]} {words[i+1]} {words[i+2]}")
+        if phrases:
+            self.automaton.make_automaton()
 
-        return tokens
+        # Per-instance cache of normalized query -> matches; rebuilding the
+        # vocabulary after a MeSH load starts with an empty cache
+        self._match_normalized = functools.lru_cache(maxsize=512)(self._scan)
 
-    def _find_matching_mesh_terms(
-        self,
-        tokens: list[str],
-        max_terms: int,
-    ) -> list[dict[str, Any]]:
+        logger.info(f"Built MeSH vocabulary: {len(self.terms)} terms, {len(phrases)} phrases")
+
+    def match(self, text: str) -> list[dict[str, Any]]:
         """
-        Find MeSH terms matching query tokens.
+        Find MeSH terms occurring in text.
 
         Args:
-            tokens: Query tokens
-            max_terms: Maximum number of terms to return
+            text: Input text
 
         Returns:
-            List of matched MeSH term info dictionaries
+            List of MeSH term info dictionaries, ordered by position in the
+            text with longer phrases first at the same position
         """
-        matches = []
+        if not self.terms:
+            return []
 
-        # Build search conditions
-        # Look for matches in preferred_name and entry_terms
-        for token in tokens:
-            if len(token) < 3:  # Skip very short tokens
-                continue
+        return list(self._match_normalized(_normalize(text)))
 
-            # Case-insensitive search
-            search_pattern = f"%{token}%"
+    def _scan(self, normalized: str) -> tuple[dict[str, Any], ...]:
+        """
+        Run the automaton over normalized text.
 
-            # Search in preferred name
-            query = self.db.query(MeshTerm).filter(
-                func.lower(MeshTerm.preferred_name).like(search_pattern)
-            )
+        Args:
+            normalized: Text already passed through _normalize
+
+        Returns:
+            Matched MeSH term info dictionaries, in match() order
+        """
+        padded = f" {normalized} "
+
+        hits = []
+        for end, (length, mesh_ids) in self.automaton.iter(padded):
+            start = end - length - 1
+            hits.append((start, -length, mesh_ids))
+        hits.sort(key=lambda hit: (hit[0], hit[1]))
+
+        matches: dict[str, dict[str, Any]] = {}
+        for _, _, mesh_ids in hits:
+            for mesh_id in mesh_ids:
+                matches.setdefault(mesh_id, self.terms[mesh_id])
 
-            # Also search in entry terms (JSONB array)
-            # Note: This is PostgreSQL-specific
-            query = query.union(
-                self.db.query(MeshTerm).filter(
-                    func.lower(func.cast(MeshTerm.entry_terms, String)).like(search_pattern)
-                )
+        return tuple(matches.values())
+
+
+_vocabulary: MeshVocabulary | None = None
+_vocabulary_checked_at = 0.0  # Monotonic time of the last build or count check
+_vocabulary_lock = threading.Lock()
+
+
+def get_mesh_vocabulary(db: Session) -> MeshVocabulary:
+    """
+    Get the process-wide MeSH vocabulary, loading it on first use.
+
+    At most every settings.mesh_vocabulary_check_interval seconds the mesh_term
+    row count is compared with the vocabulary, and the vocabulary is rebuilt if
+    they differ. This picks up loads done by other processes, and a vocabulary
+    built before MeSH was loaded doesn't stay empty.
+
+    Args:
+        db: Database session used for loading and checking
+
+    Returns:
+        Shared MeshVocabulary instance
+    """
+    global _vocabulary, _vocabulary_checked_at
+
+    vocabulary = _vocabulary
+    if (
+        vocabulary is not None
+        and time.monotonic() - _vocabulary_checked_at < settings.mesh_vocabulary_check_interval
+    ):
+        return vocabulary
+
+    with _vocabulary_lock:
+        if _vocabulary is not None:
+            # Another thread may have checked while this one waited for the lock
+            if time.monotonic() - _vocabulary_checked_at < settings.mesh_vocabulary_check_interval:
+                return _vocabulary
+
+            _vocabulary_checked_at = time.monotonic()
+            count = db.query(func.count(MeshTerm.mesh_id)).scalar()
+            if count == len(_vocabulary.terms):
+                return _vocabulary
+            logger.info(
+                f"mesh_term count changed ({len(_vocabulary.terms)} -> {count}), "
+                f"rebuilding MeSH vocabulary"
             )
 
-            results = query.limit(max_terms).all()
+        rows = db.query(
+            MeshTerm.mesh_id,
+            MeshTerm.preferred_name,
+            MeshTerm.entry_terms,
+            MeshTerm.descriptor_ui,
+        ).all()
+        _vocabulary = MeshVocabulary(rows)
+        _vocabulary_checked_at = time.monotonic()
 
-            for mesh_term in results:
-                # Check if already added
-                if mesh_term.mesh_id in [m["mesh_id"] for m in matches]:
-                    continue
+        return _vocabulary
 
-                matches.append({
-                    "mesh_id": mesh_term.mesh_id,
-                    "preferred_name": mesh_term.preferred_name,
-                    "entry_terms": mesh_term.entry_terms or [],
-                    "descriptor_ui": mesh_term.descriptor_ui,
-                })
 
-                if len(matches) >= max_terms:
-                    break
+def clear_mesh_vocabulary() -> None:
+    """Drop the cached MeSH vocabulary so it is rebuilt after MeSH terms change."""
+    global _vocabulary
+    _vocabulary = None
 
-            if len(matches) >= max_terms:
-                break
 
-        # Sort by relevance (prefer exact matches in preferred name)
-        # For now, just return in order found
-        return matches[:max_terms]
+def _normalize(text: str) -> str:
+    """Lowercase text, drop punctuation other than hyphens and collapse whitespace."""
+    return " ".join(re.sub(r'[^\w\s-]', ' ', text.lower()).split())
 
 
 def expand_query_simple(query: str, db: Session | None = None) -> str:
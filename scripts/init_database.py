@@ -7,13 +7,22 @@ import logging
 import sys
 from datetime import datetime
 
+from sqlalchemy import func, select, text
+
 from config import settings
-from db import init_db, get_db
+from db import engine, init_db, get_db
 from db.models import GSESeries, MeshTerm, IngestRun, Base
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+REQUIRED_TABLES = [model.__tablename__ for model in (GSESeries, MeshTerm, IngestRun)]
+
+# One round trip probes every table: to_regclass() is NULL for a missing table
+TABLES_EXIST_SQL = text(
+    "SELECT " + ", ".join(f"to_regclass(:t{i})" for i in range(len(REQUIRED_TABLES)))
+)
+
 
 def check_database_connection():
     """Test database connection."""
@@ -21,12 +30,12 @@ def check_database_connection():
     try:
         db = next(get_db())
         # Simple query to verify connection
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         db.close()
         logger.info("✓ Database connection successful")
         return True
     except Exception as e:
-        logger.error(f"✗ Database connection failed: {e}")
+        logger.error("✗ Database connection failed: %s", e)
         return False
 
 
@@ -38,7 +47,7 @@ def create_tables():
         logger.info("✓ Database tables created successfully")
         return True
     except Exception as e:
-        logger.error(f"✗ Failed to create tables: {e}")
+        logger.error("✗ Failed to create tables: %s", e)
         return False
 
 
@@ -46,28 +55,22 @@ def verify_tables_exist():
     """Verify all required tables exist."""
     logger.info("Verifying database tables...")
     try:
-        db = next(get_db())
-        
-        # Check if tables exist by querying them
-        tables_to_check = {
-            'gse_series': GSESeries,
-            'mesh_term': MeshTerm,
-            'ingest_run': IngestRun,
-        }
-        
-        for table_name, model in tables_to_check.items():
-            try:
-                db.query(model).limit(1).all()
-                logger.info(f"  ✓ Table '{table_name}' exists")
-            except Exception as e:
-                logger.error(f"  ✗ Table '{table_name}' missing: {e}")
+        with engine.connect() as conn:
+            row = conn.execute(
+                TABLES_EXIST_SQL,
+                {f"t{i}": table_name for i, table_name in enumerate(REQUIRED_TABLES)},
+            ).one()
+
+        for table_name, regclass in zip(REQUIRED_TABLES, row):
+            if regclass is None:
+                logger.error("  ✗ Table '%s' missing", table_name)
                 return False
-        
-        db.close()
+            logger.info("  ✓ Table '%s' exists", table_name)
+
         logger.info("✓ All required tables exist")
         return True
     except Exception as e:
-        logger.error(f"✗ Table verification failed: {e}")
+        logger.error("✗ Table verification failed: %s", e)
         return False
 
 
@@ -75,23 +78,29 @@ def get_database_stats():
     """Get current database statistics."""
     logger.info("Getting database statistics...")
     try:
-        db = next(get_db())
-        
+        # All three counts in one single-row query
+        counts = select(
+            *(
+                select(func.count()).select_from(model).scalar_subquery()
+                for model in (GSESeries, MeshTerm, IngestRun)
+            )
+        )
+        with engine.connect() as conn:
+            gse_count, mesh_count, ingest_runs = conn.execute(counts).one()
+
         stats = {
-            'gse_count': db.query(GSESeries).count(),
-            'mesh_count': db.query(MeshTerm).count(),
-            'ingest_runs': db.query(IngestRun).count(),
+            'gse_count': gse_count,
+            'mesh_count': mesh_count,
+            'ingest_runs': ingest_runs,
         }
         
-        db.close()
-        
-        logger.info(f"  • GSE Records: {stats['gse_count']}")
-        logger.info(f"  • MeSH Terms: {stats['mesh_count']}")
-        logger.info(f"  • Ingestion Runs: {stats['ingest_runs']}")
+        logger.info("  • GSE Records: %s", stats['gse_count'])
+        logger.info("  • MeSH Terms: %s", stats['mesh_count'])
+        logger.info("  • Ingestion Runs: %s", stats['ingest_runs'])
         
         return stats
     except Exception as e:
-        logger.error(f"✗ Failed to get database stats: {e}")
+        logger.error("✗ Failed to get database stats: %s", e)
         return None
 
 
@@ -152,17 +161,17 @@ def main():
         logger.info("")
         logger.info("Database Status: ✓ READY FOR INGESTION")
     else:
-        logger.info(f"✓ Database contains {stats['gse_count']} GSE records")
+        logger.info("✓ Database contains %s GSE records", stats['gse_count'])
         logger.info("  Ready to search and analyze data")
         logger.info("")
         logger.info("Database Status: ✓ READY FOR USE")
     
     logger.info("")
     logger.info("Configuration:")
-    logger.info(f"  • Host: {settings.postgres_host}")
-    logger.info(f"  • Port: {settings.postgres_port}")
-    logger.info(f"  • Database: {settings.postgres_db}")
-    logger.info(f"  • User: {settings.postgres_user}")
+    logger.info("  • Host: %s", settings.postgres_host)
+    logger.info("  • Port: %s", settings.postgres_port)
+    logger.info("  • Database: %s", settings.postgres_db)
+    logger.info("  • User: %s", settings.postgres_user)
     
     logger.info("")
     logger.info("=" * 60)
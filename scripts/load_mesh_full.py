@@ -5,20 +5,22 @@ This script fetches ~30,000 MeSH descriptors with synonyms and loads them into P
 """
 import argparse
 import gzip
+import hashlib
 import logging
 import os
+import pickle
 import sys
 from pathlib import Path
-from xml.etree import ElementTree as ET
 
-import requests
 from tqdm import tqdm
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from db import get_db
+from db import SessionLocal, get_db
 from db.models import MeshTerm
+from geo_ingest.ncbi_client import create_http_session
+from mesh.loader import insert_mesh_terms, iter_descriptor_records
 
 logging.basicConfig(
     level=logging.INFO,
@@ -30,6 +32,11 @@ logger = logging.getLogger(__name__)
 # See: https://nlmpubs.nlm.nih.gov/projects/mesh/2024/xmlmesh/
 MESH_XML_URL = "https://nlmpubs.nlm.nih.gov/projects/mesh/2024/xmlmesh/desc2024.xml"
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Shared keep-alive session for NLM downloads
+_HTTP = create_http_session()
+
 
 def download_mesh_xml(output_path: str, force: bool = False) -> str:
     """
@@ -45,11 +52,12 @@ def download_mesh_xml(output_path: str, force: bool = False) -> str:
     output_file = Path(output_path)
 
     if output_file.exists() and not force:
-        logger.info(f"MeSH XML already exists at {output_file}")
-        logger.info(f"File size: {output_file.stat().st_size / 1024 / 1024:.1f} MB")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("MeSH XML already exists at %s", output_file)
+            logger.info("File size: %.1f MB", output_file.stat().st_size / 1024 / 1024)
         return str(output_file)
 
-    logger.info(f"Downloading MeSH data from {MESH_XML_URL}")
+    logger.info("Downloading MeSH data from %s", MESH_XML_URL)
 
     # Determine if URL is for gzipped file
     is_gzipped = MESH_XML_URL.endswith('.gz')
@@ -59,48 +67,62 @@ def download_mesh_xml(output_path: str, force: bool = False) -> str:
     else:
         logger.info("Downloading XML file (~40 MB)...")
 
+    # Create parent directory if needed
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = output_file.with_suffix('.tmp')
+
     try:
-        response = requests.get(MESH_XML_URL, stream=True, timeout=60)
+        response = _HTTP.get(MESH_XML_URL, stream=True, timeout=60)
         response.raise_for_status()
 
         # Get file size for progress bar
         total_size = int(response.headers.get('content-length', 0))
 
-        # Create parent directory if needed
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-
-        # Download to temporary file
-        temp_file = output_file.with_suffix('.tmp')
+        # Digest of the XML, computed while streaming so it needs no second pass
+        digest = hashlib.blake2b()
+        bytes_written = 0
 
         # Download with progress bar
         with open(temp_file, 'wb') as f:
             with tqdm(total=total_size, unit='B', unit_scale=True, desc="Downloading") as pbar:
-                for chunk in response.iter_content(chunk_size=8192):
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
                     if chunk:
                         f.write(chunk)
+                        if not is_gzipped:
+                            digest.update(chunk)
+                        bytes_written += len(chunk)
                         pbar.update(len(chunk))
 
-        logger.info(f"Downloaded {temp_file.stat().st_size / 1024 / 1024:.1f} MB")
+        # Content-Length counts encoded bytes, so only compare unencoded bodies
+        encoded = 'content-encoding' in response.headers
+        if total_size and not encoded and bytes_written != total_size:
+            raise IOError(f"Incomplete download: got {bytes_written} of {total_size} bytes")
+
+        logger.info("Downloaded %.1f MB", bytes_written / 1024 / 1024)
 
         # Decompress if gzipped
         if is_gzipped:
             logger.info("Decompressing gzip file...")
             with gzip.open(temp_file, 'rb') as f_in:
                 with open(output_file, 'wb') as f_out:
-                    f_out.write(f_in.read())
+                    for chunk in iter(lambda: f_in.read(DOWNLOAD_CHUNK_SIZE), b''):
+                        f_out.write(chunk)
+                        digest.update(chunk)
             temp_file.unlink()  # Remove temp gzipped file
-            logger.info(f"Decompressed to {output_file}")
+            logger.info("Decompressed to %s", output_file)
         else:
-            # Just rename
-            temp_file.rename(output_file)
+            temp_file.replace(output_file)
 
-        logger.info(f"File size: {output_file.stat().st_size / 1024 / 1024:.1f} MB")
+        _digest_path(output_file).write_text(digest.hexdigest())
+
+        logger.info("File size: %.1f MB", output_file.stat().st_size / 1024 / 1024)
         return str(output_file)
 
     except Exception as e:
-        logger.error(f"Failed to download MeSH XML: {e}")
-        if output_file.exists():
-            output_file.unlink()
+        logger.error("Failed to download MeSH XML: %s", e)
+        for path in (temp_file, output_file, _digest_path(output_file)):
+            if path.exists():
+                path.unlink()
         raise
 
 
@@ -114,19 +136,12 @@ def parse_mesh_xml(xml_path: str) -> list[dict]:
     Returns:
         List of MeSH term dictionaries
     """
-    logger.info(f"Parsing MeSH XML: {xml_path}")
-
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
+    logger.info("Parsing MeSH XML: %s", xml_path)
 
     descriptors = []
 
-    # Find all DescriptorRecord elements
-    descriptor_records = root.findall('.//DescriptorRecord')
-
-    logger.info(f"Found {len(descriptor_records)} MeSH descriptors")
-
-    for record in tqdm(descriptor_records, desc="Parsing descriptors"):
+    # Records are streamed and freed one at a time rather than parsed into one tree
+    for record in tqdm(iter_descriptor_records(xml_path), desc="Parsing descriptors"):
         try:
             # Extract DescriptorUI (MeSH ID)
             descriptor_ui_elem = record.find('.//DescriptorUI')
@@ -144,6 +159,7 @@ def parse_mesh_xml(xml_path: str) -> list[dict]:
 
             # Extract entry terms (synonyms)
             entry_terms = []
+            seen_terms = set()  # O(1) membership; entry_terms keeps document order
 
             # Look in all Concept/TermList/Term elements
             for concept in record.findall('.//Concept'):
@@ -152,7 +168,8 @@ def parse_mesh_xml(xml_path: str) -> list[dict]:
                     if term_string is not None and term_string.text:
                         term_text = term_string.text.strip()
                         # Don't duplicate the preferred name
-                        if term_text != preferred_name and term_text not in entry_terms:
+                        if term_text != preferred_name and term_text not in seen_terms:
+                            seen_terms.add(term_text)
                             entry_terms.append(term_text)
 
             # Extract tree numbers (hierarchy)
@@ -170,14 +187,113 @@ def parse_mesh_xml(xml_path: str) -> list[dict]:
             })
 
         except Exception as e:
-            logger.warning(f"Error parsing descriptor: {e}")
+            logger.warning("Error parsing descriptor: %s", e)
             continue
 
-    logger.info(f"Successfully parsed {len(descriptors)} MeSH descriptors")
+    logger.info("Successfully parsed %s MeSH descriptors", len(descriptors))
+    return descriptors
+
+
+def _digest_path(xml_file: Path) -> Path:
+    """Get the path of the blake2b digest recorded next to a downloaded XML file."""
+    return xml_file.with_name(xml_file.name + '.blake2b')
+
+
+def _mesh_cache_path(xml_path: str) -> Path:
+    """
+    Get the parse-cache path for a MeSH XML file, keyed by its content hash.
+
+    Args:
+        xml_path: Path to MeSH XML file
+
+    Returns:
+        Path of the pickled descriptors next to the XML file
+    """
+    xml_file = Path(xml_path)
+    digest_file = _digest_path(xml_file)
+
+    # Reuse the digest recorded at download time unless the XML changed since
+    if digest_file.exists() and digest_file.stat().st_mtime >= xml_file.stat().st_mtime:
+        hexdigest = digest_file.read_text().strip()
+    else:
+        digest = hashlib.blake2b()
+        with open(xml_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        hexdigest = digest.hexdigest()
+
+    return xml_file.parent / f"descriptors-{hexdigest[:16]}.pkl"
+
+
+def parse_mesh_xml_cached(xml_path: str, use_cache: bool = True) -> list[dict]:
+    """
+    Parse MeSH XML file, reusing a previous parse of the same file if available.
+
+    Args:
+        xml_path: Path to MeSH XML file
+        use_cache: Read and write the pickled parse cache
+
+    Returns:
+        List of MeSH term dictionaries
+    """
+    if not use_cache:
+        return parse_mesh_xml(xml_path)
+
+    cache_path = _mesh_cache_path(xml_path)
+
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'rb') as f:
+                descriptors = pickle.load(f)
+            logger.info("Loaded %s parsed MeSH descriptors from cache %s", len(descriptors), cache_path)
+            return descriptors
+        except Exception as e:
+            logger.warning("Ignoring unreadable MeSH parse cache %s: %s", cache_path, e)
+
+    descriptors = parse_mesh_xml(xml_path)
+
+    try:
+        temp_file = cache_path.with_suffix('.tmp')
+        with open(temp_file, 'wb') as f:
+            pickle.dump(descriptors, f, protocol=pickle.HIGHEST_PROTOCOL)
+        temp_file.replace(cache_path)
+        logger.info("Cached parsed MeSH descriptors to %s", cache_path)
+    except OSError as e:
+        logger.warning("Could not write MeSH parse cache: %s", e)
+
     return descriptors
 
 
-def load_mesh_to_db(descriptors: list[dict], batch_size: int = 100, skip_existing: bool = True):
+def _drop_mesh_indexes(engine) -> None:
+    """Drop secondary indexes on mesh_term so bulk inserts skip index maintenance."""
+    for index in MeshTerm.__table__.indexes:
+        index.drop(bind=engine, checkfirst=True)
+    logger.info("Dropped %s mesh_term indexes for bulk load", len(MeshTerm.__table__.indexes))
+
+
+def _create_mesh_indexes(engine) -> None:
+    """Recreate secondary indexes on mesh_term in a single build pass each."""
+    for index in MeshTerm.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    logger.info("Rebuilt %s mesh_term indexes", len(MeshTerm.__table__.indexes))
+
+
+def _write_mesh_terms(db, descriptors: list[dict], skip_existing: bool) -> None:
+    """Add MeSH term rows to the session's current transaction; the caller commits."""
+    if skip_existing:
+        # Only new rows remain, so COPY them in without the unit of work
+        insert_mesh_terms(db, descriptors)
+    else:
+        for descriptor in descriptors:
+            db.merge(MeshTerm(**descriptor))  # Use merge for upsert behavior
+
+
+def load_mesh_to_db(
+    descriptors: list[dict],
+    batch_size: int = 100,
+    skip_existing: bool = True,
+    drop_indexes: bool = True,
+):
     """
     Load MeSH descriptors into database.
 
@@ -185,21 +301,27 @@ def load_mesh_to_db(descriptors: list[dict], batch_size: int = 100, skip_existin
         descriptors: List of MeSH term dictionaries
         batch_size: Number of records to commit at once
         skip_existing: Skip terms that already exist
+        drop_indexes: Drop secondary indexes during the load and rebuild them after
     """
-    db = next(get_db())
+    # Bulk script never re-reads loaded objects, so skip expiring them on commit
+    db = SessionLocal(expire_on_commit=False)
 
-    logger.info(f"Loading {len(descriptors)} MeSH terms into database")
+    logger.info("Loading %s MeSH terms into database", len(descriptors))
 
     if skip_existing:
         # Get existing MeSH IDs
         existing_ids = set(row[0] for row in db.query(MeshTerm.mesh_id).all())
-        logger.info(f"Found {len(existing_ids)} existing MeSH terms")
+        logger.info("Found %s existing MeSH terms", len(existing_ids))
 
         # Filter out existing
         original_count = len(descriptors)
         descriptors = [d for d in descriptors if d['mesh_id'] not in existing_ids]
-        logger.info(f"Skipping {original_count - len(descriptors)} existing terms")
-        logger.info(f"Will insert {len(descriptors)} new terms")
+        logger.info("Skipping %s existing terms", original_count - len(descriptors))
+        logger.info("Will insert %s new terms", len(descriptors))
+
+        # End the read transaction: its lock on mesh_term would block DROP INDEX,
+        # which runs on another pooled connection
+        db.commit()
 
     if not descriptors:
         logger.info("No new terms to insert")
@@ -208,44 +330,61 @@ def load_mesh_to_db(descriptors: list[dict], batch_size: int = 100, skip_existin
 
     inserted = 0
     errors = 0
+    engine = db.get_bind()
 
+    if drop_indexes:
+        _drop_mesh_indexes(engine)
+
+    load_failed = False
     try:
-        for i, descriptor in enumerate(tqdm(descriptors, desc="Loading to database")):
-            try:
-                mesh_term = MeshTerm(
-                    mesh_id=descriptor['mesh_id'],
-                    descriptor_ui=descriptor['descriptor_ui'],
-                    preferred_name=descriptor['preferred_name'],
-                    entry_terms=descriptor['entry_terms'],
-                    tree_numbers=descriptor['tree_numbers'],
-                )
-
-                db.merge(mesh_term)  # Use merge for upsert behavior
-                inserted += 1
-
-                # Commit in batches
-                if (i + 1) % batch_size == 0:
+        with db.no_autoflush, tqdm(total=len(descriptors), desc="Loading to database") as pbar:
+            for start in range(0, len(descriptors), batch_size):
+                chunk = descriptors[start:start + batch_size]
+                try:
+                    _write_mesh_terms(db, chunk, skip_existing)
                     db.commit()
-                    logger.debug(f"Committed batch {(i + 1) // batch_size}")
-
-            except Exception as e:
-                logger.error(f"Error inserting {descriptor['mesh_id']}: {e}")
-                errors += 1
-                db.rollback()
-
-        # Final commit
-        db.commit()
+                    inserted += len(chunk)
+                    logger.debug("Committed batch %s", start // batch_size + 1)
+
+                except Exception as e:
+                    db.rollback()
+                    logger.warning(
+                        "Batch starting at %s failed (%s); retrying row by row",
+                        chunk[0]['mesh_id'], e,
+                    )
+                    # Retry each row on its own so one bad row doesn't discard the batch
+                    for descriptor in chunk:
+                        try:
+                            _write_mesh_terms(db, [descriptor], skip_existing)
+                            db.commit()
+                            inserted += 1
+                        except Exception as row_error:
+                            logger.error("Error inserting %s: %s", descriptor['mesh_id'], row_error)
+                            errors += 1
+                            db.rollback()
+
+                pbar.update(len(chunk))
 
     except Exception as e:
-        logger.error(f"Database error: {e}")
+        load_failed = True
+        logger.error("Database error: %s", e)
         db.rollback()
         raise
     finally:
         db.close()
+        # Always restore indexes, even if the load failed part-way
+        if drop_indexes:
+            try:
+                _create_mesh_indexes(engine)
+            except Exception as e:
+                logger.error("Failed to rebuild mesh_term indexes: %s", e)
+                # Don't mask the load error with the rebuild error
+                if not load_failed:
+                    raise
 
-    logger.info(f"Loaded {inserted} MeSH terms successfully")
+    logger.info("Loaded %s MeSH terms successfully", inserted)
     if errors > 0:
-        logger.warning(f"Encountered {errors} errors")
+        logger.warning("Encountered %s errors", errors)
 
 
 def show_statistics():
@@ -313,6 +452,16 @@ def main():
         default=100,
         help="Database commit batch size (default: 100)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse the XML file instead of using the cached parse result",
+    )
+    parser.add_argument(
+        "--keep-indexes",
+        action="store_true",
+        help="Keep mesh_term indexes in place during the load instead of rebuilding them",
+    )
 
     args = parser.parse_args()
 
@@ -323,22 +472,24 @@ def main():
         else:
             xml_path = args.xml_file
             if not Path(xml_path).exists():
-                logger.error(f"XML file not found: {xml_path}")
+                logger.error("XML file not found: %s", xml_path)
                 logger.error("Remove --skip-download to download the file")
                 return 1
 
         # Step 2: Parse MeSH XML
-        descriptors = parse_mesh_xml(xml_path)
+        descriptors = parse_mesh_xml_cached(xml_path, use_cache=not args.no_cache)
 
         # Step 3: Load into database
         load_mesh_to_db(
             descriptors,
             batch_size=args.batch_size,
-            skip_existing=args.skip_existing
+            skip_existing=args.skip_existing,
+            drop_indexes=not args.keep_indexes,
         )
 
-        # Step 4: Show statistics
-        show_statistics()
+        # Step 4: Show statistics (interactive runs only; skipped in CI/piped output)
+        if sys.stdout.isatty():
+            show_statistics()
 
         logger.info("✓ MeSH database loaded successfully!")
         return 0
@@ -347,7 +498,7 @@ def main():
         logger.warning("Interrupted by user")
         return 1
     except Exception as e:
-        logger.error(f"Failed to load MeSH database: {e}", exc_info=True)
+        logger.error("Failed to load MeSH database: %s", e, exc_info=True)
         return 1
 
 
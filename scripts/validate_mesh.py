@@ -10,11 +10,13 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
 from db import get_db
 from db.models import GSESeries, GSEMesh, MeshTerm
 from mesh.matcher import MeSHMatcher
 from mesh.query_expand import QueryExpander
-from search.hybrid_search import HybridSearchEngine
+from search.hybrid_search import HybridSearchEngine, clear_search_cache
 
 
 def associate_mesh_terms():
@@ -26,7 +28,7 @@ def associate_mesh_terms():
     print("=" * 80)
 
     # Get all GSE records
-    gse_records = db.query(GSESeries).all()
+    gse_records = db.query(GSESeries.accession, GSESeries.title).all()
     print(f"Found {len(gse_records)} GSE records")
 
     if not gse_records:
@@ -37,36 +39,55 @@ def associate_mesh_terms():
     # Initialize matcher
     matcher = MeSHMatcher(db)
 
-    total_associations = 0
-    for gse in gse_records:
-        print(f"\nMatching {gse.accession}: {gse.title[:60]}...")
+    # Match every record in one batch so term names can be fetched in one query
+    batch_matches = matcher.match_gse_batch(
+        [gse.accession for gse in gse_records], confidence_threshold=0.3
+    )
+    gse_matches = [(gse, batch_matches.get(gse.accession, [])) for gse in gse_records]
 
-        # Match MeSH terms
-        matches = matcher.match_gse(gse.accession, confidence_threshold=0.3)
+    shown_ids = {match['mesh_id'] for _, matches in gse_matches for match in matches[:3]}
+    term_names = dict(
+        db.query(MeshTerm.mesh_id, MeshTerm.preferred_name)
+        .filter(MeshTerm.mesh_id.in_(shown_ids))
+        .all()
+    ) if shown_ids else {}
+
+    rows = []
+    for gse, matches in gse_matches:
+        print(f"\nMatching {gse.accession}: {gse.title[:60]}...")
 
         if matches:
             print(f"  Found {len(matches)} MeSH term matches")
             for match in matches[:3]:  # Show first 3
-                # Look up term name
-                mesh_term = db.query(MeshTerm).filter(MeshTerm.mesh_id == match['mesh_id']).first()
-                term_name = mesh_term.preferred_name if mesh_term else match['mesh_id']
+                term_name = term_names.get(match['mesh_id'], match['mesh_id'])
                 print(f"    - {match['mesh_id']}: {term_name} (confidence: {match['confidence']:.2f})")
 
-            # Store associations
-            for match in matches:
-                assoc = GSEMesh(
-                    accession=gse.accession,
-                    mesh_id=match['mesh_id'],
-                    source='auto',
-                    confidence=match['confidence']
-                )
-                db.merge(assoc)
-            total_associations += len(matches)
+            rows.extend(
+                {
+                    'accession': gse.accession,
+                    'mesh_id': match['mesh_id'],
+                    'source': 'auto',
+                    'confidence': match['confidence'],
+                }
+                for match in matches
+            )
         else:
             print(f"  No MeSH matches found")
 
+    # Store all associations with bulk upserts instead of one merge per row
+    batch_size = 5000  # Stay well under PostgreSQL's bind-parameter limit
+    for start in range(0, len(rows), batch_size):
+        stmt = pg_insert(GSEMesh).values(rows[start:start + batch_size])
+        stmt = stmt.on_conflict_do_update(
+            constraint='uq_gse_mesh_source',
+            set_={'confidence': stmt.excluded.confidence},
+        )
+        db.execute(stmt)
+    total_associations = len(rows)
+
     db.commit()
     db.close()
+    clear_search_cache()
 
     print(f"\n✓ Created {total_associations} GSE-MeSH associations")
     return True
@@ -1,4 +1,4 @@
 """Search package."""
-from search.hybrid_search import HybridSearchEngine, search_geo
+from search.hybrid_search import HybridSearchEngine, clear_search_cache, search_geo
 
-__all__ = ["HybridSearchEngine", "search_geo"]
+__all__ = ["HybridSearchEngine", "clear_search_cache", "search_geo"]
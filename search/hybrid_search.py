@@ -2,18 +2,28 @@
 Hybrid search combining semantic, lexical, and MeSH-based search.
 Implements Reciprocal Rank Fusion (RRF) for result merging.
 """
+import copy
+import json
 import logging
 import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Any
 
-from sqlalchemy import String, and_, func, or_
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import array
 from sqlalchemy.orm import Session
 
 from config import settings
 from db import GSEMesh, GSESeries, MeshTerm, get_db
 from mesh.query_expand import QueryExpander
-from vector.search import semantic_search
+from search.fusion_numba import rrf_fuse
+from vector.search import clear_semantic_cache, compose_query_vector, semantic_search
 
 logger = logging.getLogger(__name__)
 
@@ -23,15 +33,16 @@ class HybridSearchEngine:
     Hybrid search engine combining multiple search strategies.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, query_expander: QueryExpander | None = None):
         """
         Initialize hybrid search engine.
 
         Args:
             db: Database session
+            query_expander: Optional pre-built query expander to reuse
         """
         self.db = db
-        self.query_expander = QueryExpander(db)
+        self.query_expander = query_expander or QueryExpander(db)
 
     def search(
         self,
@@ -79,51 +90,66 @@ class HybridSearchEngine:
         # Step 1: MeSH expansion
         expansion_result = None
         expanded_query = query
+        matched_terms = []
         matched_mesh_ids = []
 
         if use_mesh:
             expansion_result = self.query_expander.expand_query(query)
             expanded_query = expansion_result["expanded_query"]
-            matched_mesh_ids = [term["mesh_id"] for term in expansion_result["matched_terms"]]
+            matched_terms = expansion_result["matched_terms"]
+            matched_mesh_ids = [term["mesh_id"] for term in matched_terms]
             logger.info(f"MeSH expansion: {len(matched_mesh_ids)} terms matched")
 
-        # Step 2: Semantic search
+        # Steps 2 & 3: Semantic search runs in a worker thread while lexical
+        # search uses the calling thread, so the session is never shared
         semantic_results = []
-        if use_semantic:
-            try:
-                semantic_results = semantic_search(
-                    query=expanded_query,
-                    top_k=settings.semantic_top_k,
-                )
-                logger.info(f"Semantic search: {len(semantic_results)} results")
-            except Exception as e:
-                logger.error(f"Semantic search failed: {e}", exc_info=True)
-                # Continue without semantic results
-
-        # Step 3: Lexical search
+        semantic_failed = False
         lexical_results = []
-        if use_lexical:
-            lexical_results = self._lexical_search(
-                query=query,
-                filters=filters,
-                top_k=settings.lexical_top_k,
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            semantic_future = (
+                executor.submit(self._semantic_search, query, matched_terms) if use_semantic else None
             )
-            logger.info(f"Lexical search: {len(lexical_results)} results")
 
-        # Step 4: Combine results using RRF
-        combined_results = self._reciprocal_rank_fusion(
-            semantic_results=semantic_results,
-            lexical_results=lexical_results,
-            matched_mesh_ids=matched_mesh_ids,
-        )
+            if use_lexical:
+                lexical_results = self._lexical_search(
+                    query=query,
+                    filters=filters,
+                    top_k=settings.lexical_top_k,
+                )
+                logger.info(f"Lexical search: {len(lexical_results)} results")
+
+            if semantic_future is not None:
+                semantic_results = semantic_future.result()
+                if semantic_results is None:
+                    semantic_failed = True
+                    semantic_results = []
+
+        # Nothing to fuse or fetch when neither search found anything
+        final_results = []
+        if semantic_results or lexical_results:
+            # Step 4: Load matched MeSH terms once; used for both boosting and display
+            candidate_accessions = list(dict.fromkeys(
+                result["accession"] for result in (*semantic_results, *lexical_results)
+            ))
+            mesh_by_accession = self._load_matched_mesh_terms(
+                accessions=candidate_accessions,
+                matched_mesh_ids=matched_mesh_ids,
+            )
 
-        # Step 5: Apply filters and fetch full metadata
-        final_results = self._fetch_and_filter_results(
-            ranked_accessions=combined_results[:top_k * 2],  # Fetch more for filtering
-            filters=filters,
-            matched_mesh_ids=matched_mesh_ids,
-            top_k=top_k,
-        )
+            # Step 5: Combine results using RRF
+            combined_results = self._reciprocal_rank_fusion(
+                semantic_results=semantic_results,
+                lexical_results=lexical_results,
+                mesh_by_accession=mesh_by_accession,
+            )
+
+            # Step 6: Apply filters and fetch full metadata
+            final_results = self._fetch_and_filter_results(
+                ranked_accessions=combined_results[:top_k * 2],  # Fetch more for filtering
+                filters=filters,
+                mesh_by_accession=mesh_by_accession,
+                top_k=top_k,
+            )
 
         # Prepare metadata
         metadata = {
@@ -131,6 +157,7 @@ class HybridSearchEngine:
             "expanded_query": expanded_query if use_mesh else query,
             "mesh_terms": expansion_result["matched_terms"] if expansion_result else [],
             "semantic_count": len(semantic_results),
+            "semantic_failed": semantic_failed,
             "lexical_count": len(lexical_results),
             "total_results": len(final_results),
             "filters_applied": filters,
@@ -143,6 +170,38 @@ class HybridSearchEngine:
             "metadata": metadata,
         }
 
+    def _semantic_search(
+        self,
+        query: str,
+        mesh_terms: list[dict[str, Any]],
+    ) -> list[dict[str, Any]] | None:
+        """
+        Run semantic search, returning None on failure.
+
+        The query vector blends the query embedding with cached embeddings of
+        the matched MeSH terms instead of embedding the expanded query text.
+
+        Args:
+            query: Original search query
+            mesh_terms: MeSH terms matched by query expansion
+
+        Returns:
+            List of semantic search results, or None if the search failed
+        """
+        try:
+            query_vector = compose_query_vector(query, mesh_terms) if mesh_terms else None
+            results = semantic_search(
+                query=query,
+                top_k=settings.semantic_top_k,
+                query_vector=query_vector,
+            )
+            logger.info(f"Semantic search: {len(results)} results")
+            return results
+        except Exception as e:
+            logger.error(f"Semantic search failed: {e}", exc_info=True)
+            # Continue without semantic results
+            return None
+
     def _lexical_search(
         self,
         query: str,
@@ -160,51 +219,34 @@ class HybridSearchEngine:
         Returns:
             List of results with accession and relevance score
         """
-        # Build search conditions
-        search_terms = query.lower().split()
-
-        conditions = []
-        for term in search_terms:
-            if len(term) < 3:
-                continue
-
-            term_pattern = f"%{term}%"
-            conditions.append(
-                or_(
-                    func.lower(GSESeries.title).like(term_pattern),
-                    func.lower(GSESeries.summary).like(term_pattern),
-                    func.lower(GSESeries.overall_design).like(term_pattern),
-                )
-            )
-
-        if not conditions:
+        search_terms = [term for term in query.lower().split() if len(term) >= 3]
+        if not search_terms:
             return []
 
-        # Combine with OR (match any term)
-        combined_condition = or_(*conditions)
+        # OR the per-term queries together (tsquery || tsquery) to match any term
+        ts_query = func.plainto_tsquery("english", search_terms[0])
+        for term in search_terms[1:]:
+            ts_query = ts_query.op("||")(func.plainto_tsquery("english", term))
+
+        rank = func.ts_rank_cd(GSESeries.search_tsv, ts_query)
 
-        # Apply filters
-        filter_conditions = self._build_filter_conditions(filters)
-        if filter_conditions:
-            combined_condition = and_(combined_condition, *filter_conditions)
+        # Full-text match uses the GIN index on search_tsv
+        conditions = [GSESeries.search_tsv.op("@@")(ts_query)]
+        conditions.extend(self._build_filter_conditions(filters))
 
         # Execute query
         results = (
-            self.db.query(GSESeries.accession)
-            .filter(combined_condition)
+            self.db.query(GSESeries.accession, rank)
+            .filter(*conditions)
+            .order_by(rank.desc())
             .limit(top_k)
             .all()
         )
 
-        # Format results (simple scoring based on order)
-        formatted = []
-        for idx, (accession,) in enumerate(results):
-            formatted.append({
-                "accession": accession,
-                "score": 1.0 / (idx + 1),  # Simple relevance score
-            })
-
-        return formatted
+        return [
+            {"accession": accession, "score": float(score)}
+            for accession, score in results
+        ]
 
     def _build_filter_conditions(self, filters: dict[str, Any]) -> list[Any]:
         """
@@ -220,14 +262,8 @@ class HybridSearchEngine:
 
         # Organism filter
         if organisms := filters.get("organisms"):
-            # Match any of the specified organisms
-            organism_conditions = []
-            for org in organisms:
-                organism_conditions.append(
-                    func.cast(GSESeries.organisms, String).like(f"%{org}%")
-                )
-            if organism_conditions:
-                conditions.append(or_(*organism_conditions))
+            # Match any of the specified organisms (JSONB ?| can use the GIN index)
+            conditions.append(GSESeries.organisms.op("?|")(array(list(organisms))))
 
         # Technology type filter
         if tech_type := filters.get("tech_type"):
@@ -253,7 +289,7 @@ class HybridSearchEngine:
         self,
         semantic_results: list[dict[str, Any]],
         lexical_results: list[dict[str, Any]],
-        matched_mesh_ids: list[str],
+        mesh_by_accession: dict[str, list[dict[str, Any]]] | None = None,
         k: int | None = None,
     ) -> list[str]:
         """
@@ -264,89 +300,101 @@ class HybridSearchEngine:
         Args:
             semantic_results: Results from semantic search
             lexical_results: Results from lexical search
-            matched_mesh_ids: MeSH IDs matched in query expansion
+            mesh_by_accession: Matched MeSH terms per accession (for boosting)
             k: RRF constant (default: from settings)
 
         Returns:
             List of accessions ranked by RRF score
         """
+        if not semantic_results and not lexical_results:
+            return []
+
         if k is None:
             k = settings.rrf_k
 
-        scores: dict[str, float] = {}
+        # Assign each accession an integer slot in first-seen order
+        slots: dict[str, int] = {}
 
-        # Add semantic results
-        for rank, result in enumerate(semantic_results, start=1):
-            accession = result["accession"]
-            rrf_score = 1.0 / (k + rank)
-            scores[accession] = scores.get(accession, 0.0) + rrf_score
+        def to_slots(results: list[dict[str, Any]]) -> np.ndarray:
+            return np.fromiter(
+                (slots.setdefault(r["accession"], len(slots)) for r in results),
+                dtype=np.intp,
+                count=len(results),
+            )
 
-        # Add lexical results
-        for rank, result in enumerate(lexical_results, start=1):
-            accession = result["accession"]
-            rrf_score = 1.0 / (k + rank)
-            scores[accession] = scores.get(accession, 0.0) + rrf_score
+        semantic_slots = to_slots(semantic_results)
+        lexical_slots = to_slots(lexical_results)
+        accessions = list(slots)
+
+        # Add semantic and lexical results: 1 / (k + rank) with 1-based ranks
+        scores = rrf_fuse(semantic_slots, lexical_slots, len(accessions), k)
 
         # Boost scores for datasets with matching MeSH terms
-        if matched_mesh_ids:
-            mesh_boost = self._get_mesh_boost_scores(list(scores.keys()), matched_mesh_ids)
-            for accession, boost in mesh_boost.items():
-                scores[accession] = scores.get(accession, 0.0) + boost
+        # (0.1 per matching MeSH term, max 0.5)
+        for accession, mesh_terms in (mesh_by_accession or {}).items():
+            if accession in slots:
+                scores[slots[accession]] += min(0.5, len(mesh_terms) * 0.1)
 
-        # Sort by score
-        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        return [accession for accession, score in ranked]
+        # Sort by score (stable, so ties keep first-seen order)
+        order = np.argsort(-scores, kind="stable")
+        return [accessions[i] for i in order]
 
-    def _get_mesh_boost_scores(
+    def _load_matched_mesh_terms(
         self,
         accessions: list[str],
         matched_mesh_ids: list[str],
-    ) -> dict[str, float]:
+    ) -> dict[str, list[dict[str, Any]]]:
         """
-        Calculate MeSH-based boost scores for accessions.
+        Load query-matched MeSH associations for candidate accessions in one query.
 
         Args:
             accessions: List of GSE accessions
             matched_mesh_ids: MeSH IDs from query expansion
 
         Returns:
-            Dictionary of accession -> boost_score
+            Dictionary of accession -> list of matched MeSH term dicts
         """
+        mesh_by_accession: dict[str, list[dict[str, Any]]] = defaultdict(list)
         if not matched_mesh_ids or not accessions:
-            return {}
-
-        # Query GSEMesh associations
-        associations = (
-            self.db.query(GSEMesh.accession, func.count(GSEMesh.mesh_id))
+            return mesh_by_accession
+
+        mesh_rows = (
+            self.db.query(
+                GSEMesh.accession,
+                GSEMesh.mesh_id,
+                GSEMesh.confidence,
+                MeshTerm.preferred_name,
+            )
+            .join(MeshTerm, GSEMesh.mesh_id == MeshTerm.mesh_id)
             .filter(
                 GSEMesh.accession.in_(accessions),
                 GSEMesh.mesh_id.in_(matched_mesh_ids),
             )
-            .group_by(GSEMesh.accession)
             .all()
         )
+        for accession, mesh_id, confidence, preferred_name in mesh_rows:
+            mesh_by_accession[accession].append({
+                "mesh_id": mesh_id,
+                "preferred_name": preferred_name,
+                "confidence": confidence,
+            })
 
-        # Calculate boost (0.1 per matching MeSH term, max 0.5)
-        boost_scores = {}
-        for accession, count in associations:
-            boost_scores[accession] = min(0.5, count * 0.1)
-
-        return boost_scores
+        return mesh_by_accession
 
     def _fetch_and_filter_results(
         self,
         ranked_accessions: list[str],
         filters: dict[str, Any],
-        matched_mesh_ids: list[str],
+        mesh_by_accession: dict[str, list[dict[str, Any]]],
         top_k: int,
     ) -> list[dict[str, Any]]:
         """
-        Fetch full metadata for ranked results and apply filters.
+        Fetch full metadata for ranked results that pass the filters.
 
         Args:
             ranked_accessions: List of accessions in rank order
             filters: Structured filters
-            matched_mesh_ids: MeSH IDs for highlighting
+            mesh_by_accession: Matched MeSH terms per accession for highlighting
             top_k: Number of results to return
 
         Returns:
@@ -355,10 +403,13 @@ class HybridSearchEngine:
         if not ranked_accessions:
             return []
 
-        # Fetch GSE records
+        # Fetch GSE records that pass the filters
         gse_records = (
             self.db.query(GSESeries)
-            .filter(GSESeries.accession.in_(ranked_accessions))
+            .filter(
+                GSESeries.accession.in_(ranked_accessions),
+                *self._build_filter_conditions(filters),
+            )
             .all()
         )
 
@@ -373,30 +424,8 @@ class HybridSearchEngine:
 
             gse = gse_lookup[accession]
 
-            # Apply filters
-            if not self._passes_filters(gse, filters):
-                continue
-
             # Get matched MeSH terms for this dataset
-            matched_mesh = []
-            if matched_mesh_ids:
-                mesh_assocs = (
-                    self.db.query(GSEMesh, MeshTerm)
-                    .join(MeshTerm, GSEMesh.mesh_id == MeshTerm.mesh_id)
-                    .filter(
-                        GSEMesh.accession == accession,
-                        GSEMesh.mesh_id.in_(matched_mesh_ids),
-                    )
-                    .all()
-                )
-                matched_mesh = [
-                    {
-                        "mesh_id": assoc.mesh_id,
-                        "preferred_name": term.preferred_name,
-                        "confidence": assoc.confidence,
-                    }
-                    for assoc, term in mesh_assocs
-                ]
+            matched_mesh = mesh_by_accession.get(accession, [])
 
             # Format result
             result = {
@@ -412,48 +441,11 @@ class HybridSearchEngine:
 
         return results
 
-    def _passes_filters(self, gse: GSESeries, filters: dict[str, Any]) -> bool:
-        """
-        Check if a GSE record passes all filters.
-
-        Args:
-            gse: GSE series object
-            filters: Filter dictionary
-
-        Returns:
-            True if passes all filters
-        """
-        # Organism filter
-        if organisms := filters.get("organisms"):
-            if not gse.organisms:
-                return False
-            if not any(org in gse.organisms for org in organisms):
-                return False
-
-        # Tech type filter
-        if tech_type := filters.get("tech_type"):
-            if gse.tech_type != tech_type:
-                return False
-
-        # Date range filter
-        if date_range := filters.get("date_range"):
-            if not gse.submission_date:
-                return False
-
-            start_date = date_range.get("start")
-            end_date = date_range.get("end")
 
-            if start_date and gse.submission_date < start_date:
-                return False
-            if end_date and gse.submission_date > end_date:
-                return False
-
-        # Sample count filter
-        if min_samples := filters.get("min_samples"):
-            if not gse.sample_count or gse.sample_count < min_samples:
-                return False
-
-        return True
+_SEARCH_CACHE_SIZE = 512
+# (expiry on the monotonic clock, result) by cache key
+_search_cache: OrderedDict[tuple[str, str, int], tuple[float, dict[str, Any]]] = OrderedDict()
+_search_cache_lock = threading.Lock()
 
 
 def search_geo(
@@ -461,32 +453,75 @@ def search_geo(
     filters: dict[str, Any] | None = None,
     top_k: int = 50,
     db: Session | None = None,
+    engine: HybridSearchEngine | None = None,
 ) -> dict[str, Any]:
     """
     Convenience function for performing GEO search.
 
+    Results are cached per (normalized query, filters, top_k) in a process-wide
+    LRU for settings.search_cache_ttl seconds. Ingestion and MeSH tagging call
+    clear_search_cache() so their changes show up at once. Results of a search
+    whose semantic half failed are not cached, so the next call retries.
+
     Args:
         query: Search query
         filters: Optional filters
         top_k: Number of results
         db: Optional database session
+        engine: Optional pre-built search engine to reuse across calls
 
     Returns:
         Search results dictionary
     """
-    if db is None:
-        db_gen = get_db()
-        db = next(db_gen)
-        close_db = True
+    # Normalize only the cache key; the engine gets the query as typed
+    normalized_query = " ".join(query.lower().split())
+    cache_key = (normalized_query, json.dumps(filters or {}, sort_keys=True, default=str), top_k)
+
+    with _search_cache_lock:
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            expires_at, cached_result = cached
+            if time.monotonic() < expires_at:
+                _search_cache.move_to_end(cache_key)
+                return copy.deepcopy(cached_result)
+            del _search_cache[cache_key]
+
+    if engine is not None:
+        result = engine.search(query=query, filters=filters, top_k=top_k)
     else:
-        close_db = False
+        if db is None:
+            db_gen = get_db()
+            db = next(db_gen)
+            close_db = True
+        else:
+            close_db = False
+
+        try:
+            engine = HybridSearchEngine(db)
+            result = engine.search(query=query, filters=filters, top_k=top_k)
+        finally:
+            if close_db:
+                db.close()
+
+    if result["metadata"].get("semantic_failed"):
+        return result
+
+    with _search_cache_lock:
+        _search_cache[cache_key] = (
+            time.monotonic() + settings.search_cache_ttl,
+            copy.deepcopy(result),
+        )
+        if len(_search_cache) > _SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+
+    return result
+
 
-    try:
-        engine = HybridSearchEngine(db)
-        return engine.search(query=query, filters=filters, top_k=top_k)
-    finally:
-        if close_db:
-            db.close()
+def clear_search_cache() -> None:
+    """Drop all cached search_geo and semantic_search results."""
+    with _search_cache_lock:
+        _search_cache.clear()
+    clear_semantic_cache()
 
 
 def make_snippet(text: str, query_terms: list[str], max_length: int = 200) -> str:
@@ -504,19 +539,15 @@ def make_snippet(text: str, query_terms: list[str], max_length: int = 200) -> st
     if not text or not query_terms:
         return text[:max_length] + "..." if len(text) > max_length else text
 
-    text_lower = text.lower()
+    # Find first match with one scan over the text
+    match = _query_terms_pattern(tuple(sorted(set(query_terms)))).search(text)
 
-    # Find first match
-    first_match_pos = len(text)
-    for term in query_terms:
-        pos = text_lower.find(term.lower())
-        if pos != -1 and pos < first_match_pos:
-            first_match_pos = pos
-
-    if first_match_pos == len(text):
+    if match is None:
         # No matches, return beginning
         return text[:max_length] + "..." if len(text) > max_length else text
 
+    first_match_pos = match.start()
+
     # Extract context around match
     start = max(0, first_match_pos - 50)
     end = min(len(text), first_match_pos + max_length)
@@ -530,3 +561,9 @@ def make_snippet(text: str, query_terms: list[str], max_length: int = 200) -> st
         snippet = snippet + "..."
 
     return snippet
+
+
+@lru_cache(maxsize=256)
+def _query_terms_pattern(query_terms: tuple[str, ...]) -> re.Pattern:
+    """Compile a case-insensitive alternation matching any of the query terms."""
+    return re.compile("|".join(re.escape(term) for term in query_terms), re.IGNORECASE)
@@ -3,17 +3,49 @@ Streamlit UI components for data ingestion.
 Provides interface to run GEO data ingestion from the Streamlit app.
 """
 import logging
-from datetime import datetime
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler
 from typing import Any
 
+import pandas as pd
 import streamlit as st
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
 
-from db import IngestRun, get_db
-from geo_ingest.ingest_pipeline import IngestionPipeline
+from config import settings
+from db import GSESeries, IngestRun, engine
+from geo_ingest.ingest_pipeline import IngestionPipeline, ProgressCallback
 
 logger = logging.getLogger(__name__)
 
+HISTORY_PAGE_SIZE = 20
+
+# Resubmitting an identical ingestion within this many seconds reuses its result
+RECENT_INGEST_TTL = 300
+
+INGESTION_TABS = {
+    "query": "🔍 Query Search",
+    "history": "📋 Ingestion History",
+    "config": "⚙️ Configuration",
+}
+
+
+@st.cache_resource
+def get_cached_engine() -> Engine:
+    """Get the database engine, shared across reruns and user sessions."""
+    return engine
+
+
+@st.cache_resource
+def get_session_factory() -> sessionmaker:
+    """Get a session factory bound to the cached engine."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_cached_engine())
+
 
 def show_ingestion_interface() -> None:
     """Display data ingestion interface in Streamlit."""
@@ -22,15 +54,24 @@ def show_ingestion_interface() -> None:
         "Ingest GEO datasets directly from NCBI into your local database."
     )
 
+    # One session serves the connectivity check and every tab on this run
+    with get_session_factory()() as db:
+        show_ingestion_tabs(db)
+
+
+def show_ingestion_tabs(db: Session) -> None:
+    """
+    Display the ingestion tabs using a single database session.
+
+    Args:
+        db: Database session shared by all tabs for this script run
+    """
     # Check database connectivity
-    try:
-        db = next(get_db())
-        db_available = True
-        db.close()
-    except Exception as e:
-        db_available = False
+    db_error = _db_error()
+    db_available = db_error is None
+    if not db_available:
         st.warning(
-            f"⚠️ **Database Connection Issue**: {str(e)}\n\n"
+            f"⚠️ **Database Connection Issue**: {db_error}\n\n"
             "This is normal on first launch. The system is initializing.\n\n"
             "**What's happening:**\n"
             "- PostgreSQL is starting up\n"
@@ -41,87 +82,147 @@ def show_ingestion_interface() -> None:
             "- Check that NCBI_EMAIL is set in your .env file"
         )
 
-    # Create tabs for different ingestion methods
-    tab1, tab2, tab3 = st.tabs(
-        ["🔍 Query Search", "📋 Ingestion History", "⚙️ Configuration"]
+    # Section selector; unlike st.tabs, only the selected section's code runs.
+    # The choice is mirrored in the URL so reloads keep the same section.
+    if "active_tab" not in st.session_state:
+        requested_tab = st.query_params.get("tab", "query")
+        st.session_state.active_tab = requested_tab if requested_tab in INGESTION_TABS else "query"
+
+    active_tab = st.radio(
+        "Section",
+        options=list(INGESTION_TABS),
+        format_func=INGESTION_TABS.get,
+        horizontal=True,
+        key="active_tab",
+        label_visibility="collapsed",
     )
+    st.query_params["tab"] = active_tab
 
-    with tab1:
-        show_query_ingestion()
+    if active_tab == "query":
+        show_query_ingestion(db)
 
-    with tab2:
+    elif active_tab == "history":
         if db_available:
-            show_ingestion_history()
+            show_ingestion_history(db)
         else:
             st.info("Ingestion history will be available once database is ready.")
 
-    with tab3:
-        show_ingestion_config()
+    else:
+        show_ingestion_config(db)
 
 
-def show_query_ingestion() -> None:
-    """Show interface for ingesting by search query."""
-    st.subheader("Search and Ingest")
+@st.cache_data(ttl=5)
+def _db_error() -> str | None:
+    """
+    Ping the database through the pool, at most once every few seconds.
 
-    # Query input
-    query = st.text_input(
-        "Search Query",
-        placeholder="e.g., 'breast cancer RNA-seq' or 'melanoma microarray'",
-        help="Enter your NCBI search query",
-    )
+    Returns:
+        None if the database is reachable, otherwise the error message
+    """
+    try:
+        with get_cached_engine().connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return None
+    except Exception as e:
+        return str(e)
 
-    # Advanced options
-    col1, col2 = st.columns(2)
 
-    with col1:
-        retmax = st.number_input(
-            "Number of Results",
-            min_value=1,
-            max_value=10000,
-            value=50,
-            step=10,
-            help="Maximum number of GEO records to fetch",
-        )
+def show_query_ingestion(db: Session) -> None:
+    """
+    Show interface for ingesting by search query.
 
-    with col2:
-        skip_existing = st.checkbox(
-            "Skip Existing Records",
-            value=True,
-            help="Don't re-ingest datasets already in database",
+    Args:
+        db: Database session used to check readiness before starting
+    """
+    st.subheader("Search and Ingest")
+
+    # Inputs live in a form so editing them doesn't rerun the script
+    with st.form("ingest_form"):
+        # Query input
+        query = st.text_input(
+            "Search Query",
+            placeholder="e.g., 'breast cancer RNA-seq' or 'melanoma microarray'",
+            help="Enter your NCBI search query",
         )
 
-    # Date range filter (optional)
-    st.markdown("**Date Range (Optional)**")
-    date_col1, date_col2 = st.columns(2)
+        # Advanced options
+        col1, col2 = st.columns(2)
 
-    with date_col1:
-        mindate = st.date_input(
-            "From Date",
-            value=None,
-            help="Leave empty to ignore",
-        )
+        with col1:
+            retmax = st.number_input(
+                "Number of Results",
+                min_value=1,
+                max_value=10000,
+                value=50,
+                step=10,
+                help="Maximum number of GEO records to fetch",
+            )
 
-    with date_col2:
-        maxdate = st.date_input(
-            "To Date",
-            value=None,
-            help="Leave empty to ignore",
+        with col2:
+            skip_existing = st.checkbox(
+                "Skip Existing Records",
+                value=True,
+                help="Don't re-ingest datasets already in database",
+            )
+
+        # Date range filter (optional)
+        st.markdown("**Date Range (Optional)**")
+        date_col1, date_col2 = st.columns(2)
+
+        with date_col1:
+            mindate = st.date_input(
+                "From Date",
+                value=None,
+                help="Leave empty to ignore",
+            )
+
+        with date_col2:
+            maxdate = st.date_input(
+                "To Date",
+                value=None,
+                help="Leave empty to ignore",
+            )
+
+        # Only one ingestion per browser session at a time
+        submitted = st.form_submit_button(
+            "🚀 Start Ingestion",
+            type="primary",
+            use_container_width=True,
+            disabled="ingest_job" in st.session_state,
         )
 
     # Format dates for NCBI API
     mindate_str = mindate.strftime("%Y/%m/%d") if mindate else None
     maxdate_str = maxdate.strftime("%Y/%m/%d") if maxdate else None
 
-    # Start ingestion button
-    if st.button("🚀 Start Ingestion", type="primary", use_container_width=True):
+    # Keep following an ingestion started before this rerun
+    if "ingest_job" in st.session_state:
+        _progress_view()
+        return
+
+    # Show the outcome of an ingestion that just finished
+    if stats := st.session_state.pop("ingest_result", None):
+        show_ingestion_result(stats)
+    if error := st.session_state.pop("ingest_error", None):
+        st.error(f"❌ Ingestion Failed: {error}")
+
+    # Start ingestion
+    if submitted:
         if not query:
             st.error("Please enter a search query")
             return
 
+        # A repeat of a search that just finished would only re-query NCBI
+        ingest_key = (query, retmax, mindate_str, maxdate_str, skip_existing)
+        recent = st.session_state.get("recent_ingests", {}).get(ingest_key)
+        if recent and time.monotonic() - recent[0] < RECENT_INGEST_TTL:
+            st.info("This ingestion just finished; showing its result instead of running it again.")
+            show_ingestion_result(recent[1])
+            return
+
         # Check database before starting
         try:
-            db_test = next(get_db())
-            db_test.close()
+            db.execute(text("SELECT 1"))
         except Exception as e:
             st.error(
                 f"Cannot start ingestion: Database not ready\n\n"
@@ -147,183 +248,389 @@ def ingest_with_progress(
     maxdate: str | None = None,
     skip_existing: bool = True,
 ) -> None:
-    """Run ingestion with progress display."""
-    # Create progress containers
-    progress_container = st.container()
-    status_container = st.container()
+    """Start ingestion on a background thread and display its progress."""
+    db = None
 
     try:
-        with progress_container:
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-
-            # Get database session
-            try:
-                db = next(get_db())
-            except Exception as db_err:
-                st.error(
-                    f"❌ Database Connection Failed\n\n"
-                    f"Error: {str(db_err)}\n\n"
-                    f"**The system is still initializing.** Please:\n"
-                    f"1. Wait 30-60 seconds\n"
-                    f"2. Refresh the page (press F5)\n"
-                    f"3. Try again"
-                )
-                return
-
-            # Create ingestion pipeline
-            try:
-                pipeline = IngestionPipeline(db)
-            except Exception as pipeline_err:
-                st.error(
-                    f"❌ Failed to initialize ingestion pipeline\n\n"
-                    f"Error: {str(pipeline_err)}\n\n"
-                    f"**Possible causes:**\n"
-                    f"- Database tables not yet created\n"
-                    f"- Database schema mismatch\n\n"
-                    f"**Solution**: Refresh the page and wait a moment."
-                )
-                return
-
-            # Create ingestion run record
-            try:
-                run = IngestRun(
-                    query=query,
-                    start_time=datetime.utcnow(),
-                    status="running",
-                    run_metadata={
-                        "retmax": retmax,
-                        "mindate": mindate,
-                        "maxdate": maxdate,
-                        "skip_existing": skip_existing,
-                    },
-                )
-                db.add(run)
-                db.commit()
-                run_id = run.id
-            except Exception as run_err:
-                st.error(
-                    f"❌ Failed to create ingestion run\n\n"
-                    f"Error: {str(run_err)}\n\n"
-                    f"Database may not be fully initialized yet."
-                )
-                return
+        # Get database session
+        try:
+            db = get_session_factory()()
+        except Exception as db_err:
+            st.error(
+                f"❌ Database Connection Failed\n\n"
+                f"Error: {str(db_err)}\n\n"
+                f"**The system is still initializing.** Please:\n"
+                f"1. Wait 30-60 seconds\n"
+                f"2. Refresh the page (press F5)\n"
+                f"3. Try again"
+            )
+            return
 
-            # Update status
-            status_text.info(f"⏳ Initializing ingestion (Run ID: {run_id})...")
+        # Create ingestion pipeline
+        try:
+            pipeline = IngestionPipeline(db)
+        except Exception as pipeline_err:
+            st.error(
+                f"❌ Failed to initialize ingestion pipeline\n\n"
+                f"Error: {str(pipeline_err)}\n\n"
+                f"**Possible causes:**\n"
+                f"- Database tables not yet created\n"
+                f"- Database schema mismatch\n\n"
+                f"**Solution**: Refresh the page and wait a moment."
+            )
+            return
 
-            # Run ingestion
-            stats = pipeline.ingest_by_query(
+        # Create ingestion run record
+        try:
+            run = IngestRun(
                 query=query,
-                retmax=retmax,
-                mindate=mindate,
-                maxdate=maxdate,
-                skip_existing=skip_existing,
+                status="running",
+                run_metadata={
+                    "retmax": retmax,
+                    "mindate": mindate,
+                    "maxdate": maxdate,
+                    "skip_existing": skip_existing,
+                },
+            )
+            db.add(run)
+            db.flush()
+            # Read the id before commit expires the object and forces a re-SELECT
+            run_id = run.id
+            db.commit()
+        except Exception as run_err:
+            st.error(
+                f"❌ Failed to create ingestion run\n\n"
+                f"Error: {str(run_err)}\n\n"
+                f"Database may not be fully initialized yet."
             )
+            return
+
+        # Run ingestion on a worker thread; it owns the session from here on.
+        # The worker only updates this dict; the progress fragment renders it.
+        progress = {
+            "current": 0,
+            "total": 0,
+            "message": f"Initializing ingestion (Run ID: {run_id})...",
+            "log": deque(maxlen=30),  # Most recent messages only
+        }
+
+        # Forward at most ~200 per-record updates, however large the batch
+        report_every = max(1, retmax // 200)
+
+        def update_progress(stage: str, current: int, total: int, message: str) -> None:
+            if stage == "process" and current % report_every and current != total:
+                return
+            progress.update(current=current, total=total, message=message)
+            progress["log"].append(message)
+
+        # Pipeline log records reach the UI through a bounded queue
+        log_queue: queue.Queue = queue.Queue(maxsize=200)
+
+        future = get_ingest_executor().submit(
+            _run_ingestion,
+            pipeline,
+            db,
+            update_progress,
+            log_queue,
+            query=query,
+            retmax=retmax,
+            mindate=mindate,
+            maxdate=maxdate,
+            skip_existing=skip_existing,
+            run_id=run_id,
+        )
+        db = None
 
-            # Update progress
-            progress_bar.progress(100)
+        # Keep the job in session state so a rerun can resume following it
+        st.session_state.ingest_job = {
+            "future": future,
+            "progress": progress,
+            "log_queue": log_queue,
+            "run_id": run_id,
+            "key": (query, retmax, mindate, maxdate, skip_existing),
+        }
 
-            # Display results
-            with status_container:
-                st.success("✅ Ingestion Completed!")
+    finally:
+        if db is not None:
+            db.close()
 
-                col1, col2, col3, col4 = st.columns(4)
+    _progress_view()
 
-                with col1:
-                    st.metric("Total Records", stats.get("total", 0))
 
-                with col2:
-                    st.metric("Successfully Ingested", stats.get("success", 0))
+@st.fragment(run_every=0.5)
+def _progress_view() -> None:
+    """
+    Render progress of the running ingestion job.
 
-                with col3:
-                    st.metric("Errors", stats.get("errors", 0))
+    Runs as a fragment so only this block re-renders while polling. When the
+    job finishes its outcome is stored in session state and the full app
+    reruns to display it.
+    """
+    job = st.session_state.get("ingest_job")
+    if job is None:
+        return
 
-                with col4:
-                    st.metric("Skipped", stats.get("skipped", 0))
+    progress = job["progress"]
 
-                # Display details
-                if stats.get("errors") > 0 and stats.get("error_details"):
-                    with st.expander("View Error Details"):
-                        for error in stats["error_details"][:10]:
-                            st.warning(f"- {error}")
+    # Move pipeline log records queued since the last run into the activity log
+    log_queue = job["log_queue"]
+    while True:
+        try:
+            record = log_queue.get_nowait()
+        except queue.Empty:
+            break
+        progress["log"].append(record.getMessage())
+
+    total = progress["total"]
+    st.progress(min(progress["current"] / total, 1.0) if total else 0.0)
+    st.info(f"⏳ {progress['message']}" + (f" ({progress['current']}/{total})" if total else ""))
+
+    # Log lines accumulate between fragment runs and are drawn in one update
+    with st.expander("Details", expanded=False):
+        st.text_area(
+            "Recent activity",
+            "\n".join(list(progress["log"])),
+            height=150,
+            disabled=True,
+            label_visibility="collapsed",
+        )
+
+    future = job["future"]
+    if not future.done():
+        return
 
+    st.session_state.pop("ingest_job", None)
+    try:
+        st.session_state.ingest_result = future.result()
+        recent = st.session_state.setdefault("recent_ingests", {})
+        now = time.monotonic()
+        for key in [key for key, (finished, _) in recent.items() if now - finished >= RECENT_INGEST_TTL]:
+            del recent[key]
+        recent[job["key"]] = (now, st.session_state.ingest_result)
     except Exception as e:
         logger.error(f"Ingestion failed: {str(e)}")
-        with status_container:
-            st.error(f"❌ Ingestion Failed: {str(e)}")
+        st.session_state.ingest_error = str(e)
+
+    # New run is in the history now
+    _load_history_df.clear()
+    _load_history_totals.clear()
+
+    st.rerun()
+
+
+def show_ingestion_result(stats: dict[str, Any]) -> None:
+    """
+    Display statistics of a finished ingestion.
+
+    Args:
+        stats: Statistics dictionary returned by the pipeline
+    """
+    st.success("✅ Ingestion Completed!")
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Total Records", stats.get("total", 0))
+
+    with col2:
+        st.metric("Successfully Ingested", stats.get("success", 0))
+
+    with col3:
+        st.metric("Errors", stats.get("errors", 0))
+
+    with col4:
+        st.metric("Skipped", stats.get("skipped", 0))
+
+    # Display details
+    if stats.get("errors") > 0 and stats.get("error_details"):
+        with st.expander("View Error Details"):
+            for error in stats["error_details"][:10]:
+                st.warning(f"- {error}")
+
+
+@st.cache_resource
+def get_ingest_executor() -> ThreadPoolExecutor:
+    """Get the worker pool that runs ingestions off the script thread."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="ingest")
+
+
+# Shared by every job's queue handler; the format skips asctime since the log is live
+_LOG_FORMATTER = logging.Formatter("%(levelname)s: %(message)s")
+
 
+class _BoundedQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of failing when the queue is full."""
 
-def show_ingestion_history() -> None:
-    """Display ingestion history and statistics."""
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def _run_ingestion(
+    pipeline: IngestionPipeline,
+    db: Session,
+    progress_callback: ProgressCallback,
+    log_queue: queue.Queue,
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """
+    Run ingest_by_query on a worker thread and close its session afterwards.
+
+    While it runs, geo_ingest log records emitted by this thread are copied to
+    log_queue for display.
+    """
+    worker = threading.get_ident()
+    handler = _BoundedQueueHandler(log_queue)
+    handler.setLevel(logging.INFO)
+    handler.setFormatter(_LOG_FORMATTER)
+    handler.addFilter(lambda record: record.thread == worker)
+
+    pipeline_logger = logging.getLogger("geo_ingest")
+    pipeline_logger.addHandler(handler)
+    try:
+        return pipeline.ingest_by_query(progress_callback=progress_callback, **kwargs)
+    finally:
+        pipeline_logger.removeHandler(handler)
+        db.close()
+
+
+@st.cache_data(ttl=30, max_entries=16, show_spinner=False)
+def _load_history_df(_db: Session, page: int = 0) -> pd.DataFrame:
+    """
+    Load one page of ingestion runs, newest first, as a display-ready DataFrame.
+
+    Cached briefly so widget reruns don't query the database; cleared after
+    each ingestion.
+
+    Args:
+        _db: Database session (excluded from the cache key)
+        page: Zero-based page number of HISTORY_PAGE_SIZE runs
+
+    Returns:
+        DataFrame with the history table columns, formatted for display
+    """
+    statement = (
+        select(
+            IngestRun.id,
+            IngestRun.query,
+            IngestRun.status,
+            IngestRun.total_count,
+            IngestRun.success_count,
+            IngestRun.error_count,
+            IngestRun.start_time,
+            IngestRun.end_time,
+        )
+        .order_by(IngestRun.start_time.desc())
+        .offset(page * HISTORY_PAGE_SIZE)
+        .limit(HISTORY_PAGE_SIZE)
+    )
+    runs = pd.read_sql(statement, _db.connection(), parse_dates=["start_time", "end_time"])
+
+    counts = runs[["total_count", "success_count", "error_count"]].fillna(0).astype(int)
+    durations = (runs["end_time"] - runs["start_time"]).dt.floor("s")
+
+    return pd.DataFrame({
+        "ID": runs["id"],
+        "Query": runs["query"],
+        "Status": runs["status"],
+        "Total": counts["total_count"],
+        "Success": counts["success_count"],
+        "Errors": counts["error_count"],
+        "Started": runs["start_time"].dt.strftime("%Y-%m-%d %H:%M:%S").fillna("-"),
+        "Duration": durations.astype(str).str.replace("0 days ", "", regex=False).where(durations.notna(), "-"),
+    })
+
+
+@st.cache_data(ttl=30, max_entries=16, show_spinner=False)
+def _load_history_totals(_db: Session) -> dict[str, int]:
+    """
+    Aggregate run and record counts over all ingestion runs in one query.
+
+    Args:
+        _db: Database session (excluded from the cache key)
+
+    Returns:
+        Dictionary with runs, records, success and errors totals, plus the
+        number of distinct series stored
+    """
+    runs, records, success, errors, series = _db.query(
+        func.count(IngestRun.id),
+        func.coalesce(func.sum(IngestRun.total_count), 0),
+        func.coalesce(func.sum(IngestRun.success_count), 0),
+        func.coalesce(func.sum(IngestRun.error_count), 0),
+        select(func.count(GSESeries.accession)).scalar_subquery(),
+    ).one()
+    return {
+        "runs": runs,
+        "records": records,
+        "success": success,
+        "errors": errors,
+        "series": series,
+    }
+
+
+def show_ingestion_history(db: Session) -> None:
+    """
+    Display ingestion history and statistics.
+
+    Args:
+        db: Database session
+    """
     st.subheader("Ingestion History")
 
     try:
-        db = next(get_db())
+        totals = _load_history_totals(db)
     except Exception as e:
         st.warning(f"Cannot access ingestion history: Database not ready\n\nError: {str(e)}")
         return
 
     try:
-        # Get recent ingestion runs
-        runs = db.query(IngestRun).order_by(IngestRun.start_time.desc()).limit(20).all()
-
-        if not runs:
+        if totals["runs"] == 0:
             st.info("No ingestion runs yet. Start by searching and ingesting data!")
             return
 
-        # Create display dataframe
-        history_data = []
-        for run in runs:
-            history_data.append({
-                "ID": run.id,
-                "Query": run.query,
-                "Status": run.status,
-                "Total": run.total_count or 0,
-                "Success": run.success_count or 0,
-                "Errors": run.error_count or 0,
-                "Started": run.start_time.strftime("%Y-%m-%d %H:%M:%S") if run.start_time else "-",
-                "Duration": (
-                    str(run.end_time - run.start_time).split(".")[0]
-                    if run.end_time and run.start_time
-                    else "-"
-                ),
-            })
+        # Page through runs server-side instead of loading the whole table
+        page_count = -(-totals["runs"] // HISTORY_PAGE_SIZE)
+        page = 1
+        if page_count > 1:
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+
+        history_df = _load_history_df(db, page - 1)
 
         # Display as table
-        st.dataframe(history_data, use_container_width=True)
+        st.dataframe(history_df, use_container_width=True, hide_index=True)
 
         # Show statistics
         st.subheader("Ingestion Statistics")
 
         col1, col2, col3, col4 = st.columns(4)
 
-        total_runs = len(runs)
-        total_records = sum(r.total_count or 0 for r in runs)
-        total_success = sum(r.success_count or 0 for r in runs)
-        total_errors = sum(r.error_count or 0 for r in runs)
-
         with col1:
-            st.metric("Total Runs", total_runs)
+            st.metric("Total Runs", totals["runs"])
 
         with col2:
-            st.metric("Total Records Fetched", total_records)
+            st.metric("Total Records Fetched", totals["records"])
 
         with col3:
-            st.metric("Total Successful", total_success)
+            st.metric("Total Successful", totals["success"])
 
         with col4:
-            st.metric("Total Errors", total_errors)
+            st.metric("Total Errors", totals["errors"])
 
     except Exception as e:
         st.error(f"Error loading ingestion history: {str(e)}")
 
 
-def show_ingestion_config() -> None:
-    """Display ingestion configuration options."""
-    st.subheader("Configuration")
+def show_ingestion_config(db: Session) -> None:
+    """
+    Display ingestion configuration options.
 
-    from config import settings
+    Args:
+        db: Database session used for the statistics section
+    """
+    st.subheader("Configuration")
 
     # Display current settings
     st.markdown("**Current NCBI Settings:**")
@@ -373,15 +680,14 @@ def show_ingestion_config() -> None:
     st.markdown("**Database Statistics:**")
 
     try:
-        db = next(get_db())
-        series_count = db.query(IngestRun.total_count).first()[0] or 0
-        total_ingested = db.query(IngestRun.success_count).first()[0] or 0
+        totals = _load_history_totals(db)
 
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("Records in Database", total_ingested)
+            # Re-ingested series count once here, unlike the summed success counts
+            st.metric("Records in Database", totals["series"])
         with col2:
-            st.metric("Total Processed", series_count)
+            st.metric("Total Processed", totals["records"])
 
     except Exception as e:
         st.warning(f"Could not fetch database stats: {str(e)}")
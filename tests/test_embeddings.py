@@ -0,0 +1,46 @@
+"""Tests for embedding providers."""
+import json
+
+import numpy as np
+import pytest
+from unittest.mock import Mock
+
+from vector.embeddings import OnnxEmbeddingProvider
+
+
+class TestOnnxEmbeddingProvider:
+    """Test suite for OnnxEmbeddingProvider."""
+
+    @pytest.fixture
+    def provider(self):
+        """Create a provider without loading or exporting a model."""
+        provider = OnnxEmbeddingProvider.__new__(OnnxEmbeddingProvider)
+        provider.tokenizer = Mock(model_max_length=512)
+        return provider
+
+    def test_max_seq_length_from_sentence_bert_config(self, provider, tmp_path):
+        """Test that the sentence-transformers truncation length is used."""
+        (tmp_path / "sentence_bert_config.json").write_text(json.dumps({"max_seq_length": 128}))
+
+        assert provider._load_max_seq_length(tmp_path) == 128
+
+    def test_max_seq_length_defaults_without_config(self, provider, tmp_path):
+        """Test the sentence-transformers default when no config was exported."""
+        assert provider._load_max_seq_length(tmp_path) == 256
+
+    def test_embed_texts_truncates_at_max_seq_length(self, provider):
+        """Test that texts are tokenized with the model's max_seq_length."""
+        provider.max_seq_length = 256
+        provider._dimension = 2
+        provider._input_names = {"input_ids", "attention_mask"}
+        provider.tokenizer.return_value = {
+            "input_ids": np.array([[1, 2]]),
+            "attention_mask": np.array([[1, 1]]),
+        }
+        provider.session = Mock()
+        provider.session.run.return_value = [np.array([[[3.0, 0.0], [3.0, 0.0]]])]
+
+        embeddings = provider.embed_texts(["long GEO summary"])
+
+        assert provider.tokenizer.call_args.kwargs["max_length"] == 256
+        assert embeddings.tolist() == [[1.0, 0.0]]
@@ -0,0 +1,188 @@
+"""Tests for hybrid search fusion."""
+import pytest
+from unittest.mock import Mock, patch
+
+from search.hybrid_search import HybridSearchEngine, clear_search_cache, make_snippet, search_geo
+
+
+class TestReciprocalRankFusion:
+    """Test suite for HybridSearchEngine._reciprocal_rank_fusion."""
+
+    @pytest.fixture
+    def engine(self):
+        """Create a search engine with a mock database session."""
+        return HybridSearchEngine(Mock())
+
+    def test_shared_result_ranks_first(self, engine):
+        """Test that a result found by both searches outranks single hits."""
+        semantic_results = [
+            {"accession": "GSE001", "score": 0.9},
+            {"accession": "GSE002", "score": 0.8},
+        ]
+        lexical_results = [
+            {"accession": "GSE002", "score": 0.95},
+            {"accession": "GSE003", "score": 0.7},
+        ]
+
+        ranked = engine._reciprocal_rank_fusion(
+            semantic_results, lexical_results, k=60
+        )
+
+        assert ranked == ["GSE002", "GSE001", "GSE003"]
+
+    def test_ties_keep_first_seen_order(self, engine):
+        """Test that equal scores keep semantic-then-lexical order."""
+        ranked = engine._reciprocal_rank_fusion(
+            [{"accession": "GSE001"}],
+            [{"accession": "GSE002"}],
+            k=60,
+        )
+
+        assert ranked == ["GSE001", "GSE002"]
+
+    def test_mesh_boost_reorders_results(self, engine):
+        """Test that MeSH boosts are added to the fused scores."""
+        mesh_by_accession = {
+            "GSE002": [{"mesh_id": "D001943", "preferred_name": "Breast Neoplasms", "confidence": 0.9}],
+            "GSE999": [{"mesh_id": "D001943", "preferred_name": "Breast Neoplasms", "confidence": 0.9}],
+        }
+
+        ranked = engine._reciprocal_rank_fusion(
+            [{"accession": "GSE001"}, {"accession": "GSE002"}],
+            [],
+            mesh_by_accession=mesh_by_accession,
+            k=60,
+        )
+
+        assert ranked == ["GSE002", "GSE001"]
+
+    def test_empty_inputs(self, engine):
+        """Test fusion of empty result lists."""
+        assert engine._reciprocal_rank_fusion([], [], k=60) == []
+
+
+class TestSearch:
+    """Test suite for HybridSearchEngine.search."""
+
+    @pytest.fixture
+    def engine(self):
+        """Create a search engine whose database-backed steps are mocked."""
+        engine = HybridSearchEngine(Mock())
+        engine._lexical_search = Mock(return_value=[{"accession": "GSE002", "score": 0.5}])
+        engine._load_matched_mesh_terms = Mock(return_value={})
+        engine._fetch_and_filter_results = Mock(side_effect=lambda ranked_accessions, **_: ranked_accessions)
+        return engine
+
+    def test_combines_semantic_and_lexical(self, engine):
+        """Test that both branches contribute to the fused results."""
+        with patch("search.hybrid_search.semantic_search", return_value=[{"accession": "GSE001", "score": 0.9}]):
+            response = engine.search("breast cancer", use_mesh=False, top_k=10)
+
+        assert response["results"] == ["GSE001", "GSE002"]
+        assert response["metadata"]["semantic_count"] == 1
+        assert response["metadata"]["lexical_count"] == 1
+
+    def test_semantic_failure_keeps_lexical_results(self, engine):
+        """Test that a semantic search error doesn't fail the whole search."""
+        with patch("search.hybrid_search.semantic_search", side_effect=RuntimeError("milvus down")):
+            response = engine.search("breast cancer", use_mesh=False, top_k=10)
+
+        assert response["results"] == ["GSE002"]
+        assert response["metadata"]["semantic_count"] == 0
+        assert response["metadata"]["semantic_failed"] is True
+
+    def test_empty_results_skip_database_steps(self, engine):
+        """Test that no MeSH or metadata queries run when nothing was found."""
+        engine._lexical_search.return_value = []
+
+        with patch("search.hybrid_search.semantic_search", return_value=[]):
+            response = engine.search("zzzz", use_mesh=False, top_k=10)
+
+        assert response["results"] == []
+        engine._load_matched_mesh_terms.assert_not_called()
+        engine._fetch_and_filter_results.assert_not_called()
+
+
+class TestSearchGeoCache:
+    """Test suite for search_geo result caching."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Isolate the module-level search cache."""
+        clear_search_cache()
+        yield
+        clear_search_cache()
+
+    def test_repeat_query_is_cached(self):
+        """Test that normalized repeat queries reuse the cached result."""
+        engine = Mock()
+        engine.search.return_value = {"results": [{"accession": "GSE001"}], "metadata": {}}
+
+        first = search_geo("Breast  Cancer", filters={"tech_type": "rna-seq"}, engine=engine)
+        first["results"].clear()
+        second = search_geo("breast cancer", filters={"tech_type": "rna-seq"}, engine=engine)
+
+        engine.search.assert_called_once_with(
+            query="Breast  Cancer", filters={"tech_type": "rna-seq"}, top_k=50
+        )
+        assert second["results"] == [{"accession": "GSE001"}]
+
+    def test_different_filters_are_not_shared(self):
+        """Test that filters are part of the cache key."""
+        engine = Mock()
+        engine.search.return_value = {"results": [], "metadata": {}}
+
+        search_geo("breast cancer", filters={"tech_type": "rna-seq"}, engine=engine)
+        search_geo("breast cancer", filters={"tech_type": "microarray"}, engine=engine)
+
+        assert engine.search.call_count == 2
+
+    def test_expired_entry_is_recomputed(self):
+        """Test that cached results are dropped after search_cache_ttl."""
+        engine = Mock()
+        engine.search.return_value = {"results": [], "metadata": {}}
+
+        with patch("search.hybrid_search.time.monotonic", side_effect=[0.0, 1.0, 1e9, 1e9]):
+            search_geo("breast cancer", engine=engine)
+            search_geo("breast cancer", engine=engine)
+            search_geo("breast cancer", engine=engine)
+
+        assert engine.search.call_count == 2
+
+    def test_degraded_result_is_not_cached(self):
+        """Test that a result missing its semantic half is recomputed next time."""
+        engine = Mock()
+        engine.search.return_value = {"results": [], "metadata": {"semantic_failed": True}}
+
+        search_geo("breast cancer", engine=engine)
+        search_geo("breast cancer", engine=engine)
+
+        assert engine.search.call_count == 2
+
+
+class TestMakeSnippet:
+    """Test suite for make_snippet."""
+
+    def test_snippet_starts_near_first_match(self):
+        """Test that the snippet is centred on the earliest matching term."""
+        text = "x" * 100 + " Breast cancer cohort " + "y" * 100 + " RNA-seq"
+
+        snippet = make_snippet(text, ["rna-seq", "breast"], max_length=40)
+
+        assert snippet.startswith("...")
+        assert "Breast cancer" in snippet
+        assert "RNA-seq" not in snippet
+
+    def test_no_match_returns_beginning(self):
+        """Test fallback to the start of the text when nothing matches."""
+        text = "a" * 300
+
+        assert make_snippet(text, ["zzz"], max_length=10) == "a" * 10 + "..."
+
+    def test_terms_are_matched_literally(self):
+        """Test that regex metacharacters in terms are escaped."""
+        text = "prefix " * 20 + "value (n=5)"
+
+        snippet = make_snippet(text, ["(n=5)"], max_length=20)
+
+        assert "(n=5)" in snippet
@@ -0,0 +1,50 @@
+"""Tests for the GEO ingestion pipeline."""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from geo_ingest import ingest_pipeline
+from geo_ingest.ingest_pipeline import IngestionPipeline
+
+
+class TestProcessAccessions:
+    """Test suite for IngestionPipeline._process_accessions."""
+
+    @pytest.fixture
+    def pipeline(self):
+        """Create a pipeline with mocked clients and stores."""
+        pipeline = IngestionPipeline.__new__(IngestionPipeline)
+        pipeline.db = MagicMock()
+        pipeline.ncbi_client = MagicMock()
+        pipeline.parser = MagicMock()
+        pipeline.parser.parse_gse_metadata.return_value = {"accession": "GSE001"}
+        pipeline.embedding_provider = MagicMock()
+        pipeline.vector_store = MagicMock()
+        return pipeline
+
+    def test_caches_are_cleared_after_flush(self, pipeline):
+        """Test that cached search results are dropped once new vectors are flushed."""
+        calls = MagicMock()
+        calls.attach_mock(pipeline.vector_store.flush, "flush")
+
+        with (
+            patch.object(ingest_pipeline, "GSESeries"),
+            patch.object(
+                ingest_pipeline, "clear_search_cache", side_effect=lambda: calls.clear()
+            ) as clear_cache,
+        ):
+            stats = pipeline._process_accessions(run_id=1, accessions=["GSE001"])
+
+        assert stats["success"] == 1
+        clear_cache.assert_called_once()
+        assert [name for name, _, _ in calls.mock_calls] == ["flush", "clear"]
+
+    def test_caches_are_kept_when_nothing_was_ingested(self, pipeline):
+        """Test that a run without new records leaves the caches alone."""
+        pipeline.ncbi_client.fetch_gse_text.return_value = {"error": "not found"}
+
+        with patch.object(ingest_pipeline, "clear_search_cache") as clear_cache:
+            stats = pipeline._process_accessions(run_id=1, accessions=["GSE001"])
+
+        assert stats["errors"] == 1
+        clear_cache.assert_not_called()
+        pipeline.vector_store.flush.assert_not_called()
@@ -0,0 +1,71 @@
+"""Tests for the full MeSH database loader script."""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from scripts import load_mesh_full
+
+
+class TestLoadMeshToDb:
+    """Test suite for load_mesh_to_db."""
+
+    @pytest.fixture
+    def db(self):
+        """Create a mock session that already holds one MeSH term."""
+        db = MagicMock()
+        db.query.return_value.all.return_value = [("D000001",)]
+        return db
+
+    def test_read_transaction_ends_before_indexes_are_dropped(self, db):
+        """Test that the skip_existing read is committed before DROP INDEX runs."""
+        calls = MagicMock()
+        calls.attach_mock(db.commit, "commit")
+        descriptors = [{"mesh_id": "D000001"}, {"mesh_id": "D000002"}]
+
+        with (
+            patch.object(load_mesh_full, "SessionLocal", return_value=db),
+            patch.object(load_mesh_full, "insert_mesh_terms"),
+            patch.object(load_mesh_full, "_create_mesh_indexes"),
+            patch.object(
+                load_mesh_full, "_drop_mesh_indexes", side_effect=lambda _: calls.drop()
+            ),
+        ):
+            load_mesh_full.load_mesh_to_db(descriptors, skip_existing=True, drop_indexes=True)
+
+        names = [name for name, _, _ in calls.mock_calls]
+        assert names.index("commit") < names.index("drop")
+
+    def test_failed_batch_is_retried_row_by_row(self, db):
+        """Test that only the bad row of a failed batch is skipped."""
+        def insert(_, rows):
+            if any(row["mesh_id"] == "D000003" for row in rows):
+                raise ValueError("bad row")
+
+        descriptors = [{"mesh_id": "D000002"}, {"mesh_id": "D000003"}, {"mesh_id": "D000004"}]
+
+        with (
+            patch.object(load_mesh_full, "SessionLocal", return_value=db),
+            patch.object(load_mesh_full, "insert_mesh_terms", side_effect=insert) as insert_mock,
+            patch.object(load_mesh_full.logger, "warning") as warning,
+        ):
+            load_mesh_full.load_mesh_to_db(descriptors, skip_existing=True, drop_indexes=False)
+
+        retried = [call.args[1] for call in insert_mock.call_args_list[1:]]
+        assert retried == [[descriptor] for descriptor in descriptors]
+        warning.assert_called_with("Encountered %s errors", 1)
+
+    def test_index_rebuild_failure_does_not_mask_load_error(self, db):
+        """Test that the original load error propagates when rebuilding indexes fails."""
+        db.rollback.side_effect = [RuntimeError("connection lost"), None]
+
+        with (
+            patch.object(load_mesh_full, "SessionLocal", return_value=db),
+            patch.object(load_mesh_full, "insert_mesh_terms", side_effect=ValueError("bad batch")),
+            patch.object(load_mesh_full, "_drop_mesh_indexes"),
+            patch.object(
+                load_mesh_full, "_create_mesh_indexes", side_effect=RuntimeError("in failed transaction")
+            ) as create_indexes,
+        ):
+            with pytest.raises(RuntimeError, match="connection lost"):
+                load_mesh_full.load_mesh_to_db([{"mesh_id": "D000002"}], drop_indexes=True)
+
+        create_indexes.assert_called_once()
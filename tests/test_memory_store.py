@@ -0,0 +1,52 @@
+"""Tests for the in-memory vector store."""
+import pytest
+from unittest.mock import Mock, patch
+
+from vector.memory_store import InMemoryStore
+
+
+class TestInMemoryStore:
+    """Test suite for InMemoryStore."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create an empty 2-d store backed by a temporary file."""
+        provider = Mock()
+        provider.get_dimension.return_value = 2
+        with patch("vector.memory_store.get_embedding_provider", return_value=provider):
+            yield InMemoryStore(path=str(tmp_path / "vectors.npz"))
+
+    def test_search_ranks_by_cosine(self, store):
+        """Test that results are the top_k most similar vectors, best first."""
+        store.upsert_embeddings([
+            ("GSE001", [0.6, 0.8]),
+            ("GSE002", [1.0, 0.0]),
+            ("GSE003", [0.8, 0.6]),
+        ])
+
+        results = store.search([2.0, 0.0], top_k=2)
+
+        assert [r["accession"] for r in results] == ["GSE002", "GSE003"]
+        assert results[1]["score"] == pytest.approx(0.8)
+
+    def test_upsert_replaces_existing_accession(self, store):
+        """Test that re-inserting an accession updates it in place."""
+        store.upsert_embeddings([("GSE001", [1.0, 0.0])])
+        store.upsert_embeddings([("GSE001", [0.0, 1.0])])
+
+        assert store.count() == 1
+        assert store.search([0.0, 1.0], top_k=1)[0]["score"] == pytest.approx(1.0)
+
+    def test_flush_persists_and_delete_removes(self, store):
+        """Test that flushed vectors reload from disk and deletes drop rows."""
+        store.upsert_embeddings([("GSE001", [1.0, 0.0]), ("GSE002", [0.0, 1.0])])
+        store.flush()
+
+        provider = Mock()
+        provider.get_dimension.return_value = 2
+        with patch("vector.memory_store.get_embedding_provider", return_value=provider):
+            reloaded = InMemoryStore(path=str(store.path))
+        reloaded.delete(["GSE001"])
+
+        assert reloaded.count() == 1
+        assert reloaded.search([1.0, 0.0], top_k=5)[0]["accession"] == "GSE002"
@@ -0,0 +1,67 @@
+"""Tests for MeSH loader."""
+import csv
+import io
+import json
+
+import pytest
+from unittest.mock import MagicMock
+
+from db import MeshTerm
+from mesh.loader import insert_mesh_terms
+
+
+class TestInsertMeshTerms:
+    """Test suite for insert_mesh_terms."""
+
+    @pytest.fixture
+    def rows(self):
+        """Create MeSH term rows with characters that need CSV quoting."""
+        return [
+            {
+                "mesh_id": "D017423",
+                "descriptor_ui": "D017423",
+                "preferred_name": "Sequence Analysis, RNA",
+                "entry_terms": ['RNA-Seq', 'The "RNA" Seq'],
+                "tree_numbers": ["E05.393.620.700"],
+            },
+        ]
+
+    def _mock_db(self, driver):
+        """Create a mock session whose engine uses the given DBAPI driver."""
+        db = MagicMock()
+        db.get_bind.return_value.dialect.driver = driver
+        return db
+
+    def test_copy_on_psycopg2(self, rows):
+        """Test that psycopg2 sessions load rows with a single COPY."""
+        db = self._mock_db("psycopg2")
+        cursor = db.connection.return_value.connection.cursor.return_value
+
+        insert_mesh_terms(db, rows)
+
+        sql, buffer = cursor.copy_expert.call_args.args
+        assert sql.startswith("COPY mesh_term (mesh_id, descriptor_ui, preferred_name")
+        record = next(csv.reader(io.StringIO(buffer.getvalue())))
+        assert record[2] == "Sequence Analysis, RNA"
+        assert json.loads(record[3]) == ['RNA-Seq', 'The "RNA" Seq']
+        db.bulk_insert_mappings.assert_not_called()
+        cursor.close.assert_called_once()
+
+    def test_copy_writes_null_for_missing_values(self):
+        """Test that missing optional values load as NULL, as with the ORM paths."""
+        db = self._mock_db("psycopg2")
+        cursor = db.connection.return_value.connection.cursor.return_value
+
+        insert_mesh_terms(db, [{"mesh_id": "D000001", "preferred_name": "Calcimycin", "tree_numbers": None}])
+
+        _, buffer = cursor.copy_expert.call_args.args
+        assert buffer.getvalue().startswith("D000001,,Calcimycin,,,")
+
+    def test_other_drivers_use_bulk_insert(self, rows):
+        """Test the bulk_insert_mappings fallback for non-psycopg2 engines."""
+        db = self._mock_db("pysqlite")
+
+        insert_mesh_terms(db, rows)
+
+        db.bulk_insert_mappings.assert_called_once_with(MeshTerm, rows)
+        db.connection.assert_not_called()
@@ -1,6 +1,6 @@
 """Tests for MeSH matcher."""
 import pytest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, patch
 
 from mesh.matcher import MeSHMatcher
 
@@ -28,27 +28,65 @@ class TestMeSHMatcher:
 
         return [term1, term2]
 
-    def test_match_text_exact_phrase(self):
-        """Test exact phrase matching."""
-        matcher = Mock(spec=MeSHMatcher)
-        matcher.term_lookup = {
-            "breast cancer": ["D001943"],
-            "rna-seq": ["D017423"],
-        }
-
-        # Simulate matching
-        text = "breast cancer RNA-seq study"
-        # This would be the actual implementation
-        assert "breast cancer" in text.lower()
-        assert "rna-seq" in text.lower()
-
-    def test_match_text_token_based(self):
-        """Test token-based matching."""
-        # Test that tokens are extracted correctly
-        text = "This is a test for breast cancer analysis"
-        tokens = text.lower().split()
-        assert "breast" in tokens
-        assert "cancer" in tokens
+    def test_match_gse_batch(self, mock_db, mock_mesh_terms):
+        """Test batch matching scores every returned record."""
+        mock_db.query.return_value.all.return_value = mock_mesh_terms
+        mock_db.query.return_value.filter.return_value.all.return_value = [
+            ("GSE001", "Breast cancer cohort", None, None),
+            ("GSE002", "Liver study", "RNA-Seq of hepatocytes", None),
+        ]
+        matcher = MeSHMatcher(mock_db)
+
+        results = matcher.match_gse_batch(["GSE001", "GSE002", "GSE404"])
+
+        assert set(results) == {"GSE001", "GSE002"}
+        assert [m["mesh_id"] for m in results["GSE001"]] == ["D001943"]
+        assert [m["mesh_id"] for m in results["GSE002"]] == ["D017423"]
+
+    def test_match_gse_batch_empty(self, mock_db):
+        """Test that an empty batch doesn't query the database."""
+        matcher = MeSHMatcher.__new__(MeSHMatcher)
+        matcher.db = mock_db
+
+        assert matcher.match_gse_batch([]) == {}
+        mock_db.query.assert_not_called()
+
+    def test_match_text_exact_phrase(self, mock_db, mock_mesh_terms):
+        """Test that phrases found by the automaton get phrase confidence."""
+        mock_db.query.return_value.all.return_value = mock_mesh_terms
+        matcher = MeSHMatcher(mock_db)
+
+        matches = matcher._match_text("Breast cancer RNA-seq study", weight=1.0)
+
+        assert matches == {"D001943": pytest.approx(0.7), "D017423": pytest.approx(0.6)}
+
+    def test_match_text_token_based(self, mock_db, mock_mesh_terms):
+        """Test that out-of-order term tokens get the lower token confidence."""
+        mock_db.query.return_value.all.return_value = mock_mesh_terms
+        matcher = MeSHMatcher(mock_db)
+
+        matches = matcher._match_text("Cancer of the breast", weight=2.0)
+
+        assert matches == {"D001943": pytest.approx(1.0)}
+
+    def test_tag_gse_batch_clears_search_cache(self, mock_db):
+        """Test that new tags invalidate cached search results after commit."""
+        mock_db.query.return_value.all.return_value = []
+        mock_db.query.return_value.filter.return_value.all.return_value = []
+        matcher = MeSHMatcher(mock_db)
+        matcher.match_gse_batch = Mock(
+            return_value={"GSE001": [{"mesh_id": "D001943", "confidence": 0.9}]}
+        )
+        calls = MagicMock()
+        calls.attach_mock(mock_db.commit, "commit")
+
+        with patch(
+            "search.hybrid_search.clear_search_cache", side_effect=lambda: calls.clear()
+        ):
+            count = matcher.tag_gse_batch(["GSE001"])
+
+        assert count == 1
+        assert [name for name, _, _ in calls.mock_calls] == ["commit", "clear"]
 
     def test_confidence_scoring(self):
         """Test confidence score calculation."""
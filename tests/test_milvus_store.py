@@ -0,0 +1,101 @@
+"""Tests for Milvus vector store."""
+import json
+
+import numpy as np
+import pytest
+from unittest.mock import Mock
+
+from vector.milvus_store import DELETE_BATCH_SIZE, MilvusStore
+
+
+class TestDelete:
+    """Test suite for MilvusStore.delete."""
+
+    @pytest.fixture
+    def store(self):
+        """Create a store with a mock collection, bypassing the connection."""
+        store = MilvusStore.__new__(MilvusStore)
+        store.collection = Mock()
+        store.num_partitions = 0
+        return store
+
+    def test_large_lists_are_split_into_batches(self, store):
+        """Test that each delete expression holds at most DELETE_BATCH_SIZE accessions."""
+        accessions = [f"GSE{i}" for i in range(DELETE_BATCH_SIZE + 1)]
+
+        store.delete(accessions)
+
+        exprs = [call.args[0] for call in store.collection.delete.call_args_list]
+        batches = [json.loads(expr.removeprefix("accession in ")) for expr in exprs]
+        assert sorted(len(batch) for batch in batches) == [1, DELETE_BATCH_SIZE]
+        assert sorted(acc for batch in batches for acc in batch) == sorted(accessions)
+        store.collection.flush.assert_not_called()
+
+    def test_partitioned_deletes_target_each_partition(self, store):
+        """Test that deletes are routed to the partition each accession hashes to."""
+        store.num_partitions = 4
+        accessions = [f"GSE{i}" for i in range(20)]
+
+        store.delete(accessions)
+
+        calls = store.collection.delete.call_args_list
+        routed = {
+            accession: call.args[1]
+            for call in calls
+            for accession in json.loads(call.args[0].removeprefix("accession in "))
+        }
+        assert sorted(routed) == sorted(accessions)
+        assert all(routed[acc] == store.partitions_for([acc])[0] for acc in accessions)
+        assert len(calls) == len(store.partitions_for(accessions))
+
+    def test_quote_in_accession_is_rejected(self, store):
+        """Test that accessions that could break out of the expression raise."""
+        with pytest.raises(ValueError):
+            store.delete(['GSE1"] or accession != "'])
+
+        store.collection.delete.assert_not_called()
+
+
+class TestSearchRerank:
+    """Test suite for MilvusStore.search_batch with reranking."""
+
+    def test_candidates_are_rescored_by_exact_cosine(self):
+        """Test that stored vectors, not approximate distances, decide the order."""
+        hits = Mock()
+        hits.__len__ = Mock(return_value=2)
+        hits.__iter__ = Mock(return_value=iter([
+            Mock(entity={"embedding": [0.0, 1.0]}),
+            Mock(entity={"embedding": [1.0, 0.1]}),
+        ]))
+        hits.ids = ["GSE001", "GSE002"]
+
+        store = MilvusStore.__new__(MilvusStore)
+        store.index_type = "IVF_SQ8"
+        store.collection = Mock()
+        store.collection.search.return_value = [hits]
+
+        results = store.search_batch([[1.0, 0.0]], top_k=1)
+
+        assert [r["accession"] for r in results[0]] == ["GSE002"]
+        assert store.collection.search.call_args.kwargs["output_fields"] == ["embedding"]
+
+
+class TestUpsertTable:
+    """Test suite for MilvusStore.upsert_embeddings with columnar input."""
+
+    def test_arrow_table_is_split_into_columns(self):
+        """Test that a pyarrow table is inserted as accessions plus a float32 matrix."""
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table({
+            "accession": ["GSE001", "GSE002"],
+            "embedding": pa.FixedSizeListArray.from_arrays(pa.array([1.0, 0.0, 0.0, 1.0]), 2),
+        })
+        store = MilvusStore.__new__(MilvusStore)
+        store.insert_vectors = Mock()
+
+        store.upsert_embeddings(table)
+
+        accessions, vectors = store.insert_vectors.call_args.args
+        assert accessions == ["GSE001", "GSE002"]
+        assert vectors.dtype == np.float32
+        assert vectors.tolist() == [[1.0, 0.0], [0.0, 1.0]]
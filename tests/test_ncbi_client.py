@@ -0,0 +1,22 @@
+"""Tests for the NCBI E-utilities client."""
+from geo_ingest.ncbi_client import NCBIClient, create_http_session
+
+
+class TestHttpSession:
+    """Test suite for HTTP session retry configuration."""
+
+    def test_default_session_retries_throttling(self):
+        """Test that shared sessions retry 429s at the transport layer."""
+        retry = create_http_session().get_adapter("https://").max_retries
+
+        assert retry.total == 5
+        assert 429 in retry.status_forcelist
+
+    def test_ncbi_client_has_a_single_retry_layer(self):
+        """Test that the client leaves retries to its rate-limited backoff."""
+        client = NCBIClient(email="test@example.com")
+
+        retry = client.session.get_adapter("https://").max_retries
+
+        assert retry.total == 0
+        assert not retry.status_forcelist
@@ -1,8 +1,13 @@
 """Tests for query expansion."""
 import pytest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
-from mesh.query_expand import QueryExpander
+from mesh.query_expand import (
+    MeshVocabulary,
+    QueryExpander,
+    clear_mesh_vocabulary,
+    get_mesh_vocabulary,
+)
 
 
 class TestQueryExpander:
@@ -56,3 +61,100 @@ class TestQueryExpander:
 
         assert original in expanded
         assert all(token in expanded for token in expansion_tokens)
+
+
+class TestMeshVocabulary:
+    """Test suite for MeshVocabulary."""
+
+    @pytest.fixture
+    def vocabulary(self):
+        """Create a vocabulary with two MeSH terms."""
+        return MeshVocabulary([
+            ("D001943", "Breast Neoplasms", ["Breast Cancer", "Mammary Cancer"], "D001943"),
+            ("D017423", "Sequence Analysis, RNA", ["RNA-Seq", "RNA Sequencing"], "D017423"),
+        ])
+
+    def test_match_finds_terms_in_query_order(self, vocabulary):
+        """Test that terms are matched case-insensitively in query order."""
+        matches = vocabulary.match("RNA-seq of Breast cancer tumours")
+
+        assert [m["mesh_id"] for m in matches] == ["D017423", "D001943"]
+        assert matches[1]["entry_terms"] == ["Breast Cancer", "Mammary Cancer"]
+
+    def test_match_requires_word_boundaries(self, vocabulary):
+        """Test that terms inside longer words don't match."""
+        assert vocabulary.match("prebreast cancerous mrna-seq") == []
+
+    def test_match_normalizes_punctuation(self, vocabulary):
+        """Test that punctuation in names and queries is ignored."""
+        matches = vocabulary.match("sequence analysis rna")
+
+        assert [m["mesh_id"] for m in matches] == ["D017423"]
+
+    def test_repeat_queries_reuse_scan(self, vocabulary):
+        """Test that queries normalizing to the same text are scanned once."""
+        first = vocabulary.match("Breast Cancer")
+        first.clear()
+        second = vocabulary.match("breast  cancer!")
+
+        assert [m["mesh_id"] for m in second] == ["D001943"]
+        assert vocabulary._match_normalized.cache_info().hits == 1
+
+    def test_empty_vocabulary(self):
+        """Test matching against an empty vocabulary."""
+        assert MeshVocabulary([]).match("breast cancer") == []
+
+
+class TestGetMeshVocabulary:
+    """Test suite for the process-wide MeSH vocabulary."""
+
+    ROWS = [("D001943", "Breast Neoplasms", ["Breast Cancer"], "D001943")]
+
+    @pytest.fixture(autouse=True)
+    def clear_vocabulary(self):
+        """Isolate the module-level vocabulary."""
+        clear_mesh_vocabulary()
+        yield
+        clear_mesh_vocabulary()
+
+    def test_reused_between_checks(self):
+        """Test that the vocabulary is not rechecked within the check interval."""
+        db = Mock()
+        db.query.return_value.all.return_value = self.ROWS
+
+        with patch("mesh.query_expand.time.monotonic", return_value=100.0):
+            first = get_mesh_vocabulary(db)
+            second = get_mesh_vocabulary(db)
+
+        assert second is first
+        db.query.return_value.scalar.assert_not_called()
+
+    def test_empty_vocabulary_is_rebuilt_after_mesh_load(self):
+        """Test that a vocabulary built before MeSH was loaded is rebuilt once terms exist."""
+        db = Mock()
+        db.query.return_value.all.return_value = []
+
+        with patch("mesh.query_expand.time.monotonic", return_value=0.0):
+            empty = get_mesh_vocabulary(db)
+
+        db.query.return_value.all.return_value = self.ROWS
+        db.query.return_value.scalar.return_value = 1
+        with patch("mesh.query_expand.time.monotonic", return_value=1000.0):
+            vocabulary = get_mesh_vocabulary(db)
+
+        assert empty.terms == {}
+        assert list(vocabulary.terms) == ["D001943"]
+
+    def test_unchanged_count_keeps_vocabulary(self):
+        """Test that the vocabulary survives a check when the row count matches."""
+        db = Mock()
+        db.query.return_value.all.return_value = self.ROWS
+        db.query.return_value.scalar.return_value = 1
+
+        with patch("mesh.query_expand.time.monotonic", return_value=0.0):
+            first = get_mesh_vocabulary(db)
+        with patch("mesh.query_expand.time.monotonic", return_value=1000.0):
+            second = get_mesh_vocabulary(db)
+
+        assert second is first
+        db.query.return_value.scalar.assert_called_once()
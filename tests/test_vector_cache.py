@@ -0,0 +1,70 @@
+"""Tests for the semantic result cache."""
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from vector.cache import DiskEmbeddingCache, SemanticCache
+
+
+class TestSemanticCache:
+    """Test suite for SemanticCache."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a small cache with a high similarity threshold."""
+        return SemanticCache(max_size=2, threshold=0.95, ttl_seconds=60)
+
+    def test_exact_hit_returns_copy(self, cache):
+        """Test exact-key lookups and that callers can't mutate cached results."""
+        cache.put("q", [1.0, 0.0], scope=10, results=[{"accession": "GSE001"}])
+
+        first = cache.get("q")
+        first[0]["accession"] = "changed"
+
+        assert cache.get("q") == [{"accession": "GSE001"}]
+        assert cache.get("other") is None
+
+    def test_similar_vector_hits_within_scope(self, cache):
+        """Test that a near-identical embedding reuses results only in the same scope."""
+        cache.put(None, [1.0, 0.0], scope=10, results=[{"accession": "GSE001"}])
+
+        assert cache.get_similar([0.99, 0.05], scope=10) == [{"accession": "GSE001"}]
+        assert cache.get_similar([0.99, 0.05], scope=20) is None
+        assert cache.get_similar([0.0, 1.0], scope=10) is None
+
+    def test_least_recently_used_is_evicted(self, cache):
+        """Test LRU eviction once max_size is reached."""
+        cache.put("a", [1.0, 0.0], scope=10, results=[{"accession": "GSE001"}])
+        cache.put("b", [0.0, 1.0], scope=10, results=[{"accession": "GSE002"}])
+        cache.get("a")
+        cache.put("c", [-1.0, 0.0], scope=10, results=[{"accession": "GSE003"}])
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get_similar([0.0, 1.0], scope=10) is None
+        assert len(cache) == 2
+
+    def test_expired_entries_are_dropped(self, cache):
+        """Test that entries are not served after their TTL."""
+        with patch("vector.cache.time.monotonic", return_value=0.0):
+            cache.put("q", [1.0, 0.0], scope=10, results=[{"accession": "GSE001"}])
+
+        with patch("vector.cache.time.monotonic", return_value=61.0):
+            assert cache.get("q") is None
+
+        assert len(cache) == 0
+
+
+class TestDiskEmbeddingCache:
+    """Test suite for DiskEmbeddingCache."""
+
+    def test_vectors_persist_across_instances(self, tmp_path):
+        """Test that stored vectors are read back by a new connection."""
+        path = tmp_path / "embeddings.sqlite"
+        DiskEmbeddingCache(path).put_many([(b"k1", np.array([0.5, -1.0]))])
+
+        found = DiskEmbeddingCache(path).get_many([b"k1", b"k2"])
+
+        assert list(found) == [b"k1"]
+        assert found[b"k1"].dtype == np.float32
+        np.testing.assert_array_equal(found[b"k1"], [0.5, -1.0])
@@ -0,0 +1,117 @@
+"""Tests for semantic search utilities."""
+import numpy as np
+import pytest
+from unittest.mock import Mock, patch
+
+from vector import search as vector_search
+from vector.search import compose_query_vector
+
+
+class TestComposeQueryVector:
+    """Test suite for compose_query_vector."""
+
+    @pytest.fixture
+    def provider(self):
+        """Create a mock embedding provider with fixed vectors per text."""
+        vectors = {
+            "breast cancer": [1.0, 0.0],
+            "Breast Neoplasms": [0.0, 1.0],
+        }
+        provider = Mock()
+        provider.embed_texts.side_effect = lambda texts: [vectors[t] for t in texts]
+        return provider
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Isolate the module-level MeSH embedding cache."""
+        vector_search._mesh_embedding_cache.clear()
+        yield
+        vector_search._mesh_embedding_cache.clear()
+
+    def test_blends_query_and_mesh_vectors(self, provider):
+        """Test the renormalized weighted average of query and MeSH term embeddings."""
+        mesh_terms = [{"mesh_id": "D001943", "preferred_name": "Breast Neoplasms"}]
+
+        with patch("vector.search.get_embedding_provider", return_value=provider):
+            vector = compose_query_vector("breast cancer", mesh_terms, mesh_weight=0.3)
+
+        assert vector == pytest.approx(np.array([0.7, 0.3]) / np.hypot(0.7, 0.3))
+        assert np.linalg.norm(vector) == pytest.approx(1.0)
+
+    def test_mesh_embeddings_are_cached(self, provider):
+        """Test that MeSH terms are only embedded the first time they are seen."""
+        mesh_terms = [{"mesh_id": "D001943", "preferred_name": "Breast Neoplasms"}]
+
+        with patch("vector.search.get_embedding_provider", return_value=provider):
+            compose_query_vector("breast cancer", mesh_terms)
+            compose_query_vector("breast cancer", mesh_terms)
+
+        assert provider.embed_texts.call_args_list[1].args == (["breast cancer"],)
+
+    def test_mesh_embedding_cache_is_bounded(self, provider):
+        """Test that the least recently used MeSH embedding is evicted."""
+        provider.embed_texts.side_effect = lambda texts: [[1.0, 0.0] for _ in texts]
+        terms = [{"mesh_id": f"D{i:06d}", "preferred_name": f"Term {i}"} for i in range(3)]
+
+        with (
+            patch("vector.search.get_embedding_provider", return_value=provider),
+            patch("vector.search._MESH_EMBEDDING_CACHE_SIZE", 2),
+        ):
+            for term in terms:
+                compose_query_vector("breast cancer", [term])
+
+        assert list(vector_search._mesh_embedding_cache) == ["D000001", "D000002"]
+
+
+class TestSemanticSearchBatch:
+    """Test suite for semantic_search_batch."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Isolate the module-level result cache."""
+        vector_search.clear_semantic_cache()
+        yield
+        vector_search.clear_semantic_cache()
+
+    @pytest.fixture
+    def store(self):
+        """Create a mock store returning one hit per query vector."""
+        store = Mock()
+        store.search_batch.side_effect = lambda query_vectors, **_: [
+            [{"accession": f"GSE{int(v[0])}", "score": 1.0}] for v in query_vectors
+        ]
+        return store
+
+    def test_one_encode_and_one_search_for_all_misses(self, store):
+        """Test that cache misses are embedded and searched together."""
+        provider = Mock()
+        provider.embed_texts.return_value = [[1.0, 0.0], [2.0, 5.0]]
+
+        with (
+            patch("vector.search.get_embedding_provider", return_value=provider),
+            patch("vector.search.get_vector_store", return_value=store),
+        ):
+            results = vector_search.semantic_search_batch(["a", "b"], top_k=5)
+
+        assert results == [
+            [{"accession": "GSE1", "score": 1.0}],
+            [{"accession": "GSE2", "score": 1.0}],
+        ]
+        provider.embed_texts.assert_called_once_with(["a", "b"])
+        store.search_batch.assert_called_once()
+
+    def test_repeat_query_skips_encode_and_search(self, store):
+        """Test that a cached query text is answered from the cache."""
+        provider = Mock()
+        provider.embed_texts.side_effect = lambda texts: [[1.0, 0.0] for _ in texts]
+
+        with (
+            patch("vector.search.get_embedding_provider", return_value=provider),
+            patch("vector.search.get_vector_store", return_value=store),
+        ):
+            vector_search.semantic_search("Breast cancer", top_k=5)
+            results = vector_search.semantic_search("breast  cancer", top_k=5)
+
+        assert results == [{"accession": "GSE1", "score": 1.0}]
+        provider.embed_texts.assert_called_once()
+        store.search_batch.assert_called_once()
@@ -1,6 +1,38 @@
 """Vector storage and embedding package."""
-from vector.embeddings import EmbeddingProvider, get_embedding_provider
-from vector.milvus_store import MilvusStore
-from vector.search import semantic_search
+import importlib
+from typing import Any
 
-__all__ = ["EmbeddingProvider", "get_embedding_provider", "MilvusStore", "semantic_search"]
+# Public name -> defining module. Submodules pull in pymilvus and embedding
+# backends, so they are imported on first attribute access (PEP 562).
+_LAZY = {
+    "EmbeddingProvider": "vector.embeddings",
+    "get_embedding_provider": "vector.embeddings",
+    "InMemoryStore": "vector.memory_store",
+    "MilvusStore": "vector.milvus_store",
+    "semantic_search": "vector.search",
+    "semantic_search_batch": "vector.search",
+    "get_vector_store": "vector.search",
+}
+
+__all__ = [
+    "EmbeddingProvider",
+    "get_embedding_provider",
+    "InMemoryStore",
+    "MilvusStore",
+    "get_vector_store",
+    "semantic_search",
+    "semantic_search_batch",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY])
@@ -0,0 +1,253 @@
+"""
+Caches for vector search.
+SemanticCache serves repeat queries by exact key and paraphrased queries by
+embedding similarity; DiskEmbeddingCache persists embeddings across processes.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    LRU cache of search results with an exact-key tier and a semantic tier.
+
+    Every entry stores its (unit-length) query embedding in one preallocated
+    matrix, so a semantic lookup is a single matrix-vector product. Entries
+    are only reused within the same scope (e.g. top_k and filter expression)
+    and expire after ttl_seconds.
+    """
+
+    def __init__(self, max_size: int, threshold: float, ttl_seconds: float):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached queries
+            threshold: Minimum cosine similarity for a semantic hit
+            ttl_seconds: Lifetime of an entry
+        """
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._vectors: np.ndarray | None = None  # (max_size, dim), allocated on first put
+        self._active = np.zeros(max_size, dtype=bool)
+        self._entries: dict[int, tuple[Hashable | None, Hashable, list[dict[str, Any]], float]] = {}
+        self._slot_by_key: dict[Hashable, int] = {}
+        self._lru: OrderedDict[int, None] = OrderedDict()
+        self._free = list(range(max_size - 1, -1, -1))
+
+    def get(self, key: Hashable) -> list[dict[str, Any]] | None:
+        """
+        Look up results by exact key.
+
+        Args:
+            key: Exact cache key
+
+        Returns:
+            Copy of the cached results, or None on a miss
+        """
+        with self._lock:
+            slot = self._slot_by_key.get(key)
+            if slot is None:
+                return None
+            return self._hit(slot)
+
+    def get_similar(
+        self,
+        vector: list[float] | np.ndarray,
+        scope: Hashable,
+    ) -> list[dict[str, Any]] | None:
+        """
+        Look up results of the most similar cached query in the same scope.
+
+        Args:
+            vector: Query embedding
+            scope: Only entries stored with an equal scope are considered
+
+        Returns:
+            Copy of the cached results, or None if no entry reaches the threshold
+        """
+        query = _unit(vector)
+
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != query.shape[0]:
+                return None
+
+            similarities = self._vectors @ query
+            similarities[~self._active] = -np.inf
+            candidates = np.flatnonzero(similarities >= self.threshold)
+
+            for slot in candidates[np.argsort(-similarities[candidates])]:
+                slot = int(slot)
+                if self._entries[slot][1] != scope:
+                    continue
+                results = self._hit(slot)
+                if results is not None:
+                    logger.debug(f"Semantic cache hit (similarity={similarities[slot]:.3f})")
+                    return results
+
+        return None
+
+    def put(
+        self,
+        key: Hashable | None,
+        vector: list[float] | np.ndarray,
+        scope: Hashable,
+        results: list[dict[str, Any]],
+    ) -> None:
+        """
+        Store results, evicting the least recently used entry when full.
+
+        Args:
+            key: Exact cache key, or None to make the entry reachable only by similarity
+            vector: Query embedding
+            scope: Scope the results are valid for
+            results: Search results
+        """
+        if self.max_size <= 0:
+            return
+
+        query = _unit(vector)
+
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != query.shape[0]:
+                # First entry, or the embedding model changed: start over
+                self._clear()
+                self._vectors = np.zeros((self.max_size, query.shape[0]), dtype=np.float32)
+
+            slot = self._slot_by_key.get(key) if key is not None else None
+            if slot is None:
+                if not self._free:
+                    self._drop(next(iter(self._lru)))
+                slot = self._free.pop()
+
+            self._vectors[slot] = query
+            self._active[slot] = True
+            self._entries[slot] = (
+                key,
+                scope,
+                [dict(result) for result in results],
+                time.monotonic() + self.ttl_seconds,
+            )
+            if key is not None:
+                self._slot_by_key[key] = slot
+            self._lru[slot] = None
+            self._lru.move_to_end(slot)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _hit(self, slot: int) -> list[dict[str, Any]] | None:
+        """Return a copy of a live entry and mark it recently used; drop it if expired."""
+        _, _, results, expires_at = self._entries[slot]
+        if time.monotonic() >= expires_at:
+            self._drop(slot)
+            return None
+
+        self._lru.move_to_end(slot)
+        return [dict(result) for result in results]
+
+    def _drop(self, slot: int) -> None:
+        key = self._entries.pop(slot)[0]
+        if key is not None:
+            self._slot_by_key.pop(key, None)
+        self._lru.pop(slot, None)
+        self._active[slot] = False
+        self._free.append(slot)
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self._slot_by_key.clear()
+        self._lru.clear()
+        self._active[:] = False
+        self._free = list(range(self.max_size - 1, -1, -1))
+
+
+class DiskEmbeddingCache:
+    """
+    SQLite-backed embedding cache shared by all processes on a host.
+
+    Keys are opaque bytes (e.g. a digest of model and text); values are
+    float32 vectors stored as raw bytes.
+    """
+
+    # Stay well below SQLite's bound-parameter limit
+    _LOOKUP_BATCH = 500
+
+    def __init__(self, path: str | Path):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writer
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: list[bytes]) -> dict[bytes, np.ndarray]:
+        """
+        Look up cached vectors.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Vectors by key, for the keys that are cached
+        """
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), self._LOOKUP_BATCH):
+                batch = keys[start:start + self._LOOKUP_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32)
+        return found
+
+    def put_many(self, items: list[tuple[bytes, np.ndarray]]) -> None:
+        """
+        Store vectors, replacing existing entries.
+
+        Args:
+            items: (key, vector) pairs
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items],
+            )
+            self._conn.commit()
+
+
+def _unit(vector: list[float] | np.ndarray) -> np.ndarray:
+    """Convert a vector to a float32 array of unit length."""
+    array = np.asarray(vector, dtype=np.float32).ravel()
+    norm = np.linalg.norm(array)
+    return array / norm if norm > 0 else array
@@ -2,11 +2,21 @@
 Pluggable embedding provider interface.
 Supports local sentence-transformers and OpenAI embeddings.
 """
+import functools
+import hashlib
+import json
 import logging
+import shutil
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
+import numpy as np
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+
 from config import settings
+from vector.cache import DiskEmbeddingCache
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +25,7 @@ class EmbeddingProvider(ABC):
     """Abstract base class for embedding providers."""
 
     @abstractmethod
-    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+    def embed_texts(self, texts: list[str]) -> np.ndarray:
         """
         Generate embeddings for a list of texts.
 
@@ -23,7 +33,8 @@ class EmbeddingProvider(ABC):
             texts: List of text strings
 
         Returns:
-            List of embedding vectors (each vector is a list of floats)
+            float32 array of shape (len(texts), dimension) with unit-length
+            rows, so inner product equals cosine similarity
         """
         pass
 
@@ -33,7 +44,7 @@ class EmbeddingProvider(ABC):
         Get the dimensionality of embeddings produced by this provider.
 
         Returns:
-            Embedding dimension
+            Embedding dimension (of the unit-length vectors from embed_texts)
         """
         pass
 
@@ -42,21 +53,30 @@ class LocalEmbeddingProvider(EmbeddingProvider):
     """
     Local embedding provider using sentence-transformers.
     Runs models locally without external API calls.
+
+    settings.embedding_precision trades accuracy for speed: "fp16" halves the
+    weights on CUDA, "int8" dynamically quantizes Linear layers on CPU. Both
+    typically shift cosine similarities by well under 0.01 for sentence
+    embeddings, but vectors indexed at one precision and queried at another
+    can reorder near-ties, so re-embed after changing it.
     """
 
-    def __init__(self, model_name: str | None = None):
+    def __init__(self, model_name: str | None = None, precision: str | None = None):
         """
         Initialize local embedding provider.
 
         Args:
             model_name: Sentence-transformers model name
                        (default: from settings)
+            precision: "fp32", "fp16" or "int8" (default: from settings)
         """
         self.model_name = model_name or settings.embedding_model
+        self.precision = precision or settings.embedding_precision
 
         logger.info(f"Loading local embedding model: {self.model_name}")
 
         try:
+            import torch
             from sentence_transformers import SentenceTransformer
         except ImportError:
             raise ImportError(
@@ -64,30 +84,193 @@ class LocalEmbeddingProvider(EmbeddingProvider):
                 "Install with: pip install sentence-transformers"
             )
 
-        self.model = SentenceTransformer(self.model_name)
+        # Thread pools are process-wide; leave torch's cgroup-aware defaults unless configured
+        if settings.torch_num_threads:
+            torch.set_num_threads(settings.torch_num_threads)
+            try:
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                # Only settable before the first parallel op in the process
+                pass
+
+        device = settings.embedding_device or ("cuda" if torch.cuda.is_available() else "cpu")
+        # GPUs stay underutilized at small batches; CPUs gain little past 32
+        self.batch_size = settings.embedding_batch_size or (128 if device.startswith("cuda") else 32)
+
+        self._torch = torch
+        self.model = SentenceTransformer(self.model_name, device=device)
         self._dimension = self.model.get_sentence_embedding_dimension()
+        self._apply_precision()
 
         logger.info(
-            f"Loaded model '{self.model_name}' (dimension: {self._dimension})"
+            f"Loaded model '{self.model_name}' "
+            f"(dimension: {self._dimension}, device: {device}, precision: {self.precision})"
         )
 
-    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+    def _apply_precision(self) -> None:
+        """Convert the model to the configured precision where the device supports it."""
+        if self.precision == "fp32":
+            return
+
+        torch = self._torch
+        on_cuda = self.model.device.type == "cuda"
+        if self.precision == "fp16" and on_cuda:
+            self.model.half()
+        elif self.precision == "int8" and not on_cuda:
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        else:
+            logger.warning(
+                f"Precision '{self.precision}' is not supported on {self.model.device.type}; "
+                f"using fp32"
+            )
+            self.precision = "fp32"
+
+    def embed_texts(self, texts: list[str]) -> np.ndarray:
         """Generate embeddings using local model."""
         if not texts:
-            return []
+            return np.empty((0, self._dimension), dtype=np.float32)
 
         logger.debug(f"Embedding {len(texts)} texts with local model")
 
-        # Encode texts
-        embeddings = self.model.encode(
-            texts,
-            convert_to_numpy=True,
-            show_progress_bar=False,
-            batch_size=32,
+        # Encode texts; unit-length output makes Milvus IP equal cosine.
+        # encode() already length-sorts inputs into batches to limit padding.
+        with self._torch.inference_mode():
+            embeddings = self.model.encode(
+                texts,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+                batch_size=self.batch_size,
+                normalize_embeddings=True,
+            )
+
+        # fp16 output is widened back to float32
+        return embeddings.astype(np.float32, copy=False)
+
+    def get_dimension(self) -> int:
+        """Get embedding dimension."""
+        return self._dimension
+
+
+class OnnxEmbeddingProvider(EmbeddingProvider):
+    """
+    Local embedding provider running a sentence-transformers model on ONNX Runtime.
+    The model is exported to ONNX once and reused from disk on later starts.
+    """
+
+    BATCH_SIZE = 32
+    # sentence-transformers' max_seq_length when the model doesn't declare one
+    DEFAULT_MAX_SEQ_LENGTH = 256
+
+    def __init__(self, model_name: str | None = None, cache_dir: str | None = None):
+        """
+        Initialize ONNX embedding provider.
+
+        Args:
+            model_name: Sentence-transformers model name
+                       (default: from settings)
+            cache_dir: Directory for exported models (default: from settings)
+        """
+        self.model_name = model_name or settings.embedding_model
+
+        try:
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+        except ImportError:
+            raise ImportError(
+                "onnxruntime not installed. "
+                "Install with: pip install optimum[onnxruntime]"
+            )
+
+        model_dir = Path(cache_dir or settings.onnx_cache_dir) / self.model_name.replace("/", "__")
+        if not (model_dir / "model.onnx").exists():
+            self._export(model_dir)
+
+        available = ort.get_available_providers()
+        providers = [
+            provider
+            for provider in ("CUDAExecutionProvider", "CPUExecutionProvider")
+            if provider in available
+        ]
+
+        logger.info(f"Loading ONNX embedding model: {model_dir} ({', '.join(providers)})")
+
+        self.session = ort.InferenceSession(str(model_dir / "model.onnx"), providers=providers)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.max_seq_length = self._load_max_seq_length(model_dir)
+        self._input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self._dimension = self.session.get_outputs()[0].shape[-1]
+
+        logger.info(
+            f"Loaded ONNX model '{self.model_name}' "
+            f"(dimension: {self._dimension}, max_seq_length: {self.max_seq_length})"
         )
 
-        # Convert to list of lists
-        return embeddings.tolist()
+    def _export(self, model_dir: Path) -> None:
+        """Export the model and its tokenizer to model_dir."""
+        try:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+            from transformers import AutoTokenizer
+        except ImportError:
+            raise ImportError(
+                "optimum not installed. "
+                "Install with: pip install optimum[onnxruntime]"
+            )
+
+        logger.info(f"Exporting '{self.model_name}' to ONNX at {model_dir}")
+
+        model = ORTModelForFeatureExtraction.from_pretrained(self.model_name, export=True)
+        model.save_pretrained(model_dir)
+        AutoTokenizer.from_pretrained(self.model_name).save_pretrained(model_dir)
+
+        # Keep the sentence-transformers config so truncation matches LocalEmbeddingProvider
+        try:
+            config_path = Path(self.model_name) / "sentence_bert_config.json"
+            if not config_path.exists():
+                from huggingface_hub import hf_hub_download
+
+                config_path = hf_hub_download(self.model_name, "sentence_bert_config.json")
+            shutil.copy(config_path, model_dir / "sentence_bert_config.json")
+        except Exception as e:
+            logger.warning(f"No sentence_bert_config.json for '{self.model_name}': {e}")
+
+    def _load_max_seq_length(self, model_dir: Path) -> int:
+        """Read max_seq_length as sentence-transformers does, capped by the tokenizer's limit."""
+        config_path = model_dir / "sentence_bert_config.json"
+        max_seq_length = self.DEFAULT_MAX_SEQ_LENGTH
+        if config_path.exists():
+            max_seq_length = json.loads(config_path.read_text()).get(
+                "max_seq_length", max_seq_length
+            )
+        return min(max_seq_length, self.tokenizer.model_max_length)
+
+    def embed_texts(self, texts: list[str]) -> np.ndarray:
+        """Generate embeddings using the ONNX model."""
+        if not texts:
+            return np.empty((0, self._dimension), dtype=np.float32)
+
+        logger.debug(f"Embedding {len(texts)} texts with ONNX model")
+
+        batches = []
+        for start in range(0, len(texts), self.BATCH_SIZE):
+            inputs = self.tokenizer(
+                texts[start:start + self.BATCH_SIZE],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            feed = {name: value for name, value in inputs.items() if name in self._input_names}
+            token_embeddings = self.session.run(None, feed)[0]
+
+            # Mean pooling over real tokens, then L2 normalization (as sentence-transformers)
+            mask = inputs["attention_mask"][..., np.newaxis].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+            batches.append(pooled / np.clip(norms, 1e-12, None))
+
+        return np.concatenate(batches).astype(np.float32, copy=False)
 
     def get_dimension(self) -> int:
         """Get embedding dimension."""
@@ -129,47 +312,110 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
         logger.info(f"Initializing OpenAI embedding provider: model={self.model}")
 
         try:
-            from openai import OpenAI
+            import openai
         except ImportError:
             raise ImportError(
                 "openai package not installed. "
                 "Install with: pip install openai"
             )
 
-        self.client = OpenAI(api_key=self.api_key)
+        # One client for all requests (it pools HTTP connections); retries
+        # are handled below so they aren't stacked on the client's own
+        self.client = openai.OpenAI(api_key=self.api_key, max_retries=0)
         self._dimension = self.DIMENSION_MAP.get(self.model, 1536)
 
+        self._cache = (
+            DiskEmbeddingCache(Path(settings.embedding_cache_dir) / "openai.sqlite")
+            if settings.embedding_cache_dir
+            else None
+        )
+
+        # Rate limits, timeouts, dropped connections and 5xx responses are transient
+        self._embed_batch = retry(
+            retry=retry_if_exception_type((
+                openai.RateLimitError,
+                openai.APIConnectionError,  # Includes APITimeoutError
+                openai.InternalServerError,
+            )),
+            wait=wait_random_exponential(min=1, max=30),
+            stop=stop_after_attempt(5),
+            reraise=True,
+        )(self._request_embeddings)
+
         logger.info(f"OpenAI provider ready (dimension: {self._dimension})")
 
-    def embed_texts(self, texts: list[str]) -> list[list[float]]:
-        """Generate embeddings using OpenAI API."""
+    def embed_texts(self, texts: list[str]) -> np.ndarray:
+        """Generate embeddings using OpenAI API, skipping texts in the disk cache."""
         if not texts:
-            return []
-
+            return np.empty((0, self._dimension), dtype=np.float32)
+
+        if self._cache is None:
+            return self._embed_uncached(texts)
+
+        keys = [
+            hashlib.sha256(f"{self.model}\x00{text}".encode()).digest()
+            for text in texts
+        ]
+        vectors = self._cache.get_many(list(set(keys)))
+
+        # Each distinct uncached text is requested once
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        logger.debug(f"Embedding cache: {len(texts) - len(missing)}/{len(texts)} hits")
+        if missing:
+            embeddings = self._embed_uncached(list(missing.values()))
+            new_vectors = list(zip(missing, embeddings))
+            self._cache.put_many(new_vectors)
+            vectors.update(new_vectors)
+
+        return np.stack([vectors[key] for key in keys])
+
+    def _embed_uncached(self, texts: list[str]) -> np.ndarray:
+        """Embed texts with the API."""
         logger.debug(f"Embedding {len(texts)} texts with OpenAI API")
 
+        # The endpoint caps inputs per request; send chunks concurrently
+        batch_size = settings.openai_batch_size
+        batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+
         try:
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=texts,
-            )
+            if len(batches) == 1:
+                embeddings = [self._embed_batch(batches[0])]
+            else:
+                workers = min(len(batches), settings.openai_concurrency)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    # map() yields in input order
+                    embeddings = list(executor.map(self._embed_batch, batches))
 
-            embeddings = [item.embedding for item in response.data]
-            return embeddings
+            return np.concatenate(embeddings)
 
         except Exception as e:
             logger.error(f"OpenAI embedding failed: {e}")
             raise
 
+    def _request_embeddings(self, texts: list[str]) -> np.ndarray:
+        """Embed one request's worth of texts."""
+        response = self.client.embeddings.create(
+            model=self.model,
+            input=texts,
+        )
+
+        embeddings = np.asarray([item.embedding for item in response.data], dtype=np.float32)
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings
+
     def get_dimension(self) -> int:
         """Get embedding dimension."""
         return self._dimension
 
 
+@functools.lru_cache(maxsize=1)
 def get_embedding_provider() -> EmbeddingProvider:
     """
     Factory function to get the configured embedding provider.
 
+    The provider is created once per process; loading a local model takes
+    seconds and hundreds of MB, so every caller shares the same instance.
+
     Returns:
         Configured EmbeddingProvider instance
 
@@ -180,10 +426,12 @@ def get_embedding_provider() -> EmbeddingProvider:
 
     if provider_type == "local":
         return LocalEmbeddingProvider()
+    elif provider_type == "onnx":
+        return OnnxEmbeddingProvider()
     elif provider_type == "openai":
         return OpenAIEmbeddingProvider()
     else:
         raise ValueError(
             f"Unknown embedding provider: {provider_type}. "
-            f"Must be 'local' or 'openai'"
+            f"Must be 'local', 'onnx' or 'openai'"
         )
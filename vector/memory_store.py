@@ -0,0 +1,228 @@
+"""
+In-process vector store for small collections.
+Keeps all embeddings in one contiguous float32 matrix and searches with a BLAS matrix product.
+"""
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from config import settings
+from vector.embeddings import get_embedding_provider
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryStore:
+    """
+    Exact-search vector store with the same interface as MilvusStore.
+
+    Stored vectors are unit-length (as returned by EmbeddingProvider.embed_texts)
+    and queries are normalized, so scores are cosine similarities.
+    The collection is loaded from and saved to a .npz file; flush() writes it.
+    """
+
+    def __init__(self, path: str | None = None):
+        """
+        Initialize in-memory store.
+
+        Args:
+            path: .npz file holding the collection (default: from settings)
+        """
+        self.path = Path(path or settings.memory_store_path)
+        self.dimension = get_embedding_provider().get_dimension()
+
+        self._lock = threading.Lock()
+        self.accessions = np.empty(0, dtype=object)
+        self.vectors = np.empty((0, self.dimension), dtype=np.float32)
+        self._row_by_accession: dict[str, int] = {}
+
+        if self.path.exists():
+            with np.load(self.path, allow_pickle=False) as data:
+                self.accessions = data["accessions"].astype(object)
+                self.vectors = np.ascontiguousarray(data["vectors"], dtype=np.float32)
+            self._reindex()
+
+        logger.info(
+            f"Initialized in-memory store: {self.path} "
+            f"({len(self.accessions)} vectors, dim={self.dimension})"
+        )
+
+    def upsert_embeddings(
+        self,
+        embeddings: list[tuple[str, list[float] | np.ndarray]],
+    ) -> None:
+        """
+        Insert or update embeddings.
+
+        Args:
+            embeddings: List of (accession, unit-length embedding_vector) tuples
+        """
+        if not embeddings:
+            logger.warning("No embeddings to upsert")
+            return
+
+        self.insert_vectors(
+            [e[0] for e in embeddings],
+            np.stack([np.asarray(e[1], dtype=np.float32) for e in embeddings]),
+        )
+
+    def insert_vectors(self, accessions: list[str], vectors: np.ndarray) -> None:
+        """
+        Insert or replace vectors by accession.
+
+        Args:
+            accessions: GSE accessions, one per row of vectors
+            vectors: Unit-length rows of shape (len(accessions), dimension)
+        """
+        if len(accessions) == 0:
+            logger.warning("No embeddings to upsert")
+            return
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+
+        with self._lock:
+            new_rows: dict[str, np.ndarray] = {}
+            for accession, vector in zip(accessions, vectors):
+                row = self._row_by_accession.get(accession)
+                if row is None:
+                    new_rows[accession] = vector
+                else:
+                    self.vectors[row] = vector
+
+            if new_rows:
+                for row, accession in enumerate(new_rows, start=len(self.accessions)):
+                    self._row_by_accession[accession] = row
+                self.accessions = np.concatenate(
+                    [self.accessions, np.array(list(new_rows), dtype=object)]
+                )
+                self.vectors = np.concatenate([self.vectors, np.stack(list(new_rows.values()))])
+
+        logger.info(f"Upserted {len(accessions)} embeddings ({len(new_rows)} new)")
+
+    def flush(self) -> None:
+        """Save the collection to disk."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp.npz")
+            np.savez(tmp_path, accessions=self.accessions.astype(str), vectors=self.vectors)
+            os.replace(tmp_path, self.path)
+
+    def search(
+        self,
+        query_vector: list[float] | np.ndarray,
+        top_k: int = 100,
+        filter_expr: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Search for similar embeddings.
+
+        Args:
+            query_vector: Query embedding vector
+            top_k: Number of results to return
+            filter_expr: Not supported by this backend
+
+        Returns:
+            List of results with accession and similarity score
+        """
+        if query_vector is None or len(query_vector) == 0:
+            return []
+
+        return self.search_batch([query_vector], top_k=top_k, filter_expr=filter_expr)[0]
+
+    def search_batch(
+        self,
+        query_vectors: list[list[float] | np.ndarray] | np.ndarray,
+        top_k: int = 100,
+        filter_expr: str | None = None,
+        rerank: bool | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Search for several query vectors with one matrix product.
+
+        Args:
+            query_vectors: Query embedding vectors
+            top_k: Number of results per query
+            filter_expr: Not supported by this backend
+            rerank: Ignored; scores are already exact
+
+        Returns:
+            One list of results with accession and similarity score per query
+
+        Raises:
+            ValueError: If a filter expression is given
+        """
+        if filter_expr:
+            raise ValueError("Filter expressions require the Milvus store backend")
+        if len(query_vectors) == 0:
+            return []
+
+        queries = np.array(query_vectors, dtype=np.float32)
+        queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+
+        with self._lock:
+            accessions, vectors = self.accessions, self.vectors
+
+        k = min(top_k, len(accessions))
+        if k == 0:
+            return [[] for _ in query_vectors]
+
+        scores = queries @ vectors.T  # (Q, N)
+        results = []
+        for query_scores in scores:
+            if k < len(query_scores):
+                top = np.argpartition(-query_scores, k - 1)[:k]
+            else:
+                top = np.arange(k)
+            top = top[np.argsort(-query_scores[top], kind="stable")]
+            results.append([
+                {"accession": accessions[i], "score": float(query_scores[i])}
+                for i in top
+            ])
+
+        return results
+
+    def delete(self, accessions: list[str]) -> None:
+        """
+        Delete embeddings by accession.
+
+        Args:
+            accessions: List of GSE accessions to delete
+        """
+        if not accessions:
+            return
+
+        with self._lock:
+            keep = ~np.isin(self.accessions, list(accessions))
+            self.accessions = self.accessions[keep]
+            self.vectors = self.vectors[keep]
+            self._reindex()
+
+        logger.info(f"Deleted up to {len(accessions)} embeddings")
+
+    def count(self) -> int:
+        """
+        Get total number of embeddings.
+
+        Returns:
+            Count of embeddings
+        """
+        return len(self.accessions)
+
+    def drop_collection(self) -> None:
+        """
+        Drop all embeddings, including the saved file.
+        WARNING: This deletes all data!
+        """
+        logger.warning(f"Dropping in-memory store '{self.path}'")
+        with self._lock:
+            self.accessions = np.empty(0, dtype=object)
+            self.vectors = np.empty((0, self.dimension), dtype=np.float32)
+            self._row_by_accession.clear()
+            self.path.unlink(missing_ok=True)
+
+    def _reindex(self) -> None:
+        self._row_by_accession = {accession: row for row, accession in enumerate(self.accessions)}
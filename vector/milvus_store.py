@@ -2,9 +2,15 @@
 Milvus vector store for GEO embeddings.
 Manages collection creation, upsertion, and similarity search.
 """
+import json
 import logging
+import re
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+import numpy as np
 from pymilvus import (
     Collection,
     CollectionSchema,
@@ -14,12 +20,64 @@ from pymilvus import (
     connections,
     utility,
 )
+from pymilvus.client.types import LoadState
 
 from config import settings
 from vector.embeddings import get_embedding_provider
+from vector.rerank import cosine_topk
 
 logger = logging.getLogger(__name__)
 
+DELETE_BATCH_SIZE = 1024  # Accessions per delete expression
+DELETE_WORKERS = 4
+RERANK_CANDIDATES = 4  # Candidates fetched per requested result when reranking
+
+PARTITION_NAME = re.compile(r"p\d{2,}")
+
+# Address of each open connection alias; stores pointing at the same server share one
+_connected: dict[str, tuple[str, int]] = {}
+
+
+def _partition_name(bucket: int) -> str:
+    """Name of an accession-hash partition."""
+    return f"p{bucket:02d}"
+
+
+def _to_str_list(values: Any) -> list[str]:
+    """Convert a list, pyarrow Array/ChunkedArray or polars Series of strings to a list."""
+    if hasattr(values, "to_pylist"):  # pyarrow
+        return values.to_pylist()
+    if hasattr(values, "to_list"):  # polars
+        return values.to_list()
+    return list(values)
+
+
+def _split_embedding_table(table: Any) -> tuple[list[str], np.ndarray]:
+    """
+    Split a columnar table into accessions and a float32 vector matrix.
+
+    Vectors are read from the column buffers in one pass rather than row by row.
+
+    Args:
+        table: pyarrow Table or polars DataFrame with "accession" and "embedding" columns
+
+    Returns:
+        (accessions, array of shape (rows, dimension))
+    """
+    accessions = _to_str_list(table["accession"])
+    column = table["embedding"]
+
+    if hasattr(column, "combine_chunks"):  # pyarrow ChunkedArray of (fixed-size) lists
+        values = column.combine_chunks().flatten().to_numpy(zero_copy_only=False)
+        vectors = values.astype(np.float32, copy=False).reshape(len(accessions), -1)
+    else:  # polars: Array columns convert to 2-D, List columns to an object array
+        vectors = column.to_numpy()
+        if vectors.dtype == object:
+            vectors = np.stack(vectors)
+        vectors = vectors.astype(np.float32, copy=False)
+
+    return accessions, vectors
+
 
 class MilvusStore:
     """
@@ -43,6 +101,10 @@ class MilvusStore:
         self.host = host or settings.milvus_host
         self.port = port or settings.milvus_port
         self.collection_name = collection_name or settings.milvus_collection_name
+        self.alias = f"{self.host}:{self.port}"
+        self.index_type = "HNSW"
+        self._count_cache: tuple[float, int] | None = None  # (monotonic time, count)
+        self.num_partitions = 0  # Accession-hash partitions; 0 means the default partition only
 
         # Get embedding dimension
         embedding_provider = get_embedding_provider()
@@ -60,13 +122,21 @@ class MilvusStore:
         self._ensure_collection()
 
     def _connect(self) -> None:
-        """Connect to Milvus server."""
+        """Connect to Milvus server, reusing this process's connection to it."""
+        if (
+            _connected.get(self.alias) == (self.host, self.port)
+            and connections.has_connection(self.alias)
+        ):
+            logger.debug(f"Reusing Milvus connection '{self.alias}'")
+            return
+
         try:
             connections.connect(
-                alias="default",
+                alias=self.alias,
                 host=self.host,
                 port=str(self.port),
             )
+            _connected[self.alias] = (self.host, self.port)
             logger.info("Connected to Milvus successfully")
         except MilvusException as e:
             logger.error(f"Failed to connect to Milvus: {e}")
@@ -76,12 +146,24 @@ class MilvusStore:
         """
         Ensure collection exists, create if not.
         """
-        if utility.has_collection(self.collection_name):
+        if utility.has_collection(self.collection_name, using=self.alias):
             logger.info(f"Collection '{self.collection_name}' exists")
-            self.collection = Collection(self.collection_name)
+            self.collection = Collection(self.collection_name, using=self.alias)
 
-            # Load collection into memory for search
-            self.collection.load()
+            # Collections created before the switch to HNSW keep their IVF index
+            indexes = self.collection.indexes
+            if indexes:
+                self.index_type = indexes[0].params.get("index_type", "HNSW")
+
+            # Collections created without partitions keep inserting into the default one
+            self.num_partitions = sum(
+                1 for partition in self.collection.partitions
+                if PARTITION_NAME.fullmatch(partition.name)
+            )
+
+            # Load collection into memory for search, unless another store already did
+            if utility.load_state(self.collection_name, using=self.alias) != LoadState.Loaded:
+                self.collection.load()
         else:
             logger.info(f"Creating collection '{self.collection_name}'")
             self._create_collection()
@@ -114,14 +196,15 @@ class MilvusStore:
         self.collection = Collection(
             name=self.collection_name,
             schema=schema,
+            using=self.alias,
         )
 
-        # Create IVF_FLAT index for similarity search
-        index_params = {
-            "metric_type": "IP",  # Inner Product (cosine similarity)
-            "index_type": "IVF_FLAT",
-            "params": {"nlist": 1024},
-        }
+        for bucket in range(settings.milvus_num_partitions):
+            self.collection.create_partition(_partition_name(bucket))
+        self.num_partitions = settings.milvus_num_partitions
+
+        index_params = self._index_params()
+        self.index_type = index_params["index_type"]
 
         self.collection.create_index(
             field_name="embedding",
@@ -133,15 +216,44 @@ class MilvusStore:
         # Load collection
         self.collection.load()
 
+    @staticmethod
+    def _index_params() -> dict[str, Any]:
+        """
+        Get the index definition for a new collection.
+
+        Returns:
+            IVF_SQ8 (int8 scalar quantization) when quantization is enabled,
+            otherwise an HNSW graph index for low-latency interactive search
+        """
+        if settings.milvus_enable_quantization:
+            return {
+                "metric_type": "IP",  # Inner Product (cosine similarity)
+                "index_type": "IVF_SQ8",
+                "params": {"nlist": settings.milvus_ivf_nlist},
+            }
+
+        return {
+            "metric_type": "IP",  # Inner Product (cosine similarity)
+            "index_type": "HNSW",
+            "params": {
+                "M": settings.milvus_hnsw_m,
+                "efConstruction": settings.milvus_hnsw_ef_construction,
+            },
+        }
+
     def upsert_embeddings(
         self,
-        embeddings: list[tuple[str, list[float]]],
+        embeddings: list[tuple[str, list[float] | np.ndarray]] | Any,
     ) -> None:
         """
         Insert or update embeddings in Milvus.
 
+        Inserts are not flushed; call flush() once after a bulk load.
+
         Args:
-            embeddings: List of (accession, embedding_vector) tuples
+            embeddings: List of (accession, unit-length embedding_vector) tuples,
+                        or a pyarrow Table / polars DataFrame with "accession"
+                        and "embedding" (fixed-size list of float) columns
 
         Example:
             >>> store = MilvusStore()
@@ -149,37 +261,69 @@ class MilvusStore:
             ...     ("GSE123456", [0.1, 0.2, ...]),
             ...     ("GSE123457", [0.3, 0.4, ...]),
             ... ])
+            >>> store.flush()
+        """
+        if len(embeddings) == 0:
+            logger.warning("No embeddings to upsert")
+            return
+
+        if isinstance(embeddings, list):
+            self.insert_vectors(
+                [e[0] for e in embeddings],
+                np.stack([np.asarray(e[1], dtype=np.float32) for e in embeddings]),
+            )
+        else:
+            self.insert_vectors(*_split_embedding_table(embeddings))
+
+    def insert_vectors(self, accessions: list[str], vectors: np.ndarray) -> None:
+        """
+        Insert pre-split accessions and vectors without per-row conversion.
+
+        Args:
+            accessions: GSE accessions, one per row of vectors
+            vectors: Unit-length rows of shape (len(accessions), dimension),
+                     as returned by EmbeddingProvider.embed_texts
         """
-        if not embeddings:
+        if len(accessions) == 0:
             logger.warning("No embeddings to upsert")
             return
 
-        accessions = [e[0] for e in embeddings]
-        vectors = [e[1] for e in embeddings]
+        logger.info(f"Upserting {len(accessions)} embeddings")
 
-        logger.info(f"Upserting {len(embeddings)} embeddings")
+        # Embedding providers return unit-length rows, so IP is cosine similarity
+        vectors = np.asarray(vectors, dtype=np.float32)
 
         try:
             # Milvus automatically handles upserts based on primary key
-            data = [
-                accessions,
-                vectors,
-            ]
+            for partition_name, rows in self._group_by_partition(accessions).items():
+                data = [
+                    [accessions[row] for row in rows],
+                    vectors[rows],
+                ]
 
-            self.collection.insert(data)
-            self.collection.flush()
+                self.collection.insert(data, partition_name=partition_name)
 
-            logger.info(f"Successfully upserted {len(embeddings)} embeddings")
+            logger.info(f"Successfully upserted {len(accessions)} embeddings")
 
         except MilvusException as e:
             logger.error(f"Failed to upsert embeddings: {e}")
             raise
 
+    def flush(self) -> None:
+        """Seal pending inserts so they are persisted and counted by count()."""
+        self._count_cache = None
+        try:
+            self.collection.flush()
+        except MilvusException as e:
+            logger.error(f"Flush failed: {e}")
+            raise
+
     def search(
         self,
-        query_vector: list[float],
+        query_vector: list[float] | np.ndarray,
         top_k: int = 100,
         filter_expr: str | None = None,
+        partition_names: list[str] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search for similar embeddings.
@@ -188,6 +332,7 @@ class MilvusStore:
             query_vector: Query embedding vector
             top_k: Number of results to return
             filter_expr: Optional filter expression (Milvus syntax)
+            partition_names: Only search these partitions (see partitions_for)
 
         Returns:
             List of results with accession and similarity score
@@ -200,76 +345,224 @@ class MilvusStore:
             >>> for result in results:
             ...     print(f"{result['accession']}: {result['score']}")
         """
-        if not query_vector:
+        if query_vector is None or len(query_vector) == 0:
             return []
 
+        return self.search_batch(
+            [query_vector],
+            top_k=top_k,
+            filter_expr=filter_expr,
+            partition_names=partition_names,
+        )[0]
+
+    def search_batch(
+        self,
+        query_vectors: list[list[float] | np.ndarray] | np.ndarray,
+        top_k: int = 100,
+        filter_expr: str | None = None,
+        rerank: bool | None = None,
+        partition_names: list[str] | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Search for several query vectors in a single request.
+
+        Args:
+            query_vectors: Query embedding vectors
+            top_k: Number of results per query
+            filter_expr: Optional filter expression (Milvus syntax)
+            rerank: Fetch RERANK_CANDIDATES * top_k candidates with their
+                    stored vectors and rescore them by exact cosine similarity
+                    (default: when the index is quantized)
+            partition_names: Only search these partitions (see partitions_for)
+
+        Returns:
+            One list of results with accession and similarity score per query
+        """
+        if len(query_vectors) == 0:
+            return []
+
+        if rerank is None:
+            rerank = self.index_type == "IVF_SQ8"
+        limit = top_k * RERANK_CANDIDATES if rerank else top_k
+        query_array = np.asarray(query_vectors, dtype=np.float32)
+
         search_params = {
             "metric_type": "IP",  # Inner Product
-            "params": {"nprobe": 10},
+            "params": self._search_params(limit),
         }
 
-        logger.debug(f"Searching Milvus: top_k={top_k}, filter={filter_expr}")
+        logger.debug(
+            f"Searching Milvus: {len(query_vectors)} queries, top_k={top_k}, "
+            f"filter={filter_expr}, rerank={rerank}"
+        )
 
         try:
             results = self.collection.search(
-                data=[query_vector],
+                data=query_array.tolist(),
                 anns_field="embedding",
                 param=search_params,
-                limit=top_k,
+                limit=limit,
                 expr=filter_expr,
-                output_fields=["accession"],
+                output_fields=["embedding"] if rerank else None,
+                partition_names=partition_names,
             )
 
-            # Format results
-            formatted = []
-            for hits in results:
-                for hit in hits:
-                    formatted.append({
-                        "accession": hit.entity.get("accession"),
-                        "score": float(hit.score),
-                    })
-
-            logger.info(f"Found {len(formatted)} results")
+            if rerank:
+                formatted = [
+                    self._rerank_hits(query, hits, top_k)
+                    for query, hits in zip(query_array, results)
+                ]
+            else:
+                # accession is the primary key, so hit ids need no output fields
+                formatted = [
+                    [
+                        {"accession": accession, "score": score}
+                        for accession, score in zip(hits.ids, hits.distances)
+                    ]
+                    for hits in results
+                ]
+
+            logger.info(f"Found {sum(len(hits) for hits in formatted)} results")
             return formatted
 
         except MilvusException as e:
             logger.error(f"Search failed: {e}")
             # Return empty results on error instead of failing
+            return [[] for _ in query_vectors]
+
+    def partitions_for(self, accessions: list[str]) -> list[str] | None:
+        """
+        Get the partitions holding the given accessions.
+
+        Pass the result as partition_names together with an
+        accession filter so Milvus skips the other partitions.
+
+        Args:
+            accessions: GSE accessions
+
+        Returns:
+            Partition names, or None if the collection isn't partitioned
+        """
+        if not self.num_partitions:
+            return None
+        return sorted(self._group_by_partition(accessions))
+
+    def _group_by_partition(self, accessions: list[str]) -> dict[str | None, list[int]]:
+        """Group accession positions by partition (None: the default partition)."""
+        if not self.num_partitions:
+            return {None: list(range(len(accessions)))}
+
+        groups: dict[str | None, list[int]] = {}
+        for row, accession in enumerate(accessions):
+            # crc32 is stable across processes, unlike hash()
+            bucket = zlib.crc32(accession.encode()) % self.num_partitions
+            groups.setdefault(_partition_name(bucket), []).append(row)
+        return groups
+
+    @staticmethod
+    def _rerank_hits(query: np.ndarray, hits: Any, top_k: int) -> list[dict[str, Any]]:
+        """
+        Rescore one query's candidates against their stored vectors.
+
+        Args:
+            query: Query vector
+            hits: Milvus hits carrying the embedding output field
+            top_k: Number of results to keep
+
+        Returns:
+            Top results with accession and exact cosine score
+        """
+        if len(hits) == 0:
             return []
 
-    def delete(self, accessions: list[str]) -> None:
+        candidates = np.asarray([hit.entity.get("embedding") for hit in hits], dtype=np.float32)
+        indices, scores = cosine_topk(query, candidates, top_k)
+        return [
+            {"accession": hits.ids[i], "score": float(score)}
+            for i, score in zip(indices, scores)
+        ]
+
+    def _search_params(self, top_k: int) -> dict[str, int]:
+        """
+        Get index-specific search parameters.
+
+        Args:
+            top_k: Number of results requested
+
+        Returns:
+            ef for HNSW (must be at least top_k), nprobe for IVF indexes
+        """
+        if self.index_type == "HNSW":
+            return {"ef": max(top_k * 2, settings.milvus_hnsw_ef)}
+        return {"nprobe": settings.milvus_ivf_nprobe}
+
+    def delete(self, accessions: list[str] | Any) -> None:
         """
         Delete embeddings by accession.
 
+        Deletes are not flushed; call flush() to persist them.
+
         Args:
-            accessions: List of GSE accessions to delete
+            accessions: List of GSE accessions to delete, or a pyarrow Array /
+                        polars Series of them
+
+        Raises:
+            ValueError: If an accession contains a quote or backslash
         """
+        accessions = _to_str_list(accessions)
         if not accessions:
             return
 
-        expr = f"accession in {accessions}"
-        logger.info(f"Deleting {len(accessions)} embeddings")
+        for accession in accessions:
+            if '"' in accession or "\\" in accession:
+                raise ValueError(f"Invalid accession: {accession!r}")
+
+        # Bounded IN-lists keep each expression cheap for the server to parse,
+        # and each batch only touches the partition its accessions hash to
+        batches = []
+        for partition_name, rows in self._group_by_partition(accessions).items():
+            group = [accessions[row] for row in rows]
+            for start in range(0, len(group), DELETE_BATCH_SIZE):
+                expr = "accession in " + json.dumps(group[start:start + DELETE_BATCH_SIZE])
+                batches.append((expr, partition_name))
+        logger.info(f"Deleting {len(accessions)} embeddings in {len(batches)} batches")
+        self._count_cache = None
 
         try:
-            self.collection.delete(expr)
-            self.collection.flush()
+            with ThreadPoolExecutor(max_workers=min(len(batches), DELETE_WORKERS)) as executor:
+                # list() re-raises the first failed batch
+                list(executor.map(lambda batch: self.collection.delete(*batch), batches))
         except MilvusException as e:
             logger.error(f"Delete failed: {e}")
             raise
 
-    def count(self) -> int:
+    def count(self, exact: bool = False) -> int:
         """
         Get total number of embeddings in collection.
 
+        num_entities is a statistics RPC, so its value is reused for
+        settings.milvus_count_ttl seconds unless exact is set.
+
+        Args:
+            exact: Skip the cached value
+
         Returns:
             Count of embeddings
         """
+        if not exact and self._count_cache is not None:
+            fetched_at, cached = self._count_cache
+            if time.monotonic() - fetched_at < settings.milvus_count_ttl:
+                return cached
+
         try:
-            return self.collection.num_entities
+            count = self.collection.num_entities
         except MilvusException as e:
             logger.error(f"Count failed: {e}")
             return 0
 
+        self._count_cache = (time.monotonic(), count)
+        return count
+
     def drop_collection(self) -> None:
         """
         Drop the entire collection.
@@ -277,7 +570,7 @@ class MilvusStore:
         """
         logger.warning(f"Dropping collection '{self.collection_name}'")
         try:
-            utility.drop_collection(self.collection_name)
+            utility.drop_collection(self.collection_name, using=self.alias)
             logger.info("Collection dropped")
         except MilvusException as e:
             logger.error(f"Failed to drop collection: {e}")
@@ -1,25 +1,72 @@
 """Semantic search utilities."""
+import functools
 import logging
-from typing import Any
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
+from config import settings
+from vector.cache import SemanticCache
 from vector.embeddings import get_embedding_provider
-from vector.milvus_store import MilvusStore
+
+if TYPE_CHECKING:
+    from vector.memory_store import InMemoryStore
+    from vector.milvus_store import MilvusStore
 
 logger = logging.getLogger(__name__)
 
+# MeSH term embeddings by mesh_id (LRU); term labels don't change, so they are embedded once
+_MESH_EMBEDDING_CACHE_SIZE = 4096
+_mesh_embedding_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+_mesh_embedding_lock = threading.Lock()
+
+# semantic_search results by query text and by query embedding
+_result_cache = SemanticCache(
+    max_size=settings.semantic_cache_size,
+    threshold=settings.semantic_cache_threshold,
+    ttl_seconds=settings.semantic_cache_ttl,
+)
+
+
+@functools.lru_cache(maxsize=1)
+def get_vector_store() -> "MilvusStore | InMemoryStore":
+    """
+    Get the process-wide vector store for the configured backend.
+
+    Returns:
+        MilvusStore, or InMemoryStore when settings.store_backend is "memory"
+    """
+    # Imported here so the memory backend never loads pymilvus
+    if settings.store_backend == "memory":
+        from vector.memory_store import InMemoryStore
+
+        return InMemoryStore()
+
+    from vector.milvus_store import MilvusStore
+
+    return MilvusStore()
+
 
 def semantic_search(
     query: str,
     top_k: int = 100,
     filter_expr: str | None = None,
+    query_vector: list[float] | np.ndarray | None = None,
 ) -> list[dict[str, Any]]:
     """
     Perform semantic search over GEO datasets.
 
+    Results are cached: a repeated query text is answered without embedding
+    it, and a query whose embedding is close enough to a cached one (see
+    settings.semantic_cache_threshold) reuses that query's results.
+
     Args:
         query: Search query text
         top_k: Number of results to return
         filter_expr: Optional Milvus filter expression
+        query_vector: Precomputed query embedding; when given, query is not embedded
 
     Returns:
         List of search results with accession and score
@@ -31,17 +78,154 @@ def semantic_search(
     """
     logger.info(f"Semantic search: query='{query}', top_k={top_k}")
 
-    # Generate query embedding
-    embedding_provider = get_embedding_provider()
-    query_embedding = embedding_provider.embed_texts([query])[0]
-
-    # Search in Milvus
-    vector_store = MilvusStore()
-    results = vector_store.search(
-        query_vector=query_embedding,
-        top_k=top_k,
-        filter_expr=filter_expr,
-    )
+    query_vectors = [query_vector] if query_vector is not None else None
+    results = semantic_search_batch([query], top_k, filter_expr, query_vectors)[0]
 
     logger.info(f"Semantic search returned {len(results)} results")
     return results
+
+
+def semantic_search_batch(
+    queries: list[str],
+    top_k: int = 100,
+    filter_expr: str | None = None,
+    query_vectors: list[list[float] | np.ndarray] | None = None,
+) -> list[list[dict[str, Any]]]:
+    """
+    Perform semantic search for several queries at once.
+
+    Queries missing from the cache are embedded with one embed_texts call and
+    searched with one Milvus request.
+
+    Args:
+        queries: Search query texts
+        top_k: Number of results per query
+        filter_expr: Optional Milvus filter expression applied to every query
+        query_vectors: Precomputed embeddings, one per query; when given,
+                       queries are not embedded
+
+    Returns:
+        One list of search results (accession and score) per query
+    """
+    scope = (top_k, filter_expr)
+    results: list[list[dict[str, Any]] | None] = [None] * len(queries)
+
+    # Exact tier by query text; a precomputed vector is only cached by similarity
+    if query_vectors is None:
+        cache_keys = [(" ".join(query.lower().split()), *scope) for query in queries]
+        for i, key in enumerate(cache_keys):
+            results[i] = _result_cache.get(key)
+
+        to_embed = [i for i, cached in enumerate(results) if cached is None]
+        vectors: list[np.ndarray | None] = [None] * len(queries)
+        if to_embed:
+            embeddings = get_embedding_provider().embed_texts([queries[i] for i in to_embed])
+            for i, embedding in zip(to_embed, embeddings):
+                vectors[i] = embedding
+    else:
+        cache_keys = [None] * len(queries)
+        vectors = list(query_vectors)
+
+    # Similarity tier
+    pending = []
+    for i, cached in enumerate(results):
+        if cached is None:
+            results[i] = _result_cache.get_similar(vectors[i], scope)
+            if results[i] is None:
+                pending.append(i)
+
+    hits = len(queries) - len(pending)
+    if hits:
+        logger.info(f"Semantic search cache hits: {hits}/{len(queries)}")
+
+    if pending:
+        searched = get_vector_store().search_batch(
+            query_vectors=[vectors[i] for i in pending],
+            top_k=top_k,
+            filter_expr=filter_expr,
+        )
+        for i, query_results in zip(pending, searched):
+            results[i] = query_results
+            if query_results:  # MilvusStore returns [] on errors; don't pin those
+                _result_cache.put(cache_keys[i], vectors[i], scope, query_results)
+
+    return results
+
+
+def warm_semantic_cache(queries: list[str], top_k: int | None = None) -> None:
+    """
+    Pre-populate the semantic_search cache, e.g. with historical top queries.
+
+    Args:
+        queries: Query texts to search
+        top_k: Number of results per query (default: settings.semantic_top_k)
+    """
+    top_k = top_k or settings.semantic_top_k
+    for query in queries:
+        semantic_search(query, top_k=top_k)
+
+    logger.info(f"Warmed semantic search cache with {len(queries)} queries")
+
+
+def clear_semantic_cache() -> None:
+    """Drop all cached semantic_search results."""
+    _result_cache.clear()
+
+
+def compose_query_vector(
+    query: str,
+    mesh_terms: list[dict[str, Any]],
+    mesh_weight: float | None = None,
+) -> list[float]:
+    """
+    Embed a query and blend in the embeddings of its matched MeSH terms.
+
+    Only the original query is encoded per call; MeSH term embeddings are
+    cached by mesh_id, so expansion doesn't lengthen the encoder input.
+
+    Args:
+        query: Original search query
+        mesh_terms: Matched MeSH terms (dicts with mesh_id and preferred_name)
+        mesh_weight: Weight of the mean MeSH embedding (default: from settings)
+
+    Returns:
+        Unit-length query vector: (1 - w) * query + w * mean(MeSH term vectors),
+        renormalized so inner-product scores stay cosine similarities
+    """
+    if mesh_weight is None:
+        mesh_weight = settings.mesh_query_weight
+
+    embedding_provider = get_embedding_provider()
+
+    mesh_vectors: dict[str, np.ndarray] = {}
+    with _mesh_embedding_lock:
+        for term in mesh_terms:
+            vector = _mesh_embedding_cache.get(term["mesh_id"])
+            if vector is not None:
+                _mesh_embedding_cache.move_to_end(term["mesh_id"])
+                mesh_vectors[term["mesh_id"]] = vector
+
+    # Embed the query together with any MeSH terms not seen before
+    missing = [term for term in mesh_terms if term["mesh_id"] not in mesh_vectors]
+    embeddings = embedding_provider.embed_texts(
+        [query, *(term["preferred_name"] for term in missing)]
+    )
+    if missing:
+        new_vectors = {
+            term["mesh_id"]: np.asarray(embedding, dtype=np.float32)
+            for term, embedding in zip(missing, embeddings[1:])
+        }
+        mesh_vectors.update(new_vectors)
+        with _mesh_embedding_lock:
+            _mesh_embedding_cache.update(new_vectors)
+            while len(_mesh_embedding_cache) > _MESH_EMBEDDING_CACHE_SIZE:
+                _mesh_embedding_cache.popitem(last=False)
+
+    query_embedding = np.asarray(embeddings[0], dtype=np.float32)
+    if not mesh_terms:
+        return query_embedding.tolist()
+
+    mesh_embedding = np.mean([mesh_vectors[term["mesh_id"]] for term in mesh_terms], axis=0)
+    blended = (1.0 - mesh_weight) * query_embedding + mesh_weight * mesh_embedding
+    norm = np.linalg.norm(blended)
+    return (blended / norm if norm > 0 else blended).tolist()